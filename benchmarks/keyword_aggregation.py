@@ -0,0 +1,122 @@
+"""Keyword aggregation: every keyword as a model vs. top-k models plus a packed tail.
+
+Builds a synthetic report and times both ways of turning the crawler's keyword
+payloads into report data, measuring the memory the result keeps alive:
+
+    python -m benchmarks.keyword_aggregation --pages 10000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from operator import itemgetter
+
+from src.keywords import PAGE_KEYWORD_TOP_K, KeywordAggregator, split_top_k
+from src.models import KeyWord
+
+KEYWORD_MIN_COUNT = 5
+
+
+def synthetic_pages(
+    pages: int, vocabulary: int, words_per_page: int, seed: int = 1
+) -> list[tuple[list[tuple[int, str]], Counter[str]]]:
+    """Per page: a pyseoanalyzer-style ``(count, word)`` list and its word counts."""
+    rng = random.Random(seed)
+    words = [f"keyword{index}" for index in range(vocabulary)]
+    result = []
+    for _ in range(pages):
+        counts = Counter(
+            {word: rng.randint(1, 40) for word in rng.sample(words, words_per_page)}
+        )
+        keywords = sorted(((count, word) for word, count in counts.items()), reverse=True)
+        result.append((keywords, counts))
+    return result
+
+
+def legacy_path(pages):
+    """The previous implementation: a KeyWord per entry and a full site sort."""
+    page_keywords = [
+        [KeyWord(word=word, count=count) for count, word in keywords]
+        for keywords, _ in pages
+    ]
+    site = Counter()
+    for _, counts in pages:
+        site.update(counts)
+    ranked = sorted(
+        (
+            {"word": word, "count": count}
+            for word, count in site.most_common()
+            if count >= KEYWORD_MIN_COUNT
+        ),
+        key=itemgetter("count"),
+        reverse=True,
+    )
+    site_keywords = [KeyWord(word=entry["word"], count=entry["count"]) for entry in ranked]
+    return page_keywords, site_keywords
+
+
+def top_k_path(pages):
+    page_keywords = [
+        split_top_k([(word, count) for count, word in keywords], PAGE_KEYWORD_TOP_K)
+        for keywords, _ in pages
+    ]
+    aggregator = KeywordAggregator(min_count=KEYWORD_MIN_COUNT)
+    for _, counts in pages:
+        aggregator.add(counts)
+    top, tail = aggregator.ranking()
+    site_keywords = [KeyWord(word=word, count=count) for word, count in top]
+    # The aggregator's working Counter is dropped once the crawl is summarized.
+    return page_keywords, (site_keywords, tail)
+
+
+def measure(build: Callable, pages) -> tuple[float, int, int]:
+    """Return seconds, bytes retained by the result and peak bytes while building.
+
+    Time and memory come from separate runs, since tracing allocations slows
+    the build down several times.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    result = build(pages)
+    elapsed = time.perf_counter() - started
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build(pages)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained - baseline, peak - baseline
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--words-per-page", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    pages = synthetic_pages(args.pages, args.vocabulary, args.words_per_page)
+    print(f"{args.pages} pages, {args.words_per_page} keywords each")
+    print(f"{'path':<10} {'time':>9} {'retained':>11} {'peak':>11}")
+    results = {}
+    for name, build in (("legacy", legacy_path), ("top-k", top_k_path)):
+        results[name] = measure(build, pages)
+        elapsed, retained, peak = results[name]
+        print(f"{name:<10} {elapsed:>8.2f}s {retained / 2**20:>9.1f}MB {peak / 2**20:>9.1f}MB")
+
+    legacy, top_k = results["legacy"], results["top-k"]
+    print(
+        f"top-k is {legacy[0] / top_k[0]:.1f}x faster and keeps "
+        f"{legacy[1] / max(top_k[1], 1):.1f}x less memory alive"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""N-gram storage: a ``Counter`` per page vs. compact counters on a shared vocabulary.
+
+Builds synthetic bigram and trigram counts for a report and measures the memory
+each representation keeps alive once every page has been built:
+
+    python -m benchmarks.ngram_memory --pages 10000
+"""
+
+import argparse
+import json
+import random
+from collections import Counter
+
+from benchmarks.keyword_aggregation import measure
+from src.compact import CompactCounter, Vocabulary
+
+
+def synthetic_ngrams(
+    pages: int, vocabulary: int, ngrams_per_page: int, seed: int = 1
+) -> list[str]:
+    """Per page: its bigram counts as JSON, the way stored reports hold them."""
+    rng = random.Random(seed)
+    words = [f"word{index}" for index in range(vocabulary)]
+    return [
+        json.dumps(
+            {
+                f"{rng.choice(words)} {rng.choice(words)}": rng.randint(1, 400)
+                for _ in range(ngrams_per_page)
+            }
+        )
+        for _ in range(pages)
+    ]
+
+
+def counter_path(pages):
+    return [Counter(json.loads(ngrams)) for ngrams in pages]
+
+
+def compact_path(pages):
+    vocabulary = Vocabulary()
+    return [
+        CompactCounter.coerce(json.loads(ngrams), vocabulary=vocabulary) for ngrams in pages
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=10_000)
+    parser.add_argument("--vocabulary", type=int, default=300)
+    parser.add_argument("--ngrams-per-page", type=int, default=150)
+    args = parser.parse_args(argv)
+
+    pages = synthetic_ngrams(args.pages, args.vocabulary, args.ngrams_per_page)
+    print(f"{args.pages} pages, {args.ngrams_per_page} n-grams each")
+    print(f"{'path':<10} {'time':>9} {'retained':>11} {'peak':>11}")
+    results = {}
+    for name, build in (("counter", counter_path), ("compact", compact_path)):
+        results[name] = measure(build, pages)
+        elapsed, retained, peak = results[name]
+        print(f"{name:<10} {elapsed:>8.2f}s {retained / 2**20:>9.1f}MB {peak / 2**20:>9.1f}MB")
+
+    counter, compact = results["counter"], results["compact"]
+    print(f"compact keeps {counter[1] / max(compact[1], 1):.1f}x less memory alive")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Page overview metrics: a Python loop per consumer vs. one shared ``PageTable``.
+
+The UI overview (a ``DataFrame``) and the PDF overview (table rows) each used
+to walk every page for the same lengths and counts; now both read the
+report's page table, which is built once:
+
+    python -m benchmarks.page_overview --pages 50000
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from src.models import KeyWord, Page, Report
+from src.page_table import OVERVIEW_COLUMNS, PageTable
+
+
+def synthetic_report(pages: int, seed: int = 1) -> Report:
+    rng = random.Random(seed)
+    warnings = [f"Missing alt text on image {index}" for index in range(50)]
+    return Report(
+        pages=[
+            Page(
+                url=f"https://example.com/page-{index}",
+                title="t" * rng.randint(5, 90),
+                description="d" * rng.randint(0, 200),
+                word_count=rng.randint(50, 3_000),
+                keywords=[KeyWord(word="seo", count=1)] * rng.randint(0, 10),
+                warnings=rng.sample(warnings, rng.randint(0, 6)),
+            )
+            for index in range(pages)
+        ],
+        keywords=[],
+        total_time=0.0,
+        duplicate_pages=[],
+    )
+
+
+def legacy_path(report: Report) -> None:
+    pd.DataFrame(
+        [
+            {
+                "URL": page.url,
+                "Title Length": len(page.title),
+                "Description Length": len(page.description),
+                "Word Count": page.word_count,
+                "Warnings": len(page.warnings),
+            }
+            for page in report.pages
+        ]
+    )
+    [
+        [page.url, len(page.title), len(page.description), page.word_count, len(page.warnings)]
+        for page in report.pages
+    ]
+
+
+def table_path(report: Report) -> None:
+    table = PageTable(report.pages)
+    pd.DataFrame(table.columns()).rename(columns=OVERVIEW_COLUMNS)
+    table.rows()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    report = synthetic_report(args.pages)
+    results = {}
+    for name, build in (("legacy", legacy_path), ("table", table_path)):
+        started = time.perf_counter()
+        build(report)
+        results[name] = time.perf_counter() - started
+        print(f"{name:<8} {results[name]:>8.3f}s")
+    print(f"page table is {results['legacy'] / results['table']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Report construction: validating every crawled page vs. the trusted fast path.
+
+Builds synthetic crawler output and times ``_create_report`` with
+``strict_validation`` on and off at several report sizes:
+
+    python -m benchmarks.report_construction --pages 1000 10000 50000
+"""
+
+import argparse
+import gc
+import random
+import time
+from collections import Counter
+
+from src.service import SEOAnalyzerService
+
+
+def synthetic_output(pages: int, ngrams_per_page: int, seed: int = 1) -> dict[str, object]:
+    """Crawler output shaped like ``AsyncCrawler.crawl`` returns it."""
+    rng = random.Random(seed)
+    words = [f"word{index}" for index in range(2_000)]
+    warnings = [f"Missing alt text on image {index}" for index in range(50)]
+
+    def ngrams(size: int) -> Counter[str]:
+        return Counter(
+            {
+                " ".join(rng.choices(words, k=size)): rng.randint(1, 20)
+                for _ in range(ngrams_per_page)
+            }
+        )
+
+    return {
+        "pages": [
+            {
+                "url": f"https://example.com/page-{index}",
+                "title": f"Page {index} title",
+                "description": "A description of reasonable length for the page.",
+                "word_count": rng.randint(100, 3_000),
+                "keywords": [(rng.randint(1, 40), word) for word in rng.sample(words, 30)],
+                "bigrams": ngrams(2),
+                "trigrams": ngrams(3),
+                "warnings": rng.sample(warnings, rng.randint(0, 6)),
+                "content_hash": f"{index:032x}",
+                "simhash": f"{rng.getrandbits(64):016x}",
+            }
+            for index in range(pages)
+        ],
+        "keywords": [],
+        "errors": [],
+        "total_time": 0.0,
+        "duplicate_pages": [],
+    }
+
+
+def measure(service: SEOAnalyzerService, output: dict[str, object]) -> float:
+    gc.collect()
+    started = time.perf_counter()
+    service._create_report(output)
+    return time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--ngrams-per-page", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    strict = SEOAnalyzerService(strict_validation=True)
+    trusted = SEOAnalyzerService()
+    print(f"{'pages':>7} {'strict':>9} {'trusted':>9} {'speedup':>8}")
+    for pages in args.pages:
+        output = synthetic_output(pages, args.ngrams_per_page)
+        strict_time = measure(strict, output)
+        trusted_time = measure(trusted, output)
+        print(
+            f"{pages:>7} {strict_time:>8.2f}s {trusted_time:>8.2f}s "
+            f"{strict_time / trusted_time:>7.1f}x"
+        )
+        del output
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Suggestion rules: vectorized evaluation and on-demand message formatting.
+
+    python -m benchmarks.suggestions --pages 50000
+"""
+
+import argparse
+import time
+
+from benchmarks.page_overview import synthetic_report
+from src.service import SEOAnalyzerService
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    report = synthetic_report(args.pages)
+    service = SEOAnalyzerService()
+
+    started = time.perf_counter()
+    report.page_table
+    table = time.perf_counter() - started
+
+    started = time.perf_counter()
+    suggestions = service.generate_suggestions(report)
+    evaluate = time.perf_counter() - started
+
+    started = time.perf_counter()
+    suggestions.to_dict()
+    materialize = time.perf_counter() - started
+
+    print(f"{args.pages} pages, {suggestions.total()} suggestions")
+    print(f"page table   {table:>7.3f}s (once per report)")
+    print(f"evaluate     {evaluate:>7.3f}s")
+    print(f"format all   {materialize:>7.3f}s (only when displayed or exported)")
+
+
+if __name__ == "__main__":
+    main()
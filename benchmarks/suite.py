@@ -0,0 +1,211 @@
+"""Benchmark suite: time and peak memory of each report stage at several sizes.
+
+Runs every stage on deterministic synthetic reports and writes the results as
+JSON. With ``--compare`` the results are checked against a saved baseline and
+the command exits non-zero when a stage got slower or hungrier than the
+threshold allows:
+
+    python -m benchmarks.suite --output benchmarks/baselines/suite.json
+    python -m benchmarks.suite --compare benchmarks/baselines/suite.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import struct
+import sys
+import time
+import tracemalloc
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from benchmarks.synthetic import SyntheticConfig, crawler_output, synthetic_report
+from src.pdf_generator import PDFGenerator
+from src.service import SEOAnalyzerService
+from src.warning_classifier import classify_warning, group_warnings, split_warning
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+DEFAULT_THRESHOLD = 0.25
+# Timing differences below this are noise, whatever the ratio.
+MIN_SECONDS_DELTA = 0.005
+# Every PDF page renders a matplotlib chart (about 0.25s each), so the PDF
+# stage is capped by default.
+DEFAULT_PDF_MAX_PAGES = 100
+
+
+@dataclass(frozen=True)
+class Stage:
+    """``setup`` builds the (untimed) input for one run of ``run``."""
+
+    setup: Callable[[SyntheticConfig], object]
+    run: Callable[[object], object]
+
+
+def _fresh_report(config: SyntheticConfig):
+    report = synthetic_report(config)
+    classify_warning.cache_clear()
+    split_warning.cache_clear()
+    return report
+
+
+def _group_all_warnings(report) -> None:
+    for page in report.pages:
+        group_warnings(page.warnings)
+
+
+class OfflinePDFGenerator(PDFGenerator):
+    """Renders with a generated logo instead of downloading the brand assets."""
+
+    @classmethod
+    def _get_logo_bytes(cls, url: str) -> bytes:
+        return _PNG_PIXEL
+
+
+def _png_pixel() -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b"\x00\xd3\x3f\x49")
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", pixels)
+        + chunk(b"IEND", b"")
+    )
+
+
+_PNG_PIXEL = _png_pixel()
+
+STAGES = {
+    "create_report": Stage(
+        setup=crawler_output,
+        run=SEOAnalyzerService()._create_report,
+    ),
+    "generate_suggestions": Stage(
+        setup=_fresh_report,
+        run=lambda report: SEOAnalyzerService().generate_suggestions(report).total(),
+    ),
+    "group_warnings": Stage(setup=_fresh_report, run=_group_all_warnings),
+    "pdf": Stage(setup=_fresh_report, run=OfflinePDFGenerator.generate_bytes),
+}
+
+
+def measure(stage: Stage, config: SyntheticConfig, repeat: int) -> dict[str, float]:
+    """Best wall time over ``repeat`` runs, then peak traced memory of one more.
+
+    Memory is traced in its own run since tracing slows the stage down.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        state = stage.setup(config)
+        gc.collect()
+        started = time.perf_counter()
+        stage.run(state)
+        seconds = min(seconds, time.perf_counter() - started)
+        del state
+
+    state = stage.setup(config)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    stage.run(state)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 6), "peak_bytes": peak}
+
+
+def run_suite(
+    stages: list[str],
+    sizes: list[int],
+    *,
+    config: SyntheticConfig = SyntheticConfig(),
+    repeat: int = 3,
+    pdf_max_pages: int = DEFAULT_PDF_MAX_PAGES,
+    log: Callable[[str], None] = print,
+) -> dict[str, object]:
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name in stages:
+        results[name] = {}
+        for size in sizes:
+            if name == "pdf" and size > pdf_max_pages:
+                log(f"{name:<22} {size:>7} skipped (--pdf-max-pages {pdf_max_pages})")
+                continue
+            # Large sizes run once; their timings are stable enough.
+            runs = repeat if size <= 1_000 else 1
+            result = measure(STAGES[name], replace(config, pages=size), runs)
+            results[name][str(size)] = result
+            log(
+                f"{name:<22} {size:>7} {result['seconds']:>9.3f}s "
+                f"{result['peak_bytes'] / 2**20:>9.1f}MB"
+            )
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {**config.to_dict(), "pages": sizes},
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, object], baseline: dict[str, object], threshold: float
+) -> list[str]:
+    """Return one line per stage and size that regressed beyond ``threshold``."""
+    regressions = []
+    for name, sizes in current["results"].items():
+        for size, result in sizes.items():
+            before = baseline["results"].get(name, {}).get(size)
+            if before is None:
+                continue
+            for metric in ("seconds", "peak_bytes"):
+                old, new = before[metric], result[metric]
+                if metric == "seconds" and new - old < MIN_SECONDS_DELTA:
+                    continue
+                if old and new > old * (1 + threshold):
+                    regressions.append(
+                        f"{name} at {size} pages: {metric} {old:g} -> {new:g} "
+                        f"(+{new / old - 1:.0%}, threshold {threshold:.0%})"
+                    )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pdf-max-pages", type=int, default=DEFAULT_PDF_MAX_PAGES)
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument(
+        "--compare", type=Path, help="baseline JSON to check for regressions"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown or memory growth, as a fraction (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.stages, args.sizes, repeat=args.repeat, pdf_max_pages=args.pdf_max_pages
+    )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
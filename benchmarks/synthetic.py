@@ -0,0 +1,124 @@
+"""Deterministic synthetic crawls and reports for benchmarks.
+
+The same ``SyntheticConfig`` always produces the same report, so timings from
+different runs (and machines) compare like for like.
+"""
+
+import random
+from collections import Counter
+from dataclasses import asdict, dataclass
+from itertools import accumulate
+
+from src.models import Report, W3CMessage, W3CResponse
+from src.service import SEOAnalyzerService
+
+WARNING_TEMPLATES = (
+    "Missing title tag",
+    "Title: Too short",
+    "Description: Missing",
+    "Keyword {index} missing from headings",
+    "Image {index} missing alt text",
+    "Heading structure issue {index}",
+    "Anchor {index} missing title attribute",
+    "Slow server response {index}",
+)
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    pages: int = 1_000
+    seed: int = 1
+    vocabulary: int = 5_000
+    keyword_skew: float = 1.1  # Zipf exponent of word popularity
+    keywords_per_page: int = 30
+    ngrams_per_page: int = 40
+    warning_kinds: int = 200  # Distinct warning texts across the site
+    warnings_per_page: int = 8  # Upper bound; each page gets 0..n
+    w3c_share: float = 0.5  # Share of pages with a W3C validation attached
+    w3c_messages_per_page: int = 10
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+def crawler_output(config: SyntheticConfig) -> dict[str, object]:
+    """Crawler output for ``config.pages`` pages, as ``AsyncCrawler.crawl`` returns it."""
+    rng = random.Random(config.seed)
+    words = [f"word{rank}" for rank in range(config.vocabulary)]
+    weights = list(
+        accumulate(1 / (rank + 1) ** config.keyword_skew for rank in range(config.vocabulary))
+    )
+    warnings = [
+        WARNING_TEMPLATES[index % len(WARNING_TEMPLATES)].format(index=index)
+        for index in range(config.warning_kinds)
+    ]
+
+    def sample(count: int) -> list[str]:
+        return rng.choices(words, cum_weights=weights, k=count)
+
+    pages = []
+    for index in range(config.pages):
+        counts = Counter(sample(config.keywords_per_page * 4))
+        pages.append(
+            {
+                "url": f"https://example.com/section-{index % 50}/page-{index}",
+                "title": " ".join(sample(rng.randint(2, 12))),
+                "description": " ".join(sample(rng.randint(0, 30))),
+                "word_count": rng.randint(50, 3_000),
+                "keywords": sorted(
+                    ((count, word) for word, count in counts.items()), reverse=True
+                )[: config.keywords_per_page],
+                "bigrams": Counter(
+                    " ".join(sample(2)) for _ in range(config.ngrams_per_page)
+                ),
+                "trigrams": Counter(
+                    " ".join(sample(3)) for _ in range(config.ngrams_per_page)
+                ),
+                "warnings": rng.sample(
+                    warnings, rng.randint(0, min(config.warnings_per_page, len(warnings)))
+                ),
+                "content_hash": f"{rng.getrandbits(128):032x}",
+                "simhash": f"{rng.getrandbits(64):016x}",
+            }
+        )
+    return {
+        "pages": pages,
+        "keywords": [],
+        "errors": [f"Timeout fetching https://example.com/slow-{index}" for index in range(5)],
+        "total_time": 1.0,
+        "duplicate_pages": [],
+    }
+
+
+def synthetic_report(config: SyntheticConfig) -> Report:
+    """A report built from ``crawler_output`` with W3C results on ``w3c_share`` of pages."""
+    report = SEOAnalyzerService()._create_report(crawler_output(config))
+    rng = random.Random(config.seed + 1)
+    for page in report.pages:
+        if rng.random() < config.w3c_share:
+            page.w3c_validation = _w3c_response(rng, page.url, config.w3c_messages_per_page)
+    return report
+
+
+def _w3c_response(rng: random.Random, url: str, messages: int) -> W3CResponse:
+    return W3CResponse(
+        messages=[
+            W3CMessage(
+                type=rng.choice(("error", "info")),
+                subtype=None,
+                message=f"Stray end tag {rng.randint(0, 20)}",
+                extract="<div></span></div>",
+                url=url,
+                first_line=line,
+                last_line=line,
+                first_column=1,
+                last_column=20,
+                hiliteStart=5,
+                hiliteLength=7,
+            )
+            for line in range(1, rng.randint(0, messages) + 1)
+        ],
+        url=url,
+        source=None,
+        language="en",
+    )
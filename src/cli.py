@@ -0,0 +1,214 @@
+"""Headless batch audits: ``website-analyser-audit sites.txt -o reports/``.
+
+Only the analysis core is imported here; the Streamlit UI and its pandas and
+plotly dependencies stay out of the process, and the PDF generator is imported
+on demand when ``--pdf`` is given.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from src.crawler import CrawlOptions
+from src.metrics import Metrics
+from src.service import ASYNCIO_BACKEND, CRAWL_BACKENDS, SEOAnalyzerService
+
+
+@dataclass(frozen=True)
+class SiteResult:
+    url: str
+    pages: int = 0
+    elapsed: float = 0.0
+    error: str | None = None
+    stage_times: dict[str, float] = field(default_factory=dict)
+
+
+def read_urls(lines) -> list[str]:
+    """Return the URLs in ``lines``, skipping blanks, comments and repeats."""
+    urls = (line.strip() for line in lines)
+    return list(dict.fromkeys(url for url in urls if url and not url.startswith("#")))
+
+
+def report_names(urls: list[str]) -> dict[str, str]:
+    """Map each URL to a unique, filesystem-safe report file name (no suffix)."""
+    names: dict[str, str] = {}
+    taken: set[str] = set()
+    for url in urls:
+        parts = urlsplit(url)
+        base = re.sub(r"[^A-Za-z0-9.-]+", "_", f"{parts.netloc}{parts.path}")
+        base = base.strip("_.") or "report"
+        name, index = base, 1
+        while name in taken:
+            index += 1
+            name = f"{base}-{index}"
+        taken.add(name)
+        names[url] = name
+    return names
+
+
+def audit_site(
+    url: str,
+    output_dir: Path,
+    name: str,
+    backend: str,
+    pdf: bool,
+    sitemaps: bool = False,
+) -> SiteResult:
+    """Analyze one site and write its report; runs inside a worker process."""
+    started = time.perf_counter()
+    try:
+        service = SEOAnalyzerService(
+            backend=backend, crawl_options=CrawlOptions(sitemaps=sitemaps)
+        )
+        report = service.analyze(url)
+        if pdf:
+            from src.pdf_generator import PDFGenerator
+
+            (output_dir / f"{name}.pdf").write_bytes(PDFGenerator.generate_bytes(report))
+        # Written after the PDF so the report's stage times include it.
+        (output_dir / f"{name}.json").write_text(report.model_dump_json(indent=2))
+    except Exception as exc:
+        return SiteResult(url, elapsed=time.perf_counter() - started, error=str(exc))
+    return SiteResult(
+        url,
+        pages=len(report.pages),
+        elapsed=time.perf_counter() - started,
+        stage_times=dict(report.stage_times),
+    )
+
+
+def run_audits(
+    urls: list[str],
+    output_dir: Path,
+    *,
+    workers: int,
+    backend: str,
+    pdf: bool = False,
+    sitemaps: bool = False,
+) -> list[SiteResult]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(audit_site, url, output_dir, name, backend, pdf, sitemaps)
+            for url, name in report_names(urls).items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result.error is None:
+                print(f"ok      {result.url} ({result.pages} pages, {result.elapsed:.1f}s)")
+            else:
+                print(f"failed  {result.url}: {result.error}", file=sys.stderr)
+    return results
+
+
+def format_throughput(results: list[SiteResult], elapsed: float) -> str:
+    succeeded = [result for result in results if result.error is None]
+    pages = sum(result.pages for result in succeeded)
+    elapsed = max(elapsed, 1e-9)
+    return (
+        f"{len(succeeded)}/{len(results)} sites, {pages} pages in {elapsed:.1f}s: "
+        f"{len(succeeded) / elapsed * 60:.1f} sites/min, {pages / elapsed:.1f} pages/s"
+    )
+
+
+def collect_metrics(results: list[SiteResult]) -> Metrics:
+    """Aggregate the stage times of every audited site into one registry."""
+    metrics = Metrics(enabled=True)
+    for result in results:
+        for stage, seconds in result.stage_times.items():
+            metrics.record(stage, seconds)
+        metrics.count("sites_audited")
+        if result.error is None:
+            metrics.count("pages_analyzed", result.pages)
+        else:
+            metrics.count("sites_failed")
+    return metrics
+
+
+def write_metrics(metrics: Metrics, path: Path) -> None:
+    """Write ``metrics`` as JSON for a ``.json`` path, else in Prometheus text format."""
+    if path.suffix == ".json":
+        path.write_text(metrics.to_json(indent=2) + "\n")
+    else:
+        path.write_text(metrics.to_prometheus())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="website-analyser-audit",
+        description="Audit every site listed in a file and write one report per site.",
+    )
+    parser.add_argument(
+        "urls_file",
+        type=argparse.FileType("r"),
+        help="File with one URL per line ('-' reads stdin); lines starting with '#' are ignored.",
+    )
+    parser.add_argument(
+        "-o", "--output-dir", type=Path, default=Path("reports"), help="Report directory."
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count).",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(CRAWL_BACKENDS),
+        default=ASYNCIO_BACKEND,
+        help="Crawl engine to use.",
+    )
+    parser.add_argument("--pdf", action="store_true", help="Also write a PDF report.")
+    parser.add_argument(
+        "--sitemaps",
+        action="store_true",
+        help="Seed each crawl from the site's sitemaps (asyncio backend only).",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        help="Write per-stage timings across all sites to this file "
+        "(JSON for a .json name, Prometheus text format otherwise).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
+    if args.sitemaps and args.backend != ASYNCIO_BACKEND:
+        parser.error("--sitemaps requires the asyncio backend.")
+    with args.urls_file:
+        urls = read_urls(args.urls_file)
+    if not urls:
+        print("No URLs to audit.", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    results = run_audits(
+        urls,
+        args.output_dir,
+        workers=min(args.workers, len(urls)),
+        backend=args.backend,
+        pdf=args.pdf,
+        sitemaps=args.sitemaps,
+    )
+    print(format_throughput(results, time.perf_counter() - started))
+    if args.metrics:
+        write_metrics(collect_metrics(results), args.metrics)
+    return 0 if all(result.error is None for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Compact, read-only stand-ins for ``Counter`` used in large reports."""
+
+import heapq
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import filterfalse
+from operator import itemgetter
+from typing import Any
+
+from pydantic_core import core_schema
+
+
+class Vocabulary:
+    """Interns terms as dense integer IDs.
+
+    Every page of a report shares one vocabulary, so a bigram that appears on
+    thousands of pages is stored once and each page only keeps its ID.
+    Not thread-safe: intern from one thread, read from any.
+    """
+
+    __slots__ = ("_terms", "_ids")
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._terms: list[str] = list(terms)
+        self._ids: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def intern(self, term: str) -> int:
+        ids = self._index()
+        term_id = ids.get(term)
+        if term_id is None:
+            term_id = ids[term] = len(self._terms)
+            self._terms.append(term)
+        return term_id
+
+    def intern_all(self, terms: Sequence[str]) -> array:
+        """Intern ``terms`` in order and return their IDs."""
+        ids = self._index()
+        # New terms are found and numbered in bulk so the per-term work stays in C.
+        new_terms = list(dict.fromkeys(filterfalse(ids.__contains__, terms)))
+        if new_terms:
+            first_id = len(self._terms)
+            ids.update(zip(new_terms, range(first_id, first_id + len(new_terms))))
+            self._terms.extend(new_terms)
+        return array("I", map(ids.__getitem__, terms))
+
+    def id_of(self, term: str) -> int | None:
+        return self._index().get(term)
+
+    def term(self, term_id: int) -> str:
+        return self._terms[term_id]
+
+    def _index(self) -> dict[str, int]:
+        # Built on first use; a vocabulary that is only read back never needs it.
+        if self._ids is None:
+            self._ids = {term: term_id for term_id, term in enumerate(self._terms)}
+        return self._ids
+
+
+class CompactCounter:
+    """Immutable term counts stored as parallel arrays of term IDs and counts.
+
+    Entries keep the order they were given in. The read API mirrors ``Counter``
+    (``[term]``, ``get``, ``in``, iteration, ``items``, ``most_common``,
+    ``total``), so code that consumed a ``Counter`` works unchanged, at a
+    fraction of the memory of a dict or a list of models. Counters built with a
+    shared ``Vocabulary`` store no strings of their own.
+    """
+
+    __slots__ = ("_vocabulary", "_ids", "_counts", "_positions")
+
+    def __init__(
+        self,
+        terms: Sequence[str] = (),
+        counts: Iterable[int] = (),
+        *,
+        vocabulary: Vocabulary | None = None,
+    ):
+        if vocabulary is None:
+            vocabulary = Vocabulary(terms)
+            self._ids = array("I", range(len(vocabulary)))
+        else:
+            self._ids = vocabulary.intern_all(terms)
+        self._vocabulary = vocabulary
+        self._counts = array("I", counts)
+        if len(self._ids) != len(self._counts):
+            raise ValueError("terms and counts must have the same length.")
+        self._positions: dict[int, int] | None = None
+
+    @classmethod
+    def from_pairs(
+        cls, pairs: Iterable[tuple[str, int]], *, vocabulary: Vocabulary | None = None
+    ) -> "CompactCounter":
+        """Pack ``(term, count)`` pairs, most common first."""
+        ordered = sorted(pairs, key=itemgetter(1), reverse=True)
+        if not ordered:
+            return cls(vocabulary=vocabulary)
+        terms, counts = zip(*ordered)
+        return cls(terms, counts, vocabulary=vocabulary)
+
+    @classmethod
+    def from_counter(
+        cls, counter: Mapping[str, int], *, vocabulary: Vocabulary | None = None
+    ) -> "CompactCounter":
+        """Pack a mapping whose keys are already ``str`` and values ``int``.
+
+        Nothing is converted or sorted, which makes this the fast path for
+        counts the crawler produced itself; use ``coerce`` for anything else.
+        """
+        return cls(list(counter), counter.values(), vocabulary=vocabulary)
+
+    @classmethod
+    def coerce(
+        cls, value: object, *, vocabulary: Vocabulary | None = None
+    ) -> "CompactCounter":
+        """Build a counter from any stored or payload shape.
+
+        Accepts a ``CompactCounter``, its ``to_dict`` form, a mapping of terms
+        to counts, or a list of such mappings (the format reports used to
+        store), which are summed.
+        """
+        if isinstance(value, CompactCounter):
+            return value
+        if isinstance(value, Mapping) and set(value) == {"words", "counts"}:
+            return cls(
+                value["words"],
+                (int(count) for count in value["counts"]),
+                vocabulary=vocabulary,
+            )
+        if isinstance(value, Mapping):
+            return cls.from_pairs(
+                ((str(term), int(count)) for term, count in value.items()),
+                vocabulary=vocabulary,
+            )
+        if isinstance(value, list) and all(isinstance(item, Mapping) for item in value):
+            merged: dict[str, int] = {}
+            for item in value:
+                for term, count in item.items():
+                    merged[str(term)] = merged.get(str(term), 0) + int(count)
+            return cls.from_pairs(merged.items(), vocabulary=vocabulary)
+        raise ValueError("expected a mapping of terms to counts.")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._vocabulary.term, self._ids)
+
+    def __contains__(self, term: object) -> bool:
+        return isinstance(term, str) and self._position(term) is not None
+
+    def __getitem__(self, term: str) -> int:
+        position = self._position(term)
+        return 0 if position is None else self._counts[position]
+
+    def get(self, term: str, default: int | None = None) -> int | None:
+        position = self._position(term)
+        return default if position is None else self._counts[position]
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def values(self) -> Iterator[int]:
+        return iter(self._counts)
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        return zip(self, self._counts)
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        if n is None:
+            return sorted(self.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(n, self.items(), key=itemgetter(1))
+
+    def total(self) -> int:
+        return sum(self._counts)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactCounter):
+            if self._vocabulary is other._vocabulary:
+                return self._ids == other._ids and self._counts == other._counts
+            return dict(self.items()) == dict(other.items())
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CompactCounter({dict(self.most_common(5))!r}, entries={len(self)})"
+
+    def to_dict(self) -> dict[str, list]:
+        return {"words": list(self), "counts": list(self._counts)}
+
+    @classmethod
+    def from_dict(
+        cls, value: Mapping[str, Sequence], *, vocabulary: Vocabulary | None = None
+    ) -> "CompactCounter":
+        return cls.coerce(value, vocabulary=vocabulary)
+
+    def _position(self, term: str) -> int | None:
+        term_id = self._vocabulary.id_of(term)
+        if term_id is None:
+            return None
+        # Built on first keyed access only; iteration never needs it.
+        if self._positions is None:
+            self._positions = {
+                term_id: position for position, term_id in enumerate(self._ids)
+            }
+        return self._positions.get(term_id)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any):
+        return core_schema.no_info_plain_validator_function(
+            cls.coerce,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda value: value.to_dict()
+            ),
+        )
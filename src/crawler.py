@@ -0,0 +1,616 @@
+import asyncio
+import hashlib
+import time
+from collections import defaultdict, deque
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from operator import itemgetter
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from pyseoanalyzer.page import Page as PageAnalyzer
+from pyseoanalyzer.stemmer import stem
+
+from src.http_client import ResponseTooLarge, get_http_client
+from src.keywords import KeywordAggregator
+from src.models import Page
+from src.near_duplicates import simhash
+from src.politeness import (
+    THROTTLE_STATUS_CODES,
+    PolitenessScheduler,
+    get_politeness_scheduler,
+)
+from src.sitemap import (
+    DEFAULT_PRIORITY,
+    SITEMAP_MAX_BYTES,
+    SitemapEntry,
+    SitemapError,
+    parse_sitemap,
+    validated_batches,
+)
+from src.url_safety import ResolvedUrl, UnsafeUrlError, resolve_public_url
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+KEYWORD_MIN_COUNT = 5
+DEFAULT_MAX_PAGE_BYTES = 10 * 1024 * 1024
+MAX_THROTTLED_RETRIES = 2
+MAX_SITEMAP_FILES = 1000
+# Sitemap seeding pauses once this many URLs wait in the frontier and resumes
+# when the workers have drained it to half.
+FRONTIER_HIGH_WATER = 10_000
+MAX_START_REDIRECTS = 5
+START_PRIORITY = 1.0
+
+
+@dataclass(frozen=True)
+class CrawlOptions:
+    """How a crawl is run, plus the budgets that stop it early.
+
+    ``None`` disables a budget. ``max_depth`` counts link hops from the start
+    URL, ``deadline`` is wall-clock seconds for the whole crawl. With
+    ``obey_robots`` the host's robots.txt Disallow rules are honoured and its
+    Crawl-delay caps the request rate. With ``sitemaps`` the frontier is also
+    seeded from the sitemaps announced in robots.txt (or ``/sitemap.xml``).
+    """
+
+    max_concurrency: int = 16
+    max_per_host: int = 8
+    follow_links: bool = True
+    timeout: float = 10.0
+    max_pages: int | None = None
+    max_depth: int | None = None
+    max_page_bytes: int | None = DEFAULT_MAX_PAGE_BYTES
+    max_total_bytes: int | None = None
+    deadline: float | None = None
+    obey_robots: bool = True
+    sitemaps: bool = False
+
+    def __post_init__(self):
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if self.max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1.")
+        for name in ("max_pages", "max_page_bytes", "max_total_bytes", "deadline"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive.")
+        if self.max_depth is not None and self.max_depth < 0:
+            raise ValueError("max_depth must not be negative.")
+
+
+def fetch_page(
+    resolved: ResolvedUrl,
+    timeout: float,
+    headers: dict[str, str] | None = None,
+    max_bytes: int | None = None,
+) -> requests.Response:
+    return get_http_client().get_pinned(
+        resolved, timeout=timeout, headers=headers, max_bytes=max_bytes
+    )
+
+
+class AsyncCrawler:
+    """Crawl a single site concurrently and return a pyseoanalyzer-shaped payload.
+
+    Fetching and parsing run in worker threads scheduled by asyncio, bounded by a
+    global limit and a per-host limit. Pages are parsed with pyseoanalyzer's own
+    page analyzer, so the output feeds ``SEOAnalyzerService._create_report``
+    exactly like the blocking backend does.
+
+    Passing the pages of a previous run enables incremental mode: those URLs
+    are queued up front, fetched with conditional request headers, and any page
+    answering 304 or returning byte-identical HTML is yielded as the previous
+    ``Page`` (validation included) instead of being parsed again.
+
+    ``progress(done, discovered)`` is called before each page is handed to the
+    consumer; raising from it stops the crawl.
+
+    Sitemap URLs are streamed into the frontier while the crawl runs, highest
+    ``priority`` first. In incremental mode a page whose sitemap ``lastmod`` is
+    not newer than its previous Last-Modified is reused without a request.
+
+    When a budget from ``CrawlOptions`` runs out the crawl stops cleanly: the
+    pages gathered so far are still returned and ``errors`` names the limit.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        options: CrawlOptions | None = None,
+        fetch=None,
+        previous_pages: Iterable[Page] | None = None,
+        progress: Callable[[int, int], None] | None = None,
+        scheduler: PolitenessScheduler | None = None,
+    ):
+        self.base_url = base_url
+        self.options = options or CrawlOptions()
+        self._fetch = fetch or fetch_page
+        self._base_netloc = urlsplit(base_url).netloc
+        # The start URL and the targets it redirected to; a redirect from one of
+        # them may move the crawl to another host (e.g. apex -> www).
+        self._site_url = base_url
+        self._start_urls = {base_url}
+        self._previous = {page.url: page for page in previous_pages or ()}
+        self._lastmod: dict[str, datetime] = {}
+        self._reused = 0
+        self._refreshed = 0
+        self._progress = progress
+        self._scheduler = scheduler or get_politeness_scheduler()
+        self._crawled = 0
+        self._pages = 0
+        self._bytes = 0
+        self._stop_reason: str | None = None
+        self._depth_limited = False
+        self._seen: set[str] = set()
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._global_limit: asyncio.Semaphore | None = None
+        self._frontier_has_room: asyncio.Event | None = None
+        self._errors: list[str] = []
+        # Stemmed words, bigrams and trigrams never collide (n-grams contain spaces).
+        self._keywords = KeywordAggregator(min_count=KEYWORD_MIN_COUNT)
+        self._content_hashes: defaultdict[str, set[str]] = defaultdict(set)
+        self._sequence = 0
+        self._total_time = 0.0
+
+    async def crawl(self) -> dict[str, object]:
+        pages = [item async for item in self._stream()]
+        pages.sort(key=itemgetter(0))
+        return {"pages": [page for _, page in pages], **self.summary()}
+
+    async def iter_pages(self) -> AsyncIterator[dict[str, object] | Page]:
+        """Yield each page as soon as it has been crawled.
+
+        Freshly parsed pages are payload dicts; pages reused in incremental mode
+        are the previous run's ``Page`` objects.
+        """
+        async for _, page in self._stream():
+            yield page
+
+    def summary(self) -> dict[str, object]:
+        """Site-wide results; complete once the page stream is exhausted."""
+        return {
+            **self._site_keywords(),
+            "errors": list(self._errors),
+            "total_time": self._total_time,
+            "duplicate_pages": [
+                sorted(urls) for urls in self._content_hashes.values() if len(urls) > 1
+            ],
+            "reused_pages": self._reused,
+            "refreshed_pages": self._refreshed,
+        }
+
+    async def _stream(self) -> AsyncIterator[tuple[int, dict[str, object]]]:
+        start_time = time.perf_counter()
+        # Ordered by (-priority, sequence): best sitemap priority first, then FIFO.
+        frontier: asyncio.PriorityQueue[tuple[float, int, str, int]] = (
+            asyncio.PriorityQueue()
+        )
+        # Bounded so a slow consumer applies back-pressure instead of buffering pages.
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.options.max_concurrency * 2)
+        self._global_limit = asyncio.Semaphore(self.options.max_concurrency)
+        self._frontier_has_room = asyncio.Event()
+        self._enqueue(frontier, self.base_url, 0, START_PRIORITY)
+        for url in self._previous:
+            if urlsplit(url).netloc == self._base_netloc:
+                self._enqueue(frontier, url, 0)
+
+        seeding = None
+        if self.options.sitemaps:
+            seeding = asyncio.create_task(self._seed_from_sitemaps(frontier))
+
+        async def close_when_drained():
+            if seeding is not None:
+                await seeding
+            await frontier.join()
+            await results.put(None)
+
+        tasks = [
+            asyncio.create_task(self._worker(frontier, results))
+            for _ in range(self.options.max_concurrency)
+        ]
+        if seeding is not None:
+            tasks.append(seeding)
+        tasks.append(asyncio.create_task(close_when_drained()))
+        deadline = self.options.deadline
+        try:
+            while True:
+                remaining = None
+                if deadline is not None:
+                    remaining = start_time + deadline - time.perf_counter()
+                try:
+                    item = await asyncio.wait_for(results.get(), remaining)
+                except TimeoutError:
+                    self._stop(f"deadline of {deadline:g}s reached (deadline)")
+                    break
+                if item is None:
+                    break
+
+                self._pages += 1
+                if self._progress is not None:
+                    # Runs in the consumer, so an exception here aborts the crawl.
+                    self._progress(self._crawled, len(self._seen))
+                yield item
+
+                max_pages = self.options.max_pages
+                if max_pages is not None and self._pages >= max_pages:
+                    self._stop(f"page limit of {max_pages} reached (max_pages)")
+                if self._stop_reason is not None:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._total_time = time.perf_counter() - start_time
+
+    def _enqueue(
+        self,
+        queue: asyncio.Queue,
+        url: str,
+        depth: int,
+        priority: float = DEFAULT_PRIORITY,
+    ) -> None:
+        if url in self._seen:
+            return
+        max_depth = self.options.max_depth
+        if max_depth is not None and depth > max_depth:
+            if not self._depth_limited:
+                self._depth_limited = True
+                self._errors.append(
+                    f"Links more than {max_depth} levels deep were not followed (max_depth)"
+                )
+            return
+        self._seen.add(url)
+        queue.put_nowait((-priority, self._sequence, url, depth))
+        self._sequence += 1
+
+    def _stop(self, reason: str) -> None:
+        if self._stop_reason is None:
+            self._stop_reason = reason
+            self._errors.append(f"Crawl stopped early: {reason}")
+
+    async def _worker(self, frontier: asyncio.Queue, results: asyncio.Queue) -> None:
+        while True:
+            _, sequence, url, depth = await frontier.get()
+            if frontier.qsize() <= FRONTIER_HIGH_WATER // 2:
+                self._frontier_has_room.set()
+            try:
+                if self._stop_reason is not None:
+                    continue
+                page, links = await self._crawl_url(url)
+                if page is not None:
+                    await results.put((sequence, page))
+                    if self.options.follow_links:
+                        for link in links:
+                            self._enqueue(frontier, link, depth + 1)
+                else:
+                    # A redirect: its target stands in for this URL.
+                    for link in links:
+                        self._enqueue(frontier, link, depth)
+            except Exception as exc:  # one bad page must not stop the crawl
+                self._errors.append(f"Failed to crawl {url}: {exc}")
+            finally:
+                self._crawled += 1
+                frontier.task_done()
+
+    async def _crawl_url(
+        self, url: str
+    ) -> tuple[dict[str, object] | Page | None, list[str]]:
+        try:
+            resolved = await asyncio.to_thread(resolve_public_url, url)
+        except UnsafeUrlError as exc:
+            self._errors.append(f"Skipped {url}: {exc}")
+            return None, []
+
+        safe_url = resolved.url
+        if safe_url != url:
+            if safe_url in self._seen:
+                return None, []
+            self._seen.add(safe_url)
+
+        if self.options.obey_robots:
+            robots = await asyncio.to_thread(self._scheduler.robots, resolved, self._fetch)
+            if not robots.allows(safe_url):
+                self._errors.append(f"Skipped {safe_url}: disallowed by robots.txt")
+                return None, []
+
+        previous = self._previous.get(safe_url)
+        if previous is not None and self._unchanged_in_sitemap(previous):
+            return self._reuse_page(previous), []
+
+        max_page_bytes = self.options.max_page_bytes
+        try:
+            response = await self._fetch_limited(
+                resolved, _conditional_headers(previous), max_bytes=max_page_bytes
+            )
+        except ResponseTooLarge as exc:
+            self._errors.append(f"Skipped {safe_url}: {exc} (max_page_bytes)")
+            return None, []
+
+        self._bytes += len(response.content)
+        max_total_bytes = self.options.max_total_bytes
+        if max_total_bytes is not None and self._bytes > max_total_bytes:
+            self._stop(f"downloaded more than {max_total_bytes} bytes (max_total_bytes)")
+        if max_page_bytes is not None and len(response.content) > max_page_bytes:
+            self._errors.append(
+                f"Skipped {safe_url}: response is over the {max_page_bytes} byte limit "
+                "(max_page_bytes)"
+            )
+            return None, []
+
+        if response.status_code == 304 and previous is not None:
+            return self._reuse_page(previous, response), []
+
+        if 300 <= response.status_code < 400:
+            return None, await self._follow_redirect(url, safe_url, response)
+
+        if response.status_code >= 400:
+            self._errors.append(f"{safe_url} returned HTTP {response.status_code}")
+            return None, []
+
+        content_type = response.headers.get("Content-Type", "text/html")
+        if not content_type.lower().startswith(HTML_CONTENT_TYPES):
+            return None, []
+
+        html = _decode_html(response.content, content_type)
+        if previous is not None and previous.content_hash == _content_hash(html):
+            return self._reuse_page(previous, response), []
+
+        analyzer, fingerprint = await asyncio.to_thread(self._analyze_html, safe_url, html)
+        page = self._record_page(analyzer)
+        page["simhash"] = fingerprint
+        page["etag"] = response.headers.get("ETag")
+        page["last_modified"] = response.headers.get("Last-Modified")
+        if self._previous:
+            self._refreshed += 1
+        return page, self._same_site_links(analyzer.links)
+
+    async def _follow_redirect(
+        self, url: str, safe_url: str, response: requests.Response
+    ) -> list[str]:
+        """Return the redirect target to crawl, or record why it is skipped."""
+        location = response.headers.get("Location")
+        if not location:
+            self._errors.append(
+                f"{safe_url} returned HTTP {response.status_code} without a Location"
+            )
+            return []
+        target = urljoin(safe_url, location)
+        if url in self._start_urls or safe_url in self._start_urls:
+            if len(self._start_urls) > MAX_START_REDIRECTS:
+                self._errors.append(f"Skipped {target}: too many redirects from the start URL")
+                return []
+            try:
+                resolved = await asyncio.to_thread(resolve_public_url, target)
+            except UnsafeUrlError as exc:
+                self._errors.append(f"Skipped redirect from {safe_url} to {target}: {exc}")
+                return []
+            # The site lives where its start URL redirects to.
+            self._start_urls.add(resolved.url)
+            self._site_url = resolved.url
+            self._base_netloc = resolved.netloc
+            return [resolved.url]
+        same_site = self._same_site_links([target])
+        if not same_site:
+            self._errors.append(
+                f"Skipped redirect from {safe_url} to {target}: "
+                f"outside {self._base_netloc}"
+            )
+        return same_site
+
+    async def _fetch_limited(
+        self,
+        resolved: ResolvedUrl,
+        headers: dict[str, str] | None = None,
+        *,
+        max_bytes: int | None,
+    ) -> requests.Response:
+        """Fetch within the concurrency limits at the pace the host allows.
+
+        429/503 answers slow the host down and are retried a few times.
+        """
+        host = resolved.netloc
+        host_limit = self._host_limits.setdefault(
+            host, asyncio.Semaphore(self.options.max_per_host)
+        )
+        for attempt in range(MAX_THROTTLED_RETRIES + 1):
+            await asyncio.sleep(self._scheduler.reserve(host))
+            async with self._global_limit, host_limit:
+                started = time.perf_counter()
+                response = await asyncio.to_thread(
+                    self._fetch,
+                    resolved,
+                    self.options.timeout,
+                    headers,
+                    max_bytes,
+                )
+            self._scheduler.record(
+                host,
+                response.status_code,
+                time.perf_counter() - started,
+                response.headers.get("Retry-After"),
+            )
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                break
+        return response
+
+    async def _seed_from_sitemaps(self, frontier: asyncio.Queue) -> None:
+        """Stream the site's sitemaps (following sitemap indexes) into the frontier.
+
+        Seeding waits while the frontier holds ``FRONTIER_HIGH_WATER`` URLs and
+        stops at ``max_pages``, so a huge sitemap index is read only as fast as
+        it is crawled; sitemap priorities order just the URLs seeded so far.
+        """
+        rejected = 0
+        try:
+            pending = deque(await self._sitemap_locations())
+            fetched: set[str] = set()
+            while pending and len(fetched) < MAX_SITEMAP_FILES and not self._seeding_done():
+                sitemap_url = pending.popleft()
+                if sitemap_url in fetched:
+                    continue
+                fetched.add(sitemap_url)
+                entries = await self._fetch_sitemap(sitemap_url)
+                if entries is None:
+                    continue
+                batches = validated_batches(entries)
+                try:
+                    # Parse and validate off the event loop, one batch at a time.
+                    while batch := await asyncio.to_thread(next, batches, None):
+                        accepted, batch_rejected = batch
+                        rejected += batch_rejected
+                        for entry in accepted:
+                            if entry.is_sitemap:
+                                if len(fetched) + len(pending) < MAX_SITEMAP_FILES:
+                                    pending.append(entry.url)
+                            elif urlsplit(entry.url).netloc == self._base_netloc:
+                                await self._wait_for_frontier_room(frontier)
+                                if self._seeding_done():
+                                    break
+                                self._seed(frontier, entry)
+                        if self._seeding_done():
+                            break
+                except SitemapError as exc:
+                    self._errors.append(f"Skipped sitemap {sitemap_url}: {exc}")
+        except Exception as exc:  # a broken sitemap must not stop the crawl
+            self._errors.append(f"Failed to read the sitemaps: {exc}")
+        if rejected:
+            self._errors.append(
+                f"Skipped {rejected} sitemap URLs that failed the URL safety checks"
+            )
+
+    async def _sitemap_locations(self) -> list[str]:
+        resolved = await asyncio.to_thread(resolve_public_url, self.base_url)
+        if self.options.obey_robots:
+            robots = await asyncio.to_thread(self._scheduler.robots, resolved, self._fetch)
+            if robots.sitemaps:
+                return robots.sitemaps
+        return [f"{resolved.scheme}://{resolved.netloc}/sitemap.xml"]
+
+    async def _fetch_sitemap(self, sitemap_url: str) -> Iterator[SitemapEntry] | None:
+        try:
+            resolved = await asyncio.to_thread(resolve_public_url, sitemap_url)
+            response = await self._fetch_limited(resolved, max_bytes=SITEMAP_MAX_BYTES)
+        except (UnsafeUrlError, ResponseTooLarge) as exc:
+            self._errors.append(f"Skipped sitemap {sitemap_url}: {exc}")
+            return None
+        if response.status_code != 200:
+            self._errors.append(
+                f"Sitemap {sitemap_url} returned HTTP {response.status_code}"
+            )
+            return None
+        return parse_sitemap(response.content)
+
+    def _seed(self, frontier: asyncio.Queue, entry: SitemapEntry) -> None:
+        # Only pages from the previous run can be skipped, so only their
+        # lastmod is worth keeping.
+        if entry.lastmod is not None and entry.url in self._previous:
+            self._lastmod[entry.url] = entry.lastmod
+        self._enqueue(frontier, entry.url, 0, entry.priority)
+
+    async def _wait_for_frontier_room(self, frontier: asyncio.Queue) -> None:
+        if frontier.qsize() >= FRONTIER_HIGH_WATER:
+            self._frontier_has_room.clear()
+            await self._frontier_has_room.wait()
+
+    def _seeding_done(self) -> bool:
+        max_pages = self.options.max_pages
+        return self._stop_reason is not None or (
+            max_pages is not None and len(self._seen) >= max_pages
+        )
+
+    def _unchanged_in_sitemap(self, previous: Page) -> bool:
+        lastmod = self._lastmod.get(previous.url)
+        if lastmod is None or not previous.last_modified:
+            return False
+        try:
+            last_seen = parsedate_to_datetime(previous.last_modified)
+        except (TypeError, ValueError):
+            return False
+        if last_seen.tzinfo is None:
+            last_seen = last_seen.replace(tzinfo=timezone.utc)
+        return lastmod <= last_seen
+
+    def _analyze_html(self, url: str, html: str) -> tuple[PageAnalyzer, str | None]:
+        analyzer = PageAnalyzer(url=url, base_domain=self._site_url)
+        analyzer.analyze(raw_html=html)
+        return analyzer, simhash(analyzer.trigrams)
+
+    def _record_page(self, analyzer: PageAnalyzer) -> dict[str, object]:
+        self._content_hashes[analyzer.content_hash].add(analyzer.url)
+        self._keywords.add(analyzer.wordcount)
+        self._keywords.add(analyzer.bigrams)
+        self._keywords.add(analyzer.trigrams)
+        return {**analyzer.talk(), "word_counts": analyzer.wordcount}
+
+    def _reuse_page(
+        self, previous: Page, response: requests.Response | None = None
+    ) -> Page:
+        # Merge the same counts _record_page does, so site keywords match a
+        # full crawl. Pages without word counts (pyseoanalyzer backend runs)
+        # only have their ranked keywords to give.
+        if previous.word_counts:
+            self._keywords.add_keywords(previous.word_counts.items())
+        else:
+            self._keywords.add_keywords(
+                (stem(keyword.word), keyword.count) for keyword in previous.keywords
+            )
+            self._keywords.add_keywords(
+                (stem(word), count) for word, count in previous.keyword_tail.items()
+            )
+        self._keywords.add_keywords(previous.bigrams.items())
+        self._keywords.add_keywords(previous.trigrams.items())
+        if previous.content_hash is not None:
+            self._content_hashes[previous.content_hash].add(previous.url)
+        self._reused += 1
+        if response is None:
+            return previous.model_copy()
+        return previous.model_copy(
+            update={
+                "etag": response.headers.get("ETag") or previous.etag,
+                "last_modified": response.headers.get("Last-Modified")
+                or previous.last_modified,
+            }
+        )
+
+    def _same_site_links(self, links: list[str]) -> list[str]:
+        same_site = []
+        for link in links:
+            parsed = urlsplit(link)
+            if parsed.scheme in ("http", "https") and parsed.netloc == self._base_netloc:
+                same_site.append(parsed._replace(fragment="").geturl())
+        return same_site
+
+    def _site_keywords(self) -> dict[str, object]:
+        top, tail = self._keywords.ranking()
+        return {
+            "keywords": [{"word": word, "count": count} for word, count in top],
+            "keyword_tail": tail,
+        }
+
+
+def _conditional_headers(previous: Page | None) -> dict[str, str] | None:
+    if previous is None:
+        return None
+
+    headers = {}
+    if previous.etag:
+        headers["If-None-Match"] = previous.etag
+    if previous.last_modified:
+        headers["If-Modified-Since"] = previous.last_modified
+    return headers or None
+
+
+def _content_hash(html: str) -> str:
+    # Same digest pyseoanalyzer stores in Page.content_hash.
+    return hashlib.sha1(html.encode("utf-8")).hexdigest()
+
+
+def _decode_html(content: bytes, content_type: str) -> str:
+    _, _, charset = content_type.partition("charset=")
+    encoding = charset.split(";")[0].strip().strip('"') or "utf-8"
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
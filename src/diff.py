@@ -0,0 +1,118 @@
+from collections import Counter
+
+from src.models import (
+    FieldChange,
+    KeyWord,
+    KeywordMovement,
+    Page,
+    PageChange,
+    Report,
+    ReportDiff,
+)
+
+KEYWORD_DIFF_LIMIT = 20
+COMPARED_FIELDS = ("title", "description", "word_count")
+
+
+def diff_reports(
+    old: Report, new: Report, *, keyword_limit: int = KEYWORD_DIFF_LIMIT
+) -> ReportDiff:
+    """Compute what changed between two runs of the same site.
+
+    Pages are matched by URL first. Pages left over on both sides are then
+    matched by ``content_hash``, so a page that only moved to a new URL shows up
+    as a moved page rather than as one removal plus one addition. Every step is
+    a dictionary lookup, so the diff is linear in the number of pages.
+    """
+    old_by_url = {page.url: page for page in old.pages}
+    new_by_url = {page.url: page for page in new.pages}
+
+    changed_pages = []
+    for url, new_page in new_by_url.items():
+        old_page = old_by_url.get(url)
+        if old_page is not None:
+            change = _page_change(old_page, new_page)
+            if change is not None:
+                changed_pages.append(change)
+
+    removed = {url: page for url, page in old_by_url.items() if url not in new_by_url}
+    added = [page for url, page in new_by_url.items() if url not in old_by_url]
+
+    removed_by_hash: dict[str, list[Page]] = {}
+    for page in removed.values():
+        if page.content_hash is not None:
+            removed_by_hash.setdefault(page.content_hash, []).append(page)
+
+    added_pages = []
+    for page in added:
+        candidates = removed_by_hash.get(page.content_hash) if page.content_hash else None
+        if not candidates:
+            added_pages.append(page.url)
+            continue
+        old_page = candidates.pop()
+        del removed[old_page.url]
+        change = _page_change(old_page, page) or PageChange(url=page.url)
+        change.previous_url = old_page.url
+        changed_pages.append(change)
+
+    new_groups = _duplicate_groups(new.duplicate_pages)
+    old_groups = _duplicate_groups(old.duplicate_pages)
+
+    return ReportDiff(
+        added_pages=added_pages,
+        removed_pages=list(removed),
+        changed_pages=changed_pages,
+        keyword_movements=_keyword_movements(old.keywords, new.keywords, keyword_limit),
+        new_duplicate_groups=[sorted(group) for group in new_groups - old_groups],
+        resolved_duplicate_groups=[sorted(group) for group in old_groups - new_groups],
+    )
+
+
+def _page_change(old: Page, new: Page) -> PageChange | None:
+    changes = [
+        FieldChange(field=field, old=getattr(old, field), new=getattr(new, field))
+        for field in COMPARED_FIELDS
+        if getattr(old, field) != getattr(new, field)
+    ]
+    # Multisets, so a warning that now fires twice more is reported as new.
+    old_warnings = Counter(old.warnings)
+    new_warnings = Counter(new.warnings)
+    added = list((new_warnings - old_warnings).elements())
+    resolved = list((old_warnings - new_warnings).elements())
+
+    if not (changes or added or resolved):
+        return None
+    return PageChange(
+        url=new.url, changes=changes, new_warnings=added, resolved_warnings=resolved
+    )
+
+
+def _keyword_movements(
+    old: list[KeyWord], new: list[KeyWord], limit: int
+) -> list[KeywordMovement]:
+    old_ranks = {keyword.word: (rank, keyword.count) for rank, keyword in enumerate(old, 1)}
+    new_ranks = {keyword.word: (rank, keyword.count) for rank, keyword in enumerate(new, 1)}
+
+    # Only movement into, out of or within the top ``limit`` is worth reporting.
+    tracked = dict.fromkeys(keyword.word for keyword in new[:limit])
+    tracked.update(dict.fromkeys(keyword.word for keyword in old[:limit]))
+
+    movements = []
+    for word in tracked:
+        old_rank, old_count = old_ranks.get(word, (None, 0))
+        new_rank, new_count = new_ranks.get(word, (None, 0))
+        if old_rank != new_rank:
+            movements.append(
+                KeywordMovement(
+                    word=word,
+                    old_rank=old_rank,
+                    new_rank=new_rank,
+                    old_count=old_count,
+                    new_count=new_count,
+                )
+            )
+    return movements
+
+
+def _duplicate_groups(groups: list[list[str]]) -> set[frozenset[str]]:
+    return {frozenset(group) for group in groups}
@@ -0,0 +1,247 @@
+import threading
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3 import Timeout as Urllib3Timeout
+from urllib3._collections import RecentlyUsedContainer
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from src.url_safety import ResolvedUrl
+
+Timeout = float | tuple[float, float]
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; website-analyser)"
+DEFAULT_TIMEOUT: Timeout = 10
+DEFAULT_POOL_CONNECTIONS = 32
+DEFAULT_POOL_MAXSIZE = 10
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(requests.RequestException):
+    """The response body exceeded the size the caller was willing to read."""
+
+
+@dataclass(frozen=True)
+class ConnectionStats:
+    requests: int
+    connections: int
+    pools: int
+
+    @property
+    def reused(self) -> int:
+        """Requests served on an already-open keep-alive connection."""
+        return max(self.requests - self.connections, 0)
+
+
+class HttpClient:
+    """Shared, pooled HTTP client for every outbound call the app makes.
+
+    Connections are kept alive per host, pool sizes can be tuned per host and
+    response bodies are decompressed transparently (gzip/deflate, plus brotli when
+    the optional ``brotli`` package is installed). Pages are only fetched with
+    ``get_pinned``, from a URL that already passed ``resolve_public_url``; there
+    is no plain GET. Redirects are never followed, because every redirect target
+    would have to go through the URL safety checks again.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        host_pool_sizes: dict[str, int] | None = None,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ):
+        self.timeout = timeout
+        self._pool_maxsize = pool_maxsize
+        self._host_pool_sizes = dict(host_pool_sizes or {})
+        self._pinned_pools: RecentlyUsedContainer = RecentlyUsedContainer(
+            pool_connections, dispose_func=lambda pool: pool.close()
+        )
+        self._pinned_pools_lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = user_agent
+        self._adapters = [
+            self._mount(prefix, pool_connections, pool_maxsize)
+            for prefix in ("https://", "http://")
+        ]
+        for host, maxsize in (host_pool_sizes or {}).items():
+            for scheme in ("https", "http"):
+                self._adapters.append(self._mount(f"{scheme}://{host}/", 1, maxsize))
+
+    def _mount(self, prefix: str, pool_connections: int, pool_maxsize: int) -> HTTPAdapter:
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
+        )
+        self._session.mount(prefix, adapter)
+        return adapter
+
+    def get_pinned(
+        self,
+        resolved: ResolvedUrl,
+        *,
+        timeout: Timeout | None = None,
+        headers: dict[str, str] | None = None,
+        max_bytes: int | None = None,
+    ) -> requests.Response:
+        """GET a vetted URL by connecting straight to one of its checked addresses.
+
+        The host is never resolved again: the connection goes to the IP address
+        that passed ``resolve_public_url``, while TLS still uses the real host
+        name for SNI and certificate verification and the Host header is kept.
+        Redirects are never followed. With ``max_bytes`` the decoded body is read
+        incrementally and ``ResponseTooLarge`` is raised once it grows past the
+        limit, so an oversized page is never held in memory.
+        """
+        request = requests.Request(
+            "GET", resolved.url, headers={**self._session.headers, **(headers or {})}
+        ).prepare()
+        request.headers["Host"] = resolved.netloc
+        adapter = self._session.get_adapter(resolved.url)
+        urllib3_timeout = _urllib3_timeout(self.timeout if timeout is None else timeout)
+
+        last_error: Exception | None = None
+        for address in resolved.addresses:
+            pool = self._pinned_pool(resolved, address)
+            try:
+                response = pool.urlopen(
+                    "GET",
+                    request.path_url,
+                    headers=request.headers,
+                    redirect=False,
+                    assert_same_host=False,
+                    retries=False,
+                    preload_content=False,
+                    decode_content=False,
+                    timeout=urllib3_timeout,
+                )
+            except (NewConnectionError, ConnectTimeoutError) as exc:
+                last_error = exc
+                continue
+            except Urllib3HTTPError as exc:
+                raise requests.ConnectionError(exc, request=request) from exc
+            pinned_response = adapter.build_response(request, response)
+            if max_bytes is not None:
+                _read_limited(pinned_response, max_bytes)
+            # Read the body now, like requests does, so the connection goes back
+            # to the pool for the next request.
+            pinned_response.content
+            return pinned_response
+
+        raise requests.ConnectionError(last_error, request=request)
+
+    def _pinned_pool(self, resolved: ResolvedUrl, address: str) -> HTTPConnectionPool:
+        key = (resolved.scheme, address, resolved.port, resolved.hostname)
+        with self._pinned_pools_lock:
+            pool = self._pinned_pools.get(key)
+            if pool is not None:
+                return pool
+
+            maxsize = self._host_pool_sizes.get(resolved.netloc, self._pool_maxsize)
+            if resolved.scheme == "https":
+                pool = HTTPSConnectionPool(
+                    address,
+                    resolved.port,
+                    maxsize=maxsize,
+                    cert_reqs="CERT_REQUIRED",
+                    ca_certs=DEFAULT_CA_BUNDLE_PATH,
+                    server_hostname=resolved.hostname,
+                    assert_hostname=resolved.hostname,
+                )
+            else:
+                pool = HTTPConnectionPool(address, resolved.port, maxsize=maxsize)
+            self._pinned_pools[key] = pool
+            return pool
+
+    def post(
+        self,
+        url: str,
+        *,
+        data: bytes | None = None,
+        timeout: Timeout | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        return self._session.post(
+            url,
+            data=data,
+            timeout=self.timeout if timeout is None else timeout,
+            headers=headers,
+            allow_redirects=False,
+        )
+
+    def stats(self) -> ConnectionStats:
+        requests_made = connections = pools = 0
+        pool_containers = [adapter.poolmanager.pools for adapter in self._adapters]
+        pool_containers.append(self._pinned_pools)
+        for pool_container in pool_containers:
+            for key in pool_container.keys():
+                pool = pool_container.get(key)
+                if pool is None:
+                    continue
+                pools += 1
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+        return ConnectionStats(requests=requests_made, connections=connections, pools=pools)
+
+    def close(self) -> None:
+        self._session.close()
+        with self._pinned_pools_lock:
+            self._pinned_pools.clear()
+
+
+def _read_limited(response: requests.Response, max_bytes: int) -> None:
+    declared = response.headers.get("Content-Length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        response.close()
+        raise ResponseTooLarge(
+            f"response declares {declared} bytes, over the {max_bytes} byte limit",
+            response=response,
+        )
+
+    body = bytearray()
+    for chunk in response.iter_content(READ_CHUNK_SIZE):
+        body += chunk
+        if len(body) > max_bytes:
+            # Drop the connection instead of draining the rest of the body.
+            response.close()
+            raise ResponseTooLarge(
+                f"response is over the {max_bytes} byte limit", response=response
+            )
+    response._content = bytes(body)
+
+
+def _urllib3_timeout(timeout: Timeout) -> Urllib3Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return Urllib3Timeout(connect=connect, read=read)
+    return Urllib3Timeout(connect=timeout, read=timeout)
+
+
+_shared_client: HttpClient | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = HttpClient()
+    return _shared_client
+
+
+def configure_http_client(**options) -> HttpClient:
+    """Replace the shared client, e.g. to change timeouts or per-host pool sizes."""
+    global _shared_client
+    with _shared_client_lock:
+        previous, _shared_client = _shared_client, HttpClient(**options)
+    if previous is not None:
+        previous.close()
+    return _shared_client
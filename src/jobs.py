@@ -0,0 +1,200 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from enum import StrEnum
+from typing import Any
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_FINISHED_JOBS = 100
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = frozenset(
+    {JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED}
+)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's work function once cancellation was requested."""
+
+
+class Job:
+    """State of one background task, safe to read from any thread.
+
+    The work function receives its ``Job`` and reports through
+    ``update_progress``, which doubles as a cancellation point: once
+    ``cancel`` has been called it raises ``JobCancelled``.
+    """
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.created_at = time.time()
+        self.finished_at: float | None = None
+        self.result: Any = None
+        self.error: str | None = None
+        self._status = JobStatus.PENDING
+        self._done = 0
+        self._total = 0
+        self._lock = threading.Lock()
+        self._cancel_requested = threading.Event()
+        self._future: Future | None = None
+
+    @property
+    def status(self) -> JobStatus:
+        with self._lock:
+            if self._status is JobStatus.PENDING and self._future is not None:
+                if self._future.cancelled():
+                    return JobStatus.CANCELLED
+            return self._status
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def progress(self) -> tuple[int, int]:
+        with self._lock:
+            return self._done, self._total
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def update_progress(self, done: int, total: int) -> None:
+        with self._lock:
+            self._done, self._total = done, total
+        self.raise_if_cancelled()
+
+    def raise_if_cancelled(self) -> None:
+        if self._cancel_requested.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled.")
+
+    def cancel(self) -> bool:
+        """Request cancellation; returns False if the job already finished."""
+        if self.finished:
+            return False
+        self._cancel_requested.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(JobStatus.CANCELLED)
+        return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the job finishes; returns whether it did within ``timeout``."""
+        if self._future is None:
+            return self.finished
+        try:
+            self._future.exception(timeout=timeout)
+        except TimeoutError:
+            return False
+        except CancelledError:
+            pass
+        return True
+
+    def _start(self) -> bool:
+        with self._lock:
+            if self._status is not JobStatus.PENDING:
+                return False
+            self._status = JobStatus.RUNNING
+            return True
+
+    def _finish(self, status: JobStatus, *, result: Any = None, error: str | None = None):
+        with self._lock:
+            self.result = result
+            self.error = error
+            self.finished_at = time.time()
+            self._status = status
+
+
+class JobManager:
+    """Runs analyses, validations and PDF builds in the background.
+
+    Each job kind gets its own pool of ``max_workers`` threads, so long
+    crawls cannot hold up another session's PDF build or validation.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS,
+    ):
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, work: Callable[[Job], Any]) -> Job:
+        job = Job(kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+            executor = self._executors.get(kind)
+            if executor is None:
+                executor = self._executors[kind] = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=f"job-{kind}"
+                )
+        job._future = executor.submit(self._run, job, work)
+        return job
+
+    def get(self, job_id: str | None) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id) if job_id is not None else None
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        return job.cancel() if job is not None else False
+
+    def jobs(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        for job in self.jobs():
+            job.cancel()
+        with self._lock:
+            executors = list(self._executors.values())
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, work: Callable[[Job], Any]) -> None:
+        if not job._start():
+            return
+        try:
+            job.raise_if_cancelled()
+            result = work(job)
+        except JobCancelled:
+            job._finish(JobStatus.CANCELLED)
+        except Exception as exc:
+            job._finish(JobStatus.FAILED, error=str(exc) or type(exc).__name__)
+        else:
+            status = JobStatus.CANCELLED if job.cancel_requested else JobStatus.SUCCEEDED
+            job._finish(status, result=result)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - self.max_finished_jobs, 0)]:
+            del self._jobs[job_id]
+
+
+_shared_manager: JobManager | None = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    global _shared_manager
+    if _shared_manager is None:
+        with _shared_manager_lock:
+            if _shared_manager is None:
+                _shared_manager = JobManager()
+    return _shared_manager
@@ -0,0 +1,76 @@
+"""Keyword top-k selection and site-wide aggregation.
+
+Reports only ever show the leading keywords, so just the top ``k`` become
+``KeyWord`` models; everything else is kept in a ``CompactCounter``.
+"""
+
+import heapq
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from operator import itemgetter
+
+from src.compact import CompactCounter
+from src.models import KeyWord
+
+PAGE_KEYWORD_TOP_K = 20
+SITE_KEYWORD_TOP_K = 100
+SITE_KEYWORD_MIN_COUNT = 5
+
+
+def split_top_k(
+    pairs: Sequence[tuple[str, int]], k: int
+) -> tuple[list[KeyWord], CompactCounter]:
+    """Build ``KeyWord`` models for the ``k`` most common pairs only.
+
+    The rest is returned packed, most common first. Input that already fits in
+    ``k`` keeps its order.
+    """
+    if len(pairs) <= k:
+        return [KeyWord(word=word, count=count) for word, count in pairs], CompactCounter()
+
+    top = heapq.nlargest(k, range(len(pairs)), key=lambda index: pairs[index][1])
+    chosen = set(top)
+    tail = CompactCounter.from_pairs(
+        pair for index, pair in enumerate(pairs) if index not in chosen
+    )
+    return [KeyWord(word=pairs[index][0], count=pairs[index][1]) for index in top], tail
+
+
+class KeywordAggregator:
+    """Site-wide keyword counts merged page by page, ranked on demand.
+
+    ``add`` merges a page's counts in one ``Counter.update`` call; ``top``
+    selects the leaders with a heap instead of sorting every entry, so the
+    ranking can be read at any point while pages keep arriving.
+    """
+
+    def __init__(self, min_count: int = SITE_KEYWORD_MIN_COUNT):
+        self.min_count = min_count
+        self._counts: Counter[str] = Counter()
+
+    def add(self, counts: Mapping[str, int]) -> None:
+        self._counts.update(counts)
+
+    def add_keywords(self, keywords: Iterable[tuple[str, int]]) -> None:
+        for word, count in keywords:
+            self._counts[word] += count
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def top(self, k: int = SITE_KEYWORD_TOP_K) -> list[tuple[str, int]]:
+        leaders = heapq.nlargest(k, self._counts.items(), key=itemgetter(1))
+        return [(word, count) for word, count in leaders if count >= self.min_count]
+
+    def ranking(
+        self, k: int = SITE_KEYWORD_TOP_K
+    ) -> tuple[list[tuple[str, int]], CompactCounter]:
+        """Return the top ``k`` entries and the packed tail above ``min_count``."""
+        top = self.top(k)
+        leaders = {word for word, _ in top}
+        tail = CompactCounter.from_pairs(
+            (word, count)
+            for word, count in self._counts.items()
+            if count >= self.min_count and word not in leaders
+        )
+        return top, tail
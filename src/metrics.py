@@ -0,0 +1,157 @@
+"""Timing spans and counters for the analysis stages.
+
+Spans and counters go to a process-wide ``Metrics`` registry that is off by
+default; while it is off, ``span`` hands out one shared no-op context manager
+and ``count`` returns at once. Export it with ``to_prometheus`` or ``to_json``.
+
+Each report also carries its own breakdown in ``Report.stage_times``: a span
+given ``into=report.stage_times`` stores its duration there whether or not the
+registry is enabled, at the cost of two clock reads. A stage that runs again
+on the same report (suggestions on every UI rerun) replaces its old time.
+"""
+
+import json
+import re
+import threading
+import time
+from collections.abc import Callable, MutableMapping
+from contextlib import AbstractContextManager, nullcontext
+
+DEFAULT_PREFIX = "website_analyser"
+
+_DISABLED_SPAN = nullcontext()
+
+
+class Metrics:
+    """Thread-safe registry of stage timings (count, total and slowest) and counters."""
+
+    def __init__(
+        self, enabled: bool = False, *, clock: Callable[[], float] = time.perf_counter
+    ):
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stages: dict[str, list[float]] = {}  # name -> [count, seconds, max]
+        self._counters: dict[str, int] = {}
+
+    def span(
+        self, name: str, *, into: MutableMapping[str, float] | None = None
+    ) -> AbstractContextManager:
+        """Time a ``with`` block as stage ``name``; failed blocks count as ``<name>_failures``."""
+        if not self.enabled and into is None:
+            return _DISABLED_SPAN
+        return _Span(self, name, into)
+
+    def count(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one observation of stage ``name``, e.g. one timed elsewhere."""
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                self._stages[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                "stages": {
+                    name: {"count": count, "seconds": seconds, "max_seconds": slowest}
+                    for name, (count, seconds, slowest) in sorted(self._stages.items())
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def to_json(self, **dumps_options) -> str:
+        return json.dumps(self.snapshot(), **dumps_options)
+
+    def to_prometheus(self, prefix: str = DEFAULT_PREFIX) -> str:
+        """Render the registry in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        stages = snapshot["stages"]
+        metric = f"{prefix}_stage_seconds"
+        lines = []
+        if stages:
+            lines += [
+                f"# HELP {metric} Time spent in each analysis stage.",
+                f"# TYPE {metric} summary",
+            ]
+            for name, stats in stages.items():
+                label = f'{{stage="{_label_value(name)}"}}'
+                lines.append(f"{metric}_count{label} {stats['count']}")
+                lines.append(f"{metric}_sum{label} {stats['seconds']!r}")
+            lines += [
+                f"# HELP {metric}_max Slowest single run of each analysis stage.",
+                f"# TYPE {metric}_max gauge",
+            ]
+            for name, stats in stages.items():
+                label = f'{{stage="{_label_value(name)}"}}'
+                lines.append(f"{metric}_max{label} {stats['max_seconds']!r}")
+        for name, value in snapshot["counters"].items():
+            counter = f"{prefix}_{_metric_name(name)}_total"
+            lines += [f"# TYPE {counter} counter", f"{counter} {value}"]
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class _Span:
+    __slots__ = ("_metrics", "_name", "_into", "_started")
+
+    def __init__(
+        self, metrics: Metrics, name: str, into: MutableMapping[str, float] | None
+    ):
+        self._metrics = metrics
+        self._name = name
+        self._into = into
+
+    def __enter__(self) -> None:
+        self._started = self._metrics._clock()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        seconds = self._metrics._clock() - self._started
+        if self._into is not None:
+            self._into[self._name] = seconds
+        if self._metrics.enabled:
+            self._metrics.record(self._name, seconds)
+            if exc_type is not None:
+                self._metrics.count(f"{self._name}_failures")
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_]", "_", name)
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_shared_metrics: Metrics | None = None
+_shared_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    global _shared_metrics
+    if _shared_metrics is None:
+        with _shared_metrics_lock:
+            if _shared_metrics is None:
+                _shared_metrics = Metrics()
+    return _shared_metrics
+
+
+def configure_metrics(enabled: bool = True) -> Metrics:
+    """Replace the shared registry with an empty one, e.g. to turn collection on."""
+    global _shared_metrics
+    with _shared_metrics_lock:
+        _shared_metrics = Metrics(enabled)
+    return _shared_metrics
@@ -1,7 +1,14 @@
-from collections import Counter
+from datetime import datetime
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 from pydantic import BaseModel, Field
 
+from src.compact import CompactCounter
+
+if TYPE_CHECKING:
+    from src.page_table import PageTable
+
 
 class W3CMessage(BaseModel):
     type: str  # info | error | non-document-error
@@ -34,17 +41,107 @@ class Page(BaseModel):
     title: str
     description: str
     word_count: int
-    keywords: list[KeyWord] = Field(default_factory=list)
-    bigrams: list[Counter[str]] = Field(default_factory=list)
-    trigrams: list[Counter[str]] = Field(default_factory=list)
+    keywords: list[KeyWord] = Field(default_factory=list)  # The page's top keywords
+    keyword_tail: CompactCounter = Field(default_factory=CompactCounter)
+    # Every stemmed word of the page; incremental runs merge it into site keywords.
+    word_counts: CompactCounter = Field(default_factory=CompactCounter)
+    bigrams: CompactCounter = Field(default_factory=CompactCounter)
+    trigrams: CompactCounter = Field(default_factory=CompactCounter)
     warnings: list[str] = Field(default_factory=list)
     content_hash: str | None = None  # Allow None values
     w3c_validation: W3CResponse | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    simhash: str | None = None  # 64-bit SimHash of the page text, as hex
+
+
+class NearDuplicateCluster(BaseModel):
+    urls: list[str]
+    similarity: float  # 0-1; the weakest fingerprint match within the cluster
 
 
 class Report(BaseModel):
     pages: list[Page]
+    keywords: list[KeyWord]  # The site's top keywords; the rest is in keyword_tail
+    keyword_tail: CompactCounter = Field(default_factory=CompactCounter)
+    errors: list[str] = Field(default_factory=list)
+    total_time: float
+    duplicate_pages: list[list[str]]
+    near_duplicates: list[NearDuplicateCluster] = Field(default_factory=list)
+    reused_pages: int = 0  # Incremental runs: pages carried over unchanged
+    refreshed_pages: int = 0  # Incremental runs: pages fetched and parsed again
+    # Seconds spent in each stage's latest run (crawl, create_report, pdf, ...).
+    stage_times: dict[str, float] = Field(default_factory=dict)
+
+    @cached_property
+    def page_table(self) -> "PageTable":
+        """Per-page metrics as columns, built on first use and kept with the report.
+
+        Not a field: it is left out of serialization and comparisons. Code that
+        changes a page's W3C validation updates it through ``record_w3c``.
+        """
+        from src.page_table import PageTable
+
+        return PageTable(self.pages)
+
+
+class AnalysisSummary(BaseModel):
     keywords: list[KeyWord]
+    keyword_tail: CompactCounter = Field(default_factory=CompactCounter)
     errors: list[str] = Field(default_factory=list)
     total_time: float
     duplicate_pages: list[list[str]]
+    near_duplicates: list[NearDuplicateCluster] = Field(default_factory=list)
+    reused_pages: int = 0
+    refreshed_pages: int = 0
+    stage_times: dict[str, float] = Field(default_factory=dict)
+
+
+class StoredRun(BaseModel):
+    id: int
+    site: str
+    started_at: datetime
+    total_time: float
+    page_count: int
+
+
+class FieldChange(BaseModel):
+    field: str
+    old: str | int
+    new: str | int
+
+
+class PageChange(BaseModel):
+    url: str
+    previous_url: str | None = None  # Set when the page moved to a new URL
+    changes: list[FieldChange] = Field(default_factory=list)
+    new_warnings: list[str] = Field(default_factory=list)
+    resolved_warnings: list[str] = Field(default_factory=list)
+
+
+class KeywordMovement(BaseModel):
+    word: str
+    old_rank: int | None  # 1-based; None when the keyword is new
+    new_rank: int | None  # 1-based; None when the keyword dropped out
+    old_count: int = 0
+    new_count: int = 0
+
+
+class ReportDiff(BaseModel):
+    added_pages: list[str] = Field(default_factory=list)
+    removed_pages: list[str] = Field(default_factory=list)
+    changed_pages: list[PageChange] = Field(default_factory=list)
+    keyword_movements: list[KeywordMovement] = Field(default_factory=list)
+    new_duplicate_groups: list[list[str]] = Field(default_factory=list)
+    resolved_duplicate_groups: list[list[str]] = Field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.added_pages
+            or self.removed_pages
+            or self.changed_pages
+            or self.keyword_movements
+            or self.new_duplicate_groups
+            or self.resolved_duplicate_groups
+        )
@@ -0,0 +1,143 @@
+"""Near-duplicate page detection with SimHash fingerprints and LSH banding."""
+
+import hashlib
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from typing import NamedTuple
+
+import numpy as np
+
+from src.models import NearDuplicateCluster, Page
+
+SIMHASH_BITS = 64
+# Four 16-bit bands: two fingerprints at most three bits apart always agree on
+# at least one band, so banding finds every such pair.
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+DEFAULT_MAX_DISTANCE = 3
+# Buckets larger than this (templated sites put most pages in the same ones)
+# are sorted on their permuted fingerprints and each member is only compared
+# with this many neighbours.
+BUCKET_WINDOW = 32
+
+_BIT_SHIFTS = np.arange(SIMHASH_BITS, dtype=np.uint64)
+
+
+class PageFingerprint(NamedTuple):
+    url: str
+    simhash: str | None
+    content_hash: str | None = None
+
+    @classmethod
+    def of(cls, page: Page) -> "PageFingerprint":
+        return cls(page.url, page.simhash, page.content_hash)
+
+
+def simhash(features: Mapping[str, int]) -> str | None:
+    """Return the 64-bit SimHash of weighted text features as 16 hex digits.
+
+    Pages whose feature sets mostly overlap get fingerprints that differ in
+    only a few bits. Returns ``None`` when there are no features.
+    """
+    if not features:
+        return None
+    hashes = np.fromiter(
+        (_feature_hash(feature) for feature in features),
+        dtype=np.uint64,
+        count=len(features),
+    )
+    weights = np.fromiter(features.values(), dtype=np.float64, count=len(features))
+    bits = ((hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)).astype(np.int8)
+    votes = weights @ (2 * bits - 1)
+    packed = np.packbits(votes > 0, bitorder="little")
+    return f"{int.from_bytes(packed.tobytes(), 'little'):016x}"
+
+
+def near_duplicate_clusters(
+    fingerprints: Iterable[PageFingerprint],
+    *,
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+) -> list[NearDuplicateCluster]:
+    """Group pages whose fingerprints are at most ``max_distance`` bits apart.
+
+    Only fingerprints that share a band are compared, and pairs already in the
+    same cluster are skipped, which keeps the work close to linear in the
+    number of pages. In buckets over ``BUCKET_WINDOW`` fingerprints only
+    neighbours in permuted-fingerprint order are compared, so a rare pair in
+    such a bucket can be missed. Clusters made only of byte-identical pages are
+    left out, since ``Report.duplicate_pages`` already lists them. Each
+    cluster's ``similarity`` is the lowest similarity of the links that joined
+    its pages together.
+    """
+    if not 0 <= max_distance < SIMHASH_BANDS:
+        raise ValueError(f"max_distance must be between 0 and {SIMHASH_BANDS - 1}.")
+
+    pages_by_hash: defaultdict[int, list[PageFingerprint]] = defaultdict(list)
+    for fingerprint in fingerprints:
+        if fingerprint.simhash:
+            pages_by_hash[int(fingerprint.simhash, 16)].append(fingerprint)
+    hashes = list(pages_by_hash)
+
+    buckets: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+    mask = (1 << BAND_BITS) - 1
+    for index, value in enumerate(hashes):
+        for band in range(SIMHASH_BANDS):
+            buckets[band, (value >> (band * BAND_BITS)) & mask].append(index)
+
+    parents = list(range(len(hashes)))
+    # Widest link of each cluster, kept on its root.
+    widest = [0] * len(hashes)
+
+    def find(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    for (band, _), members in buckets.items():
+        if len(members) > BUCKET_WINDOW:
+            # The shared band moves to the low bits, so the sort orders the
+            # members by the bits they can still differ in.
+            shift = band * BAND_BITS
+            members.sort(key=lambda index: _rotate_right(hashes[index], shift))
+        for position, first in enumerate(members):
+            for second in members[position + 1 : position + 1 + BUCKET_WINDOW]:
+                first_root, second_root = find(first), find(second)
+                if first_root == second_root:
+                    continue
+                distance = (hashes[first] ^ hashes[second]).bit_count()
+                if distance <= max_distance:
+                    parents[first_root] = second_root
+                    widest[second_root] = max(
+                        widest[first_root], widest[second_root], distance
+                    )
+
+    components: defaultdict[int, list[int]] = defaultdict(list)
+    for index in range(len(hashes)):
+        components[find(index)].append(index)
+
+    clusters = []
+    for root, members in components.items():
+        pages = [page for index in members for page in pages_by_hash[hashes[index]]]
+        contents = {page.content_hash or page.url for page in pages}
+        if len(pages) < 2 or len(contents) < 2:
+            continue
+        clusters.append(
+            NearDuplicateCluster(
+                urls=sorted(page.url for page in pages),
+                similarity=round(1 - widest[root] / SIMHASH_BITS, 4),
+            )
+        )
+    clusters.sort(key=lambda cluster: (-len(cluster.urls), cluster.urls))
+    return clusters
+
+
+def _rotate_right(value: int, shift: int) -> int:
+    return ((value >> shift) | (value << (SIMHASH_BITS - shift))) & (
+        (1 << SIMHASH_BITS) - 1
+    )
+
+
+def _feature_hash(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
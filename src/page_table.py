@@ -0,0 +1,87 @@
+"""Per-page report metrics as NumPy columns.
+
+The overview table, the PDF and the suggestions all need the same handful of
+numbers for every page. ``PageTable`` computes them in one pass when a report
+is first read and keeps them as arrays, so consumers slice columns instead of
+walking ``Report.pages`` again.
+"""
+
+from collections.abc import Sequence
+from operator import attrgetter
+
+import numpy as np
+
+from src.models import Page, W3CResponse
+
+# Column name -> header used by the UI overview and the PDF.
+OVERVIEW_COLUMNS = {
+    "url": "URL",
+    "title_length": "Title Length",
+    "description_length": "Description Length",
+    "word_count": "Word Count",
+    "warning_count": "Warnings",
+}
+
+
+class PageTable:
+    """One row per ``Report.pages`` entry, in the same order.
+
+    ``w3c_error_count`` and ``w3c_warning_count`` are 0 for pages that were not
+    validated; ``w3c_validated`` tells the two cases apart.
+    """
+
+    __slots__ = (
+        "url",
+        "title_length",
+        "description_length",
+        "word_count",
+        "warning_count",
+        "keyword_count",
+        "w3c_validated",
+        "w3c_error_count",
+        "w3c_warning_count",
+    )
+
+    def __init__(self, pages: Sequence[Page] = ()):
+        count = len(pages)
+        self.url = np.array(list(map(attrgetter("url"), pages)), dtype=object)
+        self.title_length = _lengths(pages, "title")
+        self.description_length = _lengths(pages, "description")
+        self.word_count = np.fromiter(
+            map(attrgetter("word_count"), pages), dtype=np.int64, count=count
+        )
+        self.warning_count = _lengths(pages, "warnings")
+        self.keyword_count = _lengths(pages, "keywords")
+        self.w3c_validated = np.zeros(count, dtype=bool)
+        self.w3c_error_count = np.zeros(count, dtype=np.int32)
+        self.w3c_warning_count = np.zeros(count, dtype=np.int32)
+        for row, page in enumerate(pages):
+            if page.w3c_validation is not None:
+                self.record_w3c(row, page.w3c_validation)
+
+    def __len__(self) -> int:
+        return len(self.url)
+
+    def record_w3c(self, row: int, validation: W3CResponse) -> None:
+        """Update the W3C columns after ``Report.pages[row]`` was validated."""
+        self.w3c_validated[row] = True
+        self.w3c_error_count[row] = sum(
+            1 for message in validation.messages if message.type == "error"
+        )
+        self.w3c_warning_count[row] = sum(
+            1 for message in validation.messages if message.type == "info"
+        )
+
+    def columns(self, names: Sequence[str] = tuple(OVERVIEW_COLUMNS)) -> dict[str, list]:
+        """Return the named columns as plain lists, e.g. for a ``DataFrame``."""
+        return {name: getattr(self, name).tolist() for name in names}
+
+    def rows(self, names: Sequence[str] = tuple(OVERVIEW_COLUMNS)) -> list[tuple]:
+        """Return the named columns row by row, e.g. for a PDF table."""
+        return list(zip(*self.columns(names).values()))
+
+
+def _lengths(pages: Sequence[Page], attribute: str) -> np.ndarray:
+    return np.fromiter(
+        map(len, map(attrgetter(attribute), pages)), dtype=np.int32, count=len(pages)
+    )
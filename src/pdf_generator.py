@@ -6,7 +6,6 @@ from io import BytesIO
 from urllib.parse import urlsplit
 
 import matplotlib.pyplot as plt
-import requests
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 from reportlab.lib.pagesizes import A4
@@ -23,9 +22,12 @@ from reportlab.platypus import (
 )
 from reportlab.platypus.tableofcontents import TableOfContents
 
-from src.models import Report
-from src.url_safety import validate_logo_url
-from src.utils import group_warnings
+from src.http_client import get_http_client
+from src.metrics import get_metrics
+from src.models import Report, ReportDiff
+from src.page_table import OVERVIEW_COLUMNS
+from src.url_safety import resolve_logo_url
+from src.warning_classifier import group_warnings
 
 
 class SEOReportDocTemplate(SimpleDocTemplate):
@@ -48,8 +50,9 @@ class SEOReportDocTemplate(SimpleDocTemplate):
 class PDFGenerator:
     _logo_cache: dict[str, bytes] = {}
 
-    def __init__(self, report: Report, filename):
+    def __init__(self, report: Report, filename, diff: ReportDiff | None = None):
         self.report = report
+        self.diff = diff
         self.filename = filename
         self.doc = SEOReportDocTemplate(
             filename,
@@ -84,12 +87,13 @@ class PDFGenerator:
 
     @classmethod
     def _get_logo_bytes(cls, url: str) -> bytes:
-        safe_url = validate_logo_url(url)
+        resolved = resolve_logo_url(url)
+        safe_url = resolved.url
         cached_bytes = cls._logo_cache.get(safe_url)
         if cached_bytes is not None:
             return cached_bytes
 
-        response = requests.get(safe_url, timeout=10, allow_redirects=False)
+        response = get_http_client().get_pinned(resolved)
         if 300 <= response.status_code < 400:
             raise ValueError("Logo URLs must not redirect.")
         response.raise_for_status()
@@ -183,9 +187,9 @@ class PDFGenerator:
         canvas.restoreState()
 
     @classmethod
-    def generate_bytes(cls, report: Report) -> bytes:
+    def generate_bytes(cls, report: Report, diff: ReportDiff | None = None) -> bytes:
         buffer = BytesIO()
-        cls(report, buffer).generate()
+        cls(report, buffer, diff=diff).generate()
         return buffer.getvalue()
 
     def _create_title(self, text, style="Heading1", toc_level=None):
@@ -333,6 +337,10 @@ class PDFGenerator:
         return list(self.elements)
 
     def generate(self):
+        with get_metrics().span("pdf", into=self.report.stage_times):
+            self._build_document()
+
+    def _build_document(self):
         story = self.build_story()
 
         def first_page(canvas, doc):
@@ -369,6 +377,70 @@ class PDFGenerator:
         for i, page in enumerate(self.report.pages, 1):
             self._create_page_details(i, page)
 
+        if self.diff is not None:
+            self._create_title("4. Changes Since Previous Run", "Heading2", toc_level=0)
+            self._create_diff_section(self.diff)
+
+    def _create_diff_section(self, diff):
+        if diff.is_empty:
+            self._create_paragraph("No changes since the previous run.")
+            return
+
+        self._create_table(
+            [
+                ["Added Pages", "Removed Pages", "Changed Pages"],
+                [
+                    len(diff.added_pages),
+                    len(diff.removed_pages),
+                    len(diff.changed_pages),
+                ],
+            ]
+        )
+        for title, urls in (
+            ("Added Pages", diff.added_pages),
+            ("Removed Pages", diff.removed_pages),
+        ):
+            if urls:
+                self._create_title(title, "Heading3")
+                self._create_paragraph(", ".join(urls))
+
+        if diff.changed_pages:
+            self._create_title("Changed Pages", "Heading3")
+            for change in diff.changed_pages:
+                lines = [f"{change.url}"]
+                if change.previous_url:
+                    lines.append(f"moved from {change.previous_url}")
+                lines.extend(
+                    f"{item.field}: {item.old} -> {item.new}" for item in change.changes
+                )
+                lines.extend(f"new warning: {warning}" for warning in change.new_warnings)
+                lines.extend(
+                    f"resolved warning: {warning}" for warning in change.resolved_warnings
+                )
+                self._create_paragraph("; ".join(lines))
+
+        if diff.keyword_movements:
+            self._create_title("Keyword Movement", "Heading3")
+            data = [["Keyword", "Previous Rank", "Current Rank"]]
+            for movement in diff.keyword_movements:
+                data.append(
+                    [
+                        movement.word,
+                        movement.old_rank or "-",
+                        movement.new_rank or "-",
+                    ]
+                )
+            self._create_table(data)
+
+        for title, groups in (
+            ("New Duplicate Groups", diff.new_duplicate_groups),
+            ("Resolved Duplicate Groups", diff.resolved_duplicate_groups),
+        ):
+            if groups:
+                self._create_title(title, "Heading3")
+                for i, group in enumerate(groups, 1):
+                    self._create_paragraph(f"Group {i}: " + ", ".join(group))
+
     def _create_overview_metrics(self):
         data = [
             ["Total Pages", "Analysis Time", "Errors", "Duplicate Pages"],
@@ -384,6 +456,11 @@ class PDFGenerator:
             ],
         ]
         self._create_table(data)
+        if self.report.reused_pages or self.report.refreshed_pages:
+            self._create_paragraph(
+                f"Incremental re-audit: {self.report.reused_pages} unchanged pages "
+                f"reused, {self.report.refreshed_pages} pages re-analyzed."
+            )
 
     def _create_keywords_chart(self, keywords):
         if keywords:
@@ -419,6 +496,14 @@ class PDFGenerator:
                     f"Group {i}: " + ", ".join(url for url in duplicate_group),
                     "BodyText",
                 )
+        if self.report.near_duplicates:
+            self._create_title("Near-Duplicate Pages", "Heading3")
+            for i, cluster in enumerate(self.report.near_duplicates, 1):
+                self._create_paragraph(
+                    f"Cluster {i} ({cluster.similarity:.0%} similar): "
+                    + ", ".join(cluster.urls),
+                    "BodyText",
+                )
 
     def _create_error_summary(self):
         if self.report.errors:
@@ -446,26 +531,22 @@ class PDFGenerator:
 
     def _create_page_analysis_overview(self):
         self._create_title("Page Analysis Overview", "Heading3")
-        data = [["URL", "Title Length", "Description Length", "Word Count", "Warnings"]]
-        for page in self.report.pages:
-            data.append(
-                [
-                    page.url,
-                    len(page.title),
-                    len(page.description),
-                    page.word_count,
-                    len(page.warnings),
-                ]
-            )
+        data = [list(OVERVIEW_COLUMNS.values()), *self.report.page_table.rows()]
         self._create_table(data)
 
     def _create_page_details(self, index, page):
         self._create_title(f"3.{index}. {page.url}", "Heading3", toc_level=1)
 
         # Create a table for main page info
+        table = self.report.page_table
+        row = index - 1
         data = [
             ["Word Count", "Title Length", "Description Length"],
-            [page.word_count, len(page.title), len(page.description)],
+            [
+                int(table.word_count[row]),
+                int(table.title_length[row]),
+                int(table.description_length[row]),
+            ],
         ]
         self._create_table(data)
 
@@ -494,8 +575,8 @@ class PDFGenerator:
                 ["Total Messages", "Errors", "Warnings"],
                 [
                     len(w3c_results.messages),
-                    sum(1 for msg in w3c_results.messages if msg.type == "error"),
-                    sum(1 for msg in w3c_results.messages if msg.type == "info"),
+                    int(table.w3c_error_count[row]),
+                    int(table.w3c_warning_count[row]),
                 ],
             ]
             self._create_table(data)
@@ -0,0 +1,239 @@
+import math
+import threading
+import time
+from collections.abc import Callable
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from src.rate_limit import TokenBucket, parse_retry_after
+from src.url_safety import ResolvedUrl
+
+ROBOTS_USER_AGENT = "website-analyser"
+ROBOTS_TTL_SECONDS = 60 * 60
+ROBOTS_MAX_BYTES = 512 * 1024
+ROBOTS_TIMEOUT = 5.0
+
+DEFAULT_INITIAL_RATE = 4.0
+DEFAULT_MAX_RATE = 20.0
+DEFAULT_MIN_RATE = 0.1
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+DEFAULT_BACKOFF_SECONDS = 2.0
+ADJUST_INTERVAL = 1.0
+ADDITIVE_INCREASE = 0.5
+MULTIPLICATIVE_DECREASE = 0.5
+SLOW_LATENCY_FACTOR = 2.0
+MIN_SLOW_LATENCY = 0.5
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class RobotsRules:
+    """The parts of a host's robots.txt the crawler acts on."""
+
+    def __init__(self, parser: RobotFileParser | None = None):
+        self._parser = parser
+
+    @property
+    def crawl_delay(self) -> float | None:
+        """Minimum seconds between requests asked for by Crawl-delay/Request-rate."""
+        if self._parser is None:
+            return None
+        delays = []
+        crawl_delay = self._parser.crawl_delay(ROBOTS_USER_AGENT)
+        if crawl_delay is not None:
+            delays.append(float(crawl_delay))
+        request_rate = self._parser.request_rate(ROBOTS_USER_AGENT)
+        if request_rate is not None and request_rate.requests > 0:
+            delays.append(request_rate.seconds / request_rate.requests)
+        return max(delays) if delays else None
+
+    @property
+    def sitemaps(self) -> list[str]:
+        """Sitemap URLs announced with ``Sitemap:`` lines."""
+        if self._parser is None:
+            return []
+        return self._parser.site_maps() or []
+
+    def allows(self, url: str) -> bool:
+        return self._parser is None or self._parser.can_fetch(ROBOTS_USER_AGENT, url)
+
+
+def parse_robots(text: str) -> RobotsRules:
+    parser = RobotFileParser()
+    parser.parse(text.splitlines())
+    return RobotsRules(parser)
+
+
+class HostThrottle:
+    """Adaptive request rate for one host (additive increase, multiplicative decrease).
+
+    The rate climbs while the host answers quickly, is halved on 429/503 (and
+    paused for ``Retry-After``) and cut back when latency rises well above the
+    best latency seen so far. It never exceeds ``ceiling``, which robots.txt
+    can lower.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_rate: float,
+        max_rate: float,
+        min_rate: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_rate = min_rate
+        self.ceiling = max_rate
+        self._clock = clock
+        # Capacity 1: requests are spaced out evenly instead of sent in bursts.
+        self.bucket = TokenBucket(min(initial_rate, max_rate), capacity=1.0, clock=clock)
+        self._latency: float | None = None
+        self._baseline: float | None = None
+        self._last_adjusted = -math.inf
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def limit(self, rate: float) -> None:
+        with self._lock:
+            self.ceiling = max(min(self.ceiling, rate), self.min_rate)
+            if self.bucket.rate > self.ceiling:
+                self.bucket.set_rate(self.ceiling)
+
+    def record(
+        self, status_code: int, latency: float, retry_after: str | None = None
+    ) -> None:
+        with self._lock:
+            now = self._clock()
+            if status_code in THROTTLE_STATUS_CODES:
+                self.bucket.set_rate(max(self.bucket.rate * MULTIPLICATIVE_DECREASE, self.min_rate))
+                self.bucket.pause(parse_retry_after(retry_after, DEFAULT_BACKOFF_SECONDS))
+                self._last_adjusted = now
+                return
+
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += LATENCY_EWMA_ALPHA * (latency - self._latency)
+            self._baseline = min(self._baseline or self._latency, self._latency)
+
+            if now - self._last_adjusted < ADJUST_INTERVAL:
+                return
+            self._last_adjusted = now
+            slow = (
+                self._latency > MIN_SLOW_LATENCY
+                and self._latency > SLOW_LATENCY_FACTOR * self._baseline
+            )
+            if slow:
+                rate = self.bucket.rate * MULTIPLICATIVE_DECREASE
+            else:
+                rate = self.bucket.rate + ADDITIVE_INCREASE
+            self.bucket.set_rate(min(max(rate, self.min_rate), self.ceiling))
+
+
+class PolitenessScheduler:
+    """Paces requests per host and caches each host's robots.txt.
+
+    One scheduler is shared by every crawl in the process, so two sessions
+    auditing the same site share that host's request budget.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_rate: float = DEFAULT_INITIAL_RATE,
+        max_rate: float = DEFAULT_MAX_RATE,
+        min_rate: float = DEFAULT_MIN_RATE,
+        robots_ttl: float = ROBOTS_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.initial_rate = initial_rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.robots_ttl = robots_ttl
+        self._clock = clock
+        self._throttles: dict[str, HostThrottle] = {}
+        self._robots: dict[tuple[str, str], tuple[float, RobotsRules]] = {}
+        self._robots_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def throttle(self, host: str) -> HostThrottle:
+        with self._lock:
+            throttle = self._throttles.get(host)
+            if throttle is None:
+                throttle = self._throttles[host] = HostThrottle(
+                    initial_rate=self.initial_rate,
+                    max_rate=self.max_rate,
+                    min_rate=self.min_rate,
+                    clock=self._clock,
+                )
+            return throttle
+
+    def reserve(self, host: str) -> float:
+        """Claim the next request slot for ``host``; returns seconds to wait first."""
+        return self.throttle(host).bucket.reserve()
+
+    def record(
+        self,
+        host: str,
+        status_code: int,
+        latency: float,
+        retry_after: str | None = None,
+    ) -> None:
+        self.throttle(host).record(status_code, latency, retry_after)
+
+    def robots(self, resolved: ResolvedUrl, fetch: Callable[..., requests.Response]) -> RobotsRules:
+        """Return the robots.txt rules for ``resolved``'s host, fetching at most once per TTL.
+
+        ``fetch`` has the crawler's fetch signature. The file is requested from
+        the already vetted addresses. A missing, redirected or unreachable
+        robots.txt allows everything.
+        """
+        key = (resolved.scheme, resolved.netloc)
+        with self._lock:
+            host_lock = self._robots_locks.setdefault(key, threading.Lock())
+
+        with host_lock:
+            cached = self._robots.get(key)
+            if cached is not None and self._clock() - cached[0] <= self.robots_ttl:
+                return cached[1]
+
+            rules = self._fetch_robots(resolved, fetch)
+            self._robots[key] = (self._clock(), rules)
+            if rules.crawl_delay:
+                self.throttle(resolved.netloc).limit(1 / rules.crawl_delay)
+        return rules
+
+    def clear(self) -> None:
+        with self._lock:
+            self._throttles.clear()
+            self._robots.clear()
+
+    @staticmethod
+    def _fetch_robots(
+        resolved: ResolvedUrl, fetch: Callable[..., requests.Response]
+    ) -> RobotsRules:
+        robots_url = f"{resolved.scheme}://{resolved.netloc}/robots.txt"
+        try:
+            response = fetch(
+                resolved._replace(url=robots_url), ROBOTS_TIMEOUT, None, ROBOTS_MAX_BYTES
+            )
+        except requests.RequestException:
+            return RobotsRules()
+        if response.status_code != 200:
+            return RobotsRules()
+        return parse_robots(response.content.decode("utf-8", errors="replace"))
+
+
+_shared_scheduler: PolitenessScheduler | None = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_politeness_scheduler() -> PolitenessScheduler:
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        with _shared_scheduler_lock:
+            if _shared_scheduler is None:
+                _shared_scheduler = PolitenessScheduler()
+    return _shared_scheduler
@@ -0,0 +1,243 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from src.models import Report
+
+ProgressCallback = Callable[[int, int], None]
+
+DEFAULT_TTL_SECONDS = 10 * 60
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+FOLLOWER_POLL_INTERVAL = 0.25
+# Size estimate used for the memory budget (see ``_estimated_size``).
+PAGE_OVERHEAD_BYTES = 1024
+COUNTER_ENTRY_BYTES = 8  # One term ID and one count, both 32-bit
+KEYWORD_BYTES = 64
+W3C_MESSAGE_BYTES = 256
+
+
+@dataclass(frozen=True)
+class ReportCacheStats:
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.progress = (0, 0)
+        self.report: Report | None = None
+        self.error: BaseException | None = None
+        # Set when the leader's own progress callback aborted the computation
+        # (e.g. its job was cancelled); followers then retry instead of failing.
+        self.aborted = False
+
+
+class ReportCache:
+    """Process-wide cache of finished reports with single-flight computation.
+
+    Entries expire after ``ttl`` seconds and the least recently used ones are
+    evicted once their estimated size exceeds ``max_bytes``. Concurrent misses
+    for the same key run one computation; the other callers wait for it and see
+    its progress. Every caller gets its own session copy (see
+    ``_session_copy``), so one session filling in W3C results never changes
+    what another session sees.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, int, Report]] = OrderedDict()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._coalesced = self._evictions = 0
+
+    def get(self, key: Hashable) -> Report | None:
+        with self._lock:
+            report = self._lookup(key)
+        return _session_copy(report) if report is not None else None
+
+    def put(self, key: Hashable, report: Report) -> None:
+        size = _estimated_size(report)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (self._clock(), size, _session_copy(report))
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[ProgressCallback], Report],
+        *,
+        progress: ProgressCallback | None = None,
+    ) -> Report:
+        """Return the cached report for ``key`` or compute it exactly once.
+
+        ``compute`` receives a progress callback to report through. ``progress``
+        sees the progress of whichever caller is doing the work; exceptions it
+        raises abort this caller only.
+        """
+        while True:
+            with self._lock:
+                report = self._lookup(key)
+                if report is not None:
+                    return _session_copy(report)
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self._misses += 1
+                else:
+                    self._coalesced += 1
+
+            if leader:
+                return self._lead(key, flight, compute, progress)
+
+            while not flight.done.wait(FOLLOWER_POLL_INTERVAL):
+                if progress is not None:
+                    progress(*flight.progress)
+            if flight.aborted:
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return _session_copy(flight.report)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> ReportCacheStats:
+        with self._lock:
+            return ReportCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+            )
+
+    def _lead(
+        self,
+        key: Hashable,
+        flight: _Flight,
+        compute: Callable[[ProgressCallback], Report],
+        progress: ProgressCallback | None,
+    ) -> Report:
+        def report_progress(done: int, total: int) -> None:
+            flight.progress = (done, total)
+            if progress is not None:
+                try:
+                    progress(done, total)
+                except BaseException:
+                    flight.aborted = True
+                    raise
+
+        try:
+            report = compute(report_progress)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            self.put(key, report)
+            flight.report = report
+            return report
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _lookup(self, key: Hashable) -> Report | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, _, report = entry
+        if self._clock() - stored_at > self.ttl:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return report
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+def _session_copy(report: Report) -> Report:
+    """Copy the parts of ``report`` that sessions change in place.
+
+    Sessions assign page fields (W3C results), update ``stage_times`` and
+    record into the cached ``page_table``, so those get fresh objects. Page
+    contents (counters, keyword lists, warnings) are never changed in place
+    and stay shared, which keeps a copy far cheaper than a deep copy.
+    """
+    copy = report.model_copy(
+        update={
+            "pages": [page.model_copy() for page in report.pages],
+            "stage_times": dict(report.stage_times),
+        }
+    )
+    # ``page_table`` is a cached_property: drop the copied cache entry so the
+    # copy builds its own table instead of writing into the original's.
+    copy.__dict__.pop("page_table", None)
+    return copy
+
+
+def _estimated_size(report: Report) -> int:
+    """Rough memory footprint of ``report``, cheap enough to take on every put."""
+    size = 0
+    for page in report.pages:
+        size += PAGE_OVERHEAD_BYTES + len(page.url) + len(page.title)
+        size += len(page.description) + sum(map(len, page.warnings))
+        size += KEYWORD_BYTES * len(page.keywords)
+        size += COUNTER_ENTRY_BYTES * (
+            len(page.keyword_tail)
+            + len(page.word_counts)
+            + len(page.bigrams)
+            + len(page.trigrams)
+        )
+        if page.w3c_validation is not None:
+            size += W3C_MESSAGE_BYTES * len(page.w3c_validation.messages)
+    return size
+
+
+_shared_cache: ReportCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = ReportCache()
+    return _shared_cache
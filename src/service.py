@@ -1,66 +1,373 @@
+import asyncio
 import json
 import logging
-from collections import Counter
+import time
+from collections import defaultdict
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
 from pyseoanalyzer import analyze
 
-from src.models import KeyWord, Page, Report, W3CMessage, W3CResponse
-from src.url_safety import validate_public_url
-
+from src.compact import CompactCounter, Vocabulary
+from src.crawler import AsyncCrawler, CrawlOptions
+from src.http_client import HttpClient, get_http_client
+from src.keywords import PAGE_KEYWORD_TOP_K, SITE_KEYWORD_TOP_K, split_top_k
+from src.metrics import Metrics, get_metrics
+from src.models import (
+    AnalysisSummary,
+    KeyWord,
+    Page,
+    Report,
+    W3CMessage,
+    W3CResponse,
+)
+from src.near_duplicates import PageFingerprint, near_duplicate_clusters, simhash
+from src.rate_limit import TokenBucket, parse_retry_after
+from src.report_cache import ReportCache, get_report_cache
+from src.suggestions import (
+    DEFAULT_SUGGESTION_RULES,
+    SuggestionRule,
+    Suggestions,
+    evaluate_rules,
+)
+from src.url_safety import resolve_public_url, validate_public_url
+from src.w3c_cache import W3CCache, get_w3c_cache
+from src.warning_classifier import classify_warning
 
 logger = logging.getLogger(__name__)
 
+ASYNCIO_BACKEND = "asyncio"
+PYSEOANALYZER_BACKEND = "pyseoanalyzer"
+CRAWL_BACKENDS = frozenset({ASYNCIO_BACKEND, PYSEOANALYZER_BACKEND})
+
+W3C_VALIDATOR_URL = "https://validator.w3.org/nu/?out=json"
+W3C_REQUEST_HEADERS = {"Content-Type": "text/html; charset=utf-8"}
+W3C_MAX_WORKERS = 4
+W3C_REQUESTS_PER_SECOND = 2.0
+W3C_MAX_RETRIES = 3
+# Longest Retry-After the validator may ask for; longer waits fail the page.
+W3C_MAX_RETRY_AFTER = 30.0
+RETRYABLE_STATUS_CODES = frozenset({429, 503})
+# Field types a crawler page payload must have for its report to skip validation.
+TRUSTED_PAGE_SHAPE = {
+    "url": str,
+    "title": str,
+    "description": str,
+    "word_count": int,
+    "keywords": list,
+    "bigrams": Mapping,
+    "trigrams": Mapping,
+    "warnings": list,
+}
+
 
 class SEOAnalyzerService:
-    def analyze(self, url: str) -> Report:
-        safe_url = validate_public_url(url)
-        output = analyze(safe_url)
-        return self._create_report(output)
+    def __init__(
+        self,
+        backend: str = ASYNCIO_BACKEND,
+        crawl_options: CrawlOptions | None = None,
+        http_client: HttpClient | None = None,
+        w3c_cache: W3CCache | None = None,
+        report_cache: ReportCache | None = None,
+        strict_validation: bool = False,
+        suggestion_rules: Sequence[SuggestionRule] = DEFAULT_SUGGESTION_RULES,
+        metrics: Metrics | None = None,
+    ):
+        """``strict_validation`` validates every crawled page with pydantic.
+
+        By default each crawler page payload gets a cheap shape check and, if it
+        passes, is built with ``model_construct`` without per-field validation.
+        """
+        if backend not in CRAWL_BACKENDS:
+            allowed = ", ".join(sorted(CRAWL_BACKENDS))
+            raise ValueError(f"Unknown crawl backend {backend!r}; expected one of: {allowed}.")
+        self.backend = backend
+        self.crawl_options = crawl_options or CrawlOptions()
+        self._http_client = http_client
+        self._w3c_cache = w3c_cache
+        self._report_cache = report_cache
+        self._metrics = metrics
+        self.strict_validation = strict_validation
+        # Per-client thresholds: see ``src.suggestions.with_thresholds``; the UI
+        # applies the ones entered under "Suggestion thresholds" on top.
+        self.suggestion_rules = tuple(suggestion_rules)
+
+    @property
+    def http_client(self) -> HttpClient:
+        return self._http_client or get_http_client()
+
+    @property
+    def w3c_cache(self) -> W3CCache:
+        return self._w3c_cache or get_w3c_cache()
+
+    @property
+    def report_cache(self) -> ReportCache:
+        return self._report_cache or get_report_cache()
+
+    @property
+    def metrics(self) -> Metrics:
+        return self._metrics or get_metrics()
+
+    def analyze(
+        self,
+        url: str,
+        previous: Iterable[Page] | None = None,
+        *,
+        options: CrawlOptions | None = None,
+        progress: Callable[[int, int], None] | None = None,
+        refresh: bool = False,
+        on_crawl: Callable[[Report], None] | None = None,
+    ) -> Report:
+        """Crawl ``url`` and build a report.
+
+        ``options`` overrides the service's crawl options for this call, e.g. to
+        set page, depth, byte or time budgets; a crawl that runs out of budget
+        returns the pages gathered so far and names the limit in ``errors``.
+        The pyseoanalyzer backend ignores crawl options.
+        Reports are shared across sessions through ``report_cache``, keyed by the
+        normalized URL, backend and crawl options; ``refresh`` forces a new crawl.
+        ``previous`` holds the pages of an earlier run of the same site; when
+        given, unchanged pages are carried over instead of being parsed again.
+        ``progress(done, discovered)`` reports crawl progress; an exception
+        raised from it aborts the analysis.
+        ``on_crawl(report)`` is called only when this call crawled the site
+        itself rather than receiving a report another call crawled, e.g. so
+        that exactly one caller saves it.
+        A new report's ``stage_times`` holds its URL check, crawl and build times.
+        """
+        with self.metrics.span("analyze"):
+            stage_times: dict[str, float] = {}
+            with self.metrics.span("validate_url", into=stage_times):
+                safe_url = validate_public_url(url)
+            self._check_incremental(previous)
+            options = options or self.crawl_options
+            cache_key = (safe_url, self.backend, options)
+
+            def crawl(
+                previous: Iterable[Page] | None,
+                report_progress: Callable[[int, int], None] | None,
+            ) -> Report:
+                report = self._analyze(
+                    safe_url, options, previous, report_progress, stage_times
+                )
+                if on_crawl is not None:
+                    on_crawl(report)
+                return report
+
+            if previous is not None:
+                report = crawl(previous, progress)
+                self.report_cache.put(cache_key, report)
+                return report
+
+            if refresh:
+                self.report_cache.invalidate(cache_key)
+            return self.report_cache.get_or_compute(
+                cache_key,
+                lambda report_progress: crawl(None, report_progress),
+                progress=progress,
+            )
 
-    def _create_report(self, output: dict[str, object]) -> Report:
-        pages = [self._create_page(page_data) for page_data in output.get("pages", [])]
-        keywords = self._normalize_keywords(output.get("keywords", []))
+    def _analyze(
+        self,
+        safe_url: str,
+        options: CrawlOptions,
+        previous: Iterable[Page] | None,
+        progress: Callable[[int, int], None] | None,
+        stage_times: dict[str, float],
+    ) -> Report:
+        with self.metrics.span("crawl", into=stage_times):
+            if self.backend == PYSEOANALYZER_BACKEND:
+                output = analyze(safe_url)
+                if progress is not None:
+                    page_count = len(output.get("pages", []))
+                    progress(page_count, page_count)
+            else:
+                crawler = AsyncCrawler(
+                    safe_url, options, previous_pages=previous, progress=progress
+                )
+                output = asyncio.run(crawler.crawl())
+        with self.metrics.span("create_report", into=stage_times):
+            report = self._create_report(output)
+        report.stage_times.update(stage_times)
+        self.metrics.count("pages_analyzed", len(report.pages))
+        return report
+
+    def analyze_iter(
+        self,
+        url: str,
+        previous: Iterable[Page] | None = None,
+        *,
+        options: CrawlOptions | None = None,
+    ) -> Iterator[Page | AnalysisSummary]:
+        """Yield each crawled ``Page`` as it is ready, then one ``AnalysisSummary``.
+
+        With the pyseoanalyzer backend the crawl still runs to completion first,
+        since that library offers no streaming hook. The summary's
+        ``stage_times`` only holds the URL check, as pages are built while
+        the caller consumes them.
+        """
+        stage_times: dict[str, float] = {}
+        with self.metrics.span("validate_url", into=stage_times):
+            safe_url = validate_public_url(url)
+        self._check_incremental(previous)
+        # Only the fingerprints are kept, so memory stays small while pages stream.
+        fingerprints = []
+        if self.backend == PYSEOANALYZER_BACKEND:
+            output = analyze(safe_url)
+            raw_pages = output.get("pages", [])
+            vocabulary = Vocabulary()
+            for page_data in raw_pages:
+                page = self._create_page(
+                    page_data, vocabulary, trusted=self._trusts(page_data)
+                )
+                fingerprints.append(PageFingerprint.of(page))
+                yield page
+            self.metrics.count("pages_analyzed", len(fingerprints))
+            yield self._create_summary(output, fingerprints, stage_times)
+            return
+
+        crawler = AsyncCrawler(
+            safe_url, options or self.crawl_options, previous_pages=previous
+        )
+        vocabulary = Vocabulary()
+        for page_data in _iterate_async(crawler.iter_pages()):
+            page = self._create_page(
+                page_data, vocabulary, trusted=self._trusts(page_data)
+            )
+            fingerprints.append(PageFingerprint.of(page))
+            yield page
+        self.metrics.count("pages_analyzed", len(fingerprints))
+        yield self._create_summary(crawler.summary(), fingerprints, stage_times)
 
-        return Report(
-            pages=pages,
+    def _check_incremental(self, previous: Iterable[Page] | None) -> None:
+        if previous is not None and self.backend == PYSEOANALYZER_BACKEND:
+            raise ValueError("Incremental re-audits require the asyncio backend.")
+
+    def _create_report(self, output: dict[str, object]) -> Report:
+        raw_pages = output.get("pages", [])
+        # One vocabulary per report: an n-gram shared by many pages is stored once.
+        vocabulary = Vocabulary()
+        pages = [
+            self._create_page(page_data, vocabulary, trusted=self._trusts(page_data))
+            for page_data in raw_pages
+        ]
+        summary = self._create_summary(output, map(PageFingerprint.of, pages))
+
+        values = {"pages": pages, **dict(summary)}
+        # Every page is a model by now and the summary was validated.
+        if self.strict_validation:
+            return Report(**values)
+        return Report.model_construct(**values)
+
+    def _create_summary(
+        self,
+        output: dict[str, object],
+        fingerprints: Iterable[PageFingerprint] = (),
+        stage_times: dict[str, float] | None = None,
+    ) -> AnalysisSummary:
+        keywords, keyword_tail = split_top_k(
+            self._keyword_pairs(output.get("keywords", [])), SITE_KEYWORD_TOP_K
+        )
+        return AnalysisSummary(
             keywords=keywords,
+            # The crawler ranks site keywords itself and hands over its tail.
+            keyword_tail=output.get("keyword_tail") or keyword_tail,
             errors=self._normalize_errors(output.get("errors", [])),
             total_time=output.get("total_time", 0.0),
             duplicate_pages=output.get("duplicate_pages", []),
+            near_duplicates=near_duplicate_clusters(fingerprints),
+            reused_pages=output.get("reused_pages", 0),
+            refreshed_pages=output.get("refreshed_pages", 0),
+            stage_times=stage_times or {},
         )
 
-    def _create_page(self, page_data: dict[str, object]) -> Page:
-        return Page(
-            url=page_data.get("url", ""),
-            title=page_data.get("title", ""),
-            description=page_data.get("description", ""),
-            word_count=page_data.get("word_count", 0),
-            keywords=self._normalize_keywords(page_data.get("keywords", [])),
-            bigrams=[Counter(bigram) for bigram in page_data.get("bigrams", [])],
-            trigrams=[Counter(trigram) for trigram in page_data.get("trigrams", [])],
-            warnings=page_data.get("warnings", []),
-            content_hash=page_data.get("content_hash"),
-            w3c_validation=None,
+    def _trusts(self, page_data: object) -> bool:
+        """Whether the page payload ``page_data`` can skip validation.
+
+        A cheap shape check run on every page: its field types and its first
+        keyword. A page that fails it is validated on its own (coerced, or a
+        ``ValidationError``), while the other pages of the report stay trusted.
+        """
+        if self.strict_validation:
+            return False
+        if isinstance(page_data, Page):
+            return True
+        if not isinstance(page_data, dict) or not all(
+            isinstance(page_data.get(field), expected)
+            for field, expected in TRUSTED_PAGE_SHAPE.items()
+        ):
+            return False
+        # Keywords come as pyseoanalyzer's ``(count, word)`` tuples.
+        keywords = page_data["keywords"]
+        return not keywords or (
+            isinstance(keywords[0], tuple)
+            and len(keywords[0]) == 2
+            and isinstance(keywords[0][0], int)
+            and isinstance(keywords[0][1], str)
         )
 
-    def _normalize_keywords(self, raw_keywords: object) -> list[KeyWord]:
+    def _create_page(
+        self,
+        page_data: dict[str, object] | Page,
+        vocabulary: Vocabulary | None = None,
+        *,
+        trusted: bool = False,
+    ) -> Page:
+        if isinstance(page_data, Page):
+            return page_data
+        raw_keywords = page_data.get("keywords", [])
+        if trusted:
+            pairs = [(word, count) for count, word in raw_keywords]
+        else:
+            pairs = self._keyword_pairs(raw_keywords)
+        keywords, keyword_tail = split_top_k(pairs, PAGE_KEYWORD_TOP_K)
+        pack_ngrams = CompactCounter.from_counter if trusted else CompactCounter.coerce
+        values = {
+            "url": page_data.get("url", ""),
+            "title": page_data.get("title", ""),
+            "description": page_data.get("description", ""),
+            "word_count": page_data.get("word_count", 0),
+            "keywords": keywords,
+            "keyword_tail": keyword_tail,
+            "word_counts": pack_ngrams(
+                page_data.get("word_counts") or {}, vocabulary=vocabulary
+            ),
+            "bigrams": pack_ngrams(page_data.get("bigrams") or {}, vocabulary=vocabulary),
+            "trigrams": pack_ngrams(page_data.get("trigrams") or {}, vocabulary=vocabulary),
+            "warnings": page_data.get("warnings", []),
+            "content_hash": page_data.get("content_hash"),
+            "w3c_validation": None,
+            "etag": page_data.get("etag"),
+            "last_modified": page_data.get("last_modified"),
+            "simhash": page_data.get("simhash") or simhash(page_data.get("trigrams") or {}),
+        }
+        return Page.model_construct(**values) if trusted else Page(**values)
+
+    def _keyword_pairs(self, raw_keywords: object) -> list[tuple[str, int]]:
+        """Normalize a keyword payload to ``(word, count)`` pairs, in order."""
         if not isinstance(raw_keywords, list):
             return []
 
-        normalized_keywords = []
+        pairs = []
         for raw_keyword in raw_keywords:
-            keyword = self._normalize_keyword(raw_keyword)
-            if keyword is None:
+            pair = self._keyword_pair(raw_keyword)
+            if pair is None:
                 logger.warning("Ignoring unsupported keyword payload: %r", raw_keyword)
                 continue
-            normalized_keywords.append(keyword)
+            pairs.append(pair)
 
-        return normalized_keywords
+        return pairs
 
-    def _normalize_keyword(self, raw_keyword: object) -> KeyWord | None:
+    def _keyword_pair(self, raw_keyword: object) -> tuple[str, int] | None:
         if isinstance(raw_keyword, KeyWord):
-            return raw_keyword
+            return raw_keyword.word, raw_keyword.count
 
         if isinstance(raw_keyword, dict):
             word = raw_keyword.get("word")
@@ -74,7 +381,7 @@ class SEOAnalyzerService:
             return None
 
         try:
-            return KeyWord(word=str(word), count=int(count))
+            return str(word), int(count)
         except (TypeError, ValueError):
             return None
 
@@ -93,26 +400,168 @@ class SEOAnalyzerService:
         except (TypeError, ValueError):
             return str(error)
 
-    def validate_page(self, url: str) -> W3CResponse:
+    def validate_page(
+        self,
+        url: str,
+        *,
+        rate_limiter: TokenBucket | None = None,
+        max_retries: int = W3C_MAX_RETRIES,
+    ) -> W3CResponse:
         """Validate a single page using the W3C Validator API"""
-        headers = {"Content-Type": "text/html; charset=utf-8"}
-        validator_url = "https://validator.w3.org/nu/?out=json"
-        safe_url = validate_public_url(url)
+        with self.metrics.span("validate_page"):
+            return self._validate_page(
+                url, rate_limiter=rate_limiter, max_retries=max_retries
+            )
 
-        page_response = requests.get(safe_url, timeout=10, allow_redirects=False)
+    def _validate_page(
+        self, url: str, *, rate_limiter: TokenBucket | None, max_retries: int
+    ) -> W3CResponse:
+        resolved = resolve_public_url(url)
+        safe_url = resolved.url
+
+        page_response = self.http_client.get_pinned(resolved)
         if 300 <= page_response.status_code < 400:
             raise ValueError("Redirects are not supported during W3C validation.")
         page_response.raise_for_status()
 
-        validator_response = requests.post(
-            validator_url,
-            headers=headers,
-            data=page_response.content,
-            timeout=10,
+        cache_key = W3CCache.key_for(page_response.content, W3C_VALIDATOR_URL)
+        cached = self.w3c_cache.get(cache_key)
+        if cached is not None:
+            self.metrics.count("w3c_cache_hits")
+            return cached.model_copy(update={"url": safe_url})
+        self.metrics.count("w3c_cache_misses")
+
+        result = self._post_to_validator(
+            page_response.content, rate_limiter=rate_limiter, max_retries=max_retries
         )
-        validator_response.raise_for_status()
+        response = self._create_w3c_response(result, safe_url)
+        self.w3c_cache.set(cache_key, response)
+        return response
+
+    def validate_pages(
+        self,
+        urls: Iterable[str],
+        *,
+        max_workers: int = W3C_MAX_WORKERS,
+        requests_per_second: float = W3C_REQUESTS_PER_SECOND,
+    ) -> Iterator[W3CResponse]:
+        """Validate many pages concurrently, yielding results as they complete.
+
+        Validator calls share one token bucket, and 429/503 answers pause every
+        worker for the Retry-After delay. Pages that fail are logged and skipped.
+        """
+        for url, outcome in self._validate_concurrently(
+            urls, max_workers=max_workers, requests_per_second=requests_per_second
+        ):
+            if isinstance(outcome, Exception):
+                logger.warning("W3C validation failed for %s: %s", url, outcome)
+                continue
+            yield outcome
+
+    def validate_report(
+        self,
+        report: Report,
+        *,
+        progress: Callable[[int, int], None] | None = None,
+        max_workers: int = W3C_MAX_WORKERS,
+        requests_per_second: float = W3C_REQUESTS_PER_SECOND,
+    ) -> list[str]:
+        """Fill ``Page.w3c_validation`` for every page that has none yet.
+
+        Returns one error message per page that could not be validated.
+        """
+        rows_by_url: defaultdict[str, list[int]] = defaultdict(list)
+        for row, page in enumerate(report.pages):
+            if page.w3c_validation is None:
+                rows_by_url[page.url].append(row)
+
+        failures = []
+        total = len(rows_by_url)
+        table = report.page_table
+        with self.metrics.span("validate_report", into=report.stage_times):
+            for done, (url, outcome) in enumerate(
+                self._validate_concurrently(
+                    rows_by_url,
+                    max_workers=max_workers,
+                    requests_per_second=requests_per_second,
+                ),
+                1,
+            ):
+                if isinstance(outcome, Exception):
+                    failures.append(f"W3C validation failed for {url}: {outcome}")
+                else:
+                    for row in rows_by_url[url]:
+                        report.pages[row].w3c_validation = outcome
+                        table.record_w3c(row, outcome)
+                if progress is not None:
+                    progress(done, total)
+
+        return failures
+
+    def _validate_concurrently(
+        self,
+        urls: Iterable[str],
+        *,
+        max_workers: int,
+        requests_per_second: float,
+    ) -> Iterator[tuple[str, W3CResponse | Exception]]:
+        rate_limiter = TokenBucket(requests_per_second)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="w3c")
+        try:
+            futures = {
+                executor.submit(self.validate_page, url, rate_limiter=rate_limiter): url
+                for url in dict.fromkeys(urls)
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    yield url, future.result()
+                except Exception as exc:
+                    yield url, exc
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _post_to_validator(
+        self,
+        content: bytes,
+        *,
+        rate_limiter: TokenBucket | None,
+        max_retries: int,
+    ) -> dict[str, object]:
+        for attempt in range(max_retries + 1):
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            response = self.http_client.post(
+                W3C_VALIDATOR_URL,
+                headers=W3C_REQUEST_HEADERS,
+                data=content,
+            )
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == max_retries:
+                break
+
+            delay = parse_retry_after(
+                response.headers.get("Retry-After"), default=2.0**attempt
+            )
+            if delay > W3C_MAX_RETRY_AFTER:
+                raise ValueError(
+                    f"The W3C validator asked to retry in {delay:.0f}s, over the "
+                    f"{W3C_MAX_RETRY_AFTER:.0f}s limit."
+                )
+            logger.info(
+                "W3C validator returned HTTP %s; retrying in %.1fs",
+                response.status_code,
+                delay,
+            )
+            self.metrics.count("w3c_retries")
+            if rate_limiter is not None:
+                rate_limiter.pause(delay)
+            else:
+                time.sleep(delay)
+
+        response.raise_for_status()
+        return response.json()
 
-        result = validator_response.json()
+    def _create_w3c_response(self, result: dict[str, object], safe_url: str) -> W3CResponse:
         messages = []
         for msg in result.get("messages", []):
             last_line = msg.get("lastLine")
@@ -144,74 +593,32 @@ class SEOAnalyzerService:
             language=result.get("language", None),
         )
 
-    def generate_suggestions(self, report: Report) -> dict[str, list[str]]:
-        suggestions = {
-            "Title": [],
-            "Description": [],
-            "Keywords": [],
-            "Content": [],
-            "Structure": [],
-            "Performance": [],
-        }
-
-        for page in report.pages:
-            # Title suggestions
-            if len(page.title) < 30:
-                suggestions["Title"].append(
-                    f"The title for {page.url} is too short. Aim for 50-60 characters."
-                )
-            elif len(page.title) > 60:
-                suggestions["Title"].append(
-                    f"The title for {page.url} is too long. Keep it under 60 characters."
-                )
-
-            # Description suggestions
-            if len(page.description) < 50:
-                suggestions["Description"].append(
-                    f"The meta description for {page.url} is too short. Aim for 150-160 characters."
-                )
-            elif len(page.description) > 160:
-                suggestions["Description"].append(
-                    f"The meta description for {page.url} is too long. Keep it under 160 characters."
-                )
-
-            # Keywords suggestions
-            if len(page.keywords) < 5:
-                suggestions["Keywords"].append(
-                    f"Consider adding more relevant keywords to {page.url}"
-                )
-
-            # Content suggestions
-            if page.word_count < 300:
-                suggestions["Content"].append(
-                    f"The content on {page.url} is thin. Consider adding more valuable content."
-                )
-
-            # Add more suggestions based on the warnings
-            for warning in page.warnings:
-                category = self._categorize_warning(warning)
-                suggestions[category].append(f"{warning} on {page.url}")
-
-        # Overall suggestions
-        if len(report.keywords) < 10:
-            suggestions["Keywords"].append(
-                "Your website lacks keyword diversity. Consider expanding your content to cover more relevant topics."
+    def generate_suggestions(
+        self, report: Report, rules: Sequence[SuggestionRule] | None = None
+    ) -> Suggestions:
+        """Evaluate the suggestion rules against ``report``.
+
+        ``rules`` overrides the service's ``suggestion_rules`` for this call.
+        Messages are formatted when the returned categories are read.
+        """
+        with self.metrics.span("generate_suggestions", into=report.stage_times):
+            return evaluate_rules(
+                report,
+                self.suggestion_rules if rules is None else rules,
+                categorize_warning=classify_warning,
             )
 
-        return suggestions
-
-    def _categorize_warning(self, warning: str) -> str:
-        if "title" in warning.lower():
-            return "Title"
-        elif "description" in warning.lower():
-            return "Description"
-        elif "keyword" in warning.lower():
-            return "Keywords"
-        elif any(word in warning.lower() for word in ["content", "text", "word"]):
-            return "Content"
-        elif any(
-            word in warning.lower() for word in ["structure", "heading", "h1", "h2"]
-        ):
-            return "Structure"
-        else:
-            return "Performance"
+
+def _iterate_async(iterator: AsyncIterator) -> Iterator:
+    """Drive an async iterator from synchronous code on a private event loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(iterator))
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(iterator.aclose())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
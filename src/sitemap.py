@@ -0,0 +1,151 @@
+"""Streaming sitemap parsing (sitemaps.org protocol, plain or gzipped)."""
+
+import math
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from itertools import islice
+from typing import NamedTuple
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+from src.url_safety import validate_public_urls
+
+# The protocol caps a sitemap at 50,000 URLs and 50 MB uncompressed.
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+SITEMAP_CHUNK_SIZE = 64 * 1024
+SITEMAP_BATCH_SIZE = 1000
+DEFAULT_PRIORITY = 0.5
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class SitemapError(ValueError):
+    """A sitemap could not be read."""
+
+
+class SitemapEntry(NamedTuple):
+    url: str
+    lastmod: datetime | None = None
+    priority: float = DEFAULT_PRIORITY
+    # True for the <sitemap> entries of a sitemap index, which point at more sitemaps.
+    is_sitemap: bool = False
+
+
+def parse_sitemap(
+    content: bytes, *, max_bytes: int = SITEMAP_MAX_BYTES
+) -> Iterator[SitemapEntry]:
+    """Yield the entries of a sitemap or sitemap index as they are parsed.
+
+    Gzipped sitemaps are inflated on the fly. Each entry's element is dropped
+    from the tree once it has been read, so memory stays flat however many URLs
+    the file lists. Raises ``SitemapError`` for malformed XML or a document
+    larger than ``max_bytes`` once decompressed.
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    root: Element | None = None
+    try:
+        for chunk in _decompressed_chunks(content, max_bytes):
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if root is None:
+                    root = element
+                if event != "end":
+                    continue
+                tag = _local_name(element.tag)
+                if tag in ("url", "sitemap"):
+                    entry = _entry(element, is_sitemap=tag == "sitemap")
+                    if entry is not None:
+                        yield entry
+                    # Drops this entry and any earlier ones from the tree.
+                    root.clear()
+        parser.close()
+    except ParseError as exc:
+        raise SitemapError(f"invalid sitemap XML: {exc}") from exc
+
+
+def validated_batches(
+    entries: Iterable[SitemapEntry], batch_size: int = SITEMAP_BATCH_SIZE
+) -> Iterator[tuple[list[SitemapEntry], int]]:
+    """Group ``entries`` and run each group through ``validate_public_urls``.
+
+    Yields the accepted entries, with normalized and deduplicated URLs, and the
+    number rejected by the URL safety checks. Each host is resolved once per
+    batch instead of once per URL.
+    """
+    entries = iter(entries)
+    while batch := list(islice(entries, batch_size)):
+        results = validate_public_urls(entry.url for entry in batch)
+        accepted: dict[str, SitemapEntry] = {}
+        rejected = 0
+        for entry in batch:
+            result = results[entry.url]
+            if isinstance(result, str):
+                accepted.setdefault(result, entry._replace(url=result))
+            else:
+                rejected += 1
+        yield list(accepted.values()), rejected
+
+
+def _decompressed_chunks(content: bytes, max_bytes: int) -> Iterator[bytes]:
+    if not content.startswith(GZIP_MAGIC):
+        if len(content) > max_bytes:
+            raise SitemapError(f"sitemap is over the {max_bytes} byte limit")
+        for start in range(0, len(content), SITEMAP_CHUNK_SIZE):
+            yield content[start : start + SITEMAP_CHUNK_SIZE]
+        return
+
+    inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    total = 0
+    for start in range(0, len(content), SITEMAP_CHUNK_SIZE):
+        pending = content[start : start + SITEMAP_CHUNK_SIZE]
+        while pending:
+            try:
+                chunk = inflater.decompress(pending, SITEMAP_CHUNK_SIZE)
+            except zlib.error as exc:
+                raise SitemapError(f"invalid gzip data: {exc}") from exc
+            pending = inflater.unconsumed_tail
+            total += len(chunk)
+            if total > max_bytes:
+                raise SitemapError(
+                    f"sitemap is over the {max_bytes} byte limit once decompressed"
+                )
+            yield chunk
+        if inflater.eof:
+            return
+
+
+def _entry(element: Element, *, is_sitemap: bool) -> SitemapEntry | None:
+    fields = {_local_name(child.tag): (child.text or "").strip() for child in element}
+    url = fields.get("loc")
+    if not url:
+        return None
+    return SitemapEntry(
+        url=url,
+        lastmod=_parse_lastmod(fields.get("lastmod")),
+        priority=_parse_priority(fields.get("priority")),
+        is_sitemap=is_sitemap,
+    )
+
+
+def _parse_lastmod(value: str | None) -> datetime | None:
+    """Parse a W3C datetime; dates without a time zone are taken as UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _parse_priority(value: str | None) -> float:
+    try:
+        priority = float(value) if value else DEFAULT_PRIORITY
+    except ValueError:
+        return DEFAULT_PRIORITY
+    if not math.isfinite(priority):
+        return DEFAULT_PRIORITY
+    return min(max(priority, 0.0), 1.0)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rpartition("}")[2]
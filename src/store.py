@@ -0,0 +1,505 @@
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+from src.compact import CompactCounter, Vocabulary
+from src.models import (
+    AnalysisSummary,
+    KeyWord,
+    Page,
+    Report,
+    StoredRun,
+    W3CResponse,
+)
+
+DEFAULT_STORE_PATH = Path.home() / ".local" / "share" / "website-analyser" / "reports.sqlite3"
+DEFAULT_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    total_time REAL NOT NULL DEFAULT 0,
+    page_count INTEGER NOT NULL DEFAULT 0,
+    errors TEXT NOT NULL DEFAULT '[]',
+    duplicate_pages TEXT NOT NULL DEFAULT '[]',
+    near_duplicates TEXT NOT NULL DEFAULT '[]',
+    keyword_tail TEXT,
+    reused_pages INTEGER NOT NULL DEFAULT 0,
+    refreshed_pages INTEGER NOT NULL DEFAULT 0,
+    stage_times TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS runs_site_started_at ON runs (site, started_at);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    word_count INTEGER NOT NULL,
+    word_counts TEXT NOT NULL,
+    bigrams TEXT NOT NULL,
+    trigrams TEXT NOT NULL,
+    warnings TEXT NOT NULL,
+    content_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    simhash TEXT,
+    keyword_tail TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_run_id ON pages (run_id, id);
+CREATE INDEX IF NOT EXISTS pages_url ON pages (url, run_id);
+CREATE INDEX IF NOT EXISTS pages_content_hash ON pages (content_hash);
+
+CREATE TABLE IF NOT EXISTS keywords (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    page_id INTEGER REFERENCES pages (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keywords_run_page ON keywords (run_id, page_id, position);
+CREATE INDEX IF NOT EXISTS keywords_page ON keywords (page_id, position);
+
+CREATE TABLE IF NOT EXISTS w3c_responses (
+    page_id INTEGER PRIMARY KEY REFERENCES pages (id) ON DELETE CASCADE,
+    url TEXT,
+    source TEXT,
+    language TEXT,
+    messages TEXT NOT NULL
+);
+"""
+
+PAGE_SELECT = (
+    "SELECT pages.id, pages.run_id, pages.url, pages.title, pages.description, "
+    "pages.word_count, pages.word_counts, pages.bigrams, pages.trigrams, pages.warnings, "
+    "pages.content_hash, pages.etag, pages.last_modified, pages.simhash, pages.keyword_tail, w3c.url, w3c.source, w3c.language, w3c.messages "
+    "FROM pages LEFT JOIN w3c_responses AS w3c ON w3c.page_id = pages.id"
+)
+
+
+class ReportStore:
+    """SQLite persistence for reports, their pages, keywords and W3C results.
+
+    Pages are written in batches and read back in pages of rows, so runs with
+    tens of thousands of pages never have to be held in memory at once.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_STORE_PATH):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def save_report(
+        self,
+        report: Report,
+        *,
+        site: str,
+        started_at: datetime | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        run_id = self.start_run(site, started_at=started_at)
+        self.add_pages(run_id, report.pages, batch_size=batch_size)
+        self.finish_run(
+            run_id,
+            AnalysisSummary(
+                keywords=report.keywords,
+                keyword_tail=report.keyword_tail,
+                errors=report.errors,
+                total_time=report.total_time,
+                duplicate_pages=report.duplicate_pages,
+                near_duplicates=report.near_duplicates,
+                reused_pages=report.reused_pages,
+                refreshed_pages=report.refreshed_pages,
+                stage_times=report.stage_times,
+            ),
+        )
+        return run_id
+
+    def ingest(
+        self,
+        items: Iterable[Page | AnalysisSummary],
+        *,
+        site: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> int:
+        """Persist the output of ``SEOAnalyzerService.analyze_iter`` as it streams."""
+        run_id = self.start_run(site)
+        summary = None
+
+        def pages() -> Iterator[Page]:
+            nonlocal summary
+            for item in items:
+                if isinstance(item, AnalysisSummary):
+                    summary = item
+                else:
+                    yield item
+
+        self.add_pages(run_id, pages(), batch_size=batch_size)
+        if summary is not None:
+            self.finish_run(run_id, summary)
+        return run_id
+
+    def start_run(self, site: str, *, started_at: datetime | None = None) -> int:
+        timestamp = started_at.timestamp() if started_at else time.time()
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT INTO runs (site, started_at) VALUES (?, ?)", (site, timestamp)
+            )
+        return cursor.lastrowid
+
+    def add_pages(
+        self,
+        run_id: int,
+        pages: Iterable[Page],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        iterator = iter(pages)
+        while batch := list(islice(iterator, batch_size)):
+            self._insert_page_batch(run_id, batch)
+
+    def finish_run(self, run_id: int, summary: AnalysisSummary) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE runs SET finished_at = ?, total_time = ?, errors = ?, "
+                "duplicate_pages = ?, near_duplicates = ?, keyword_tail = ?, "
+                "reused_pages = ?, refreshed_pages = ?, stage_times = ?, "
+                "page_count = (SELECT COUNT(*) FROM pages WHERE run_id = ?) "
+                "WHERE id = ?",
+                (
+                    time.time(),
+                    summary.total_time,
+                    json.dumps(summary.errors),
+                    json.dumps(summary.duplicate_pages),
+                    json.dumps(
+                        [cluster.model_dump() for cluster in summary.near_duplicates]
+                    ),
+                    _dump_tail(summary.keyword_tail),
+                    summary.reused_pages,
+                    summary.refreshed_pages,
+                    json.dumps(summary.stage_times),
+                    run_id,
+                    run_id,
+                ),
+            )
+            self._db.executemany(
+                "INSERT INTO keywords (run_id, page_id, position, word, count) "
+                "VALUES (?, NULL, ?, ?, ?)",
+                (
+                    (run_id, position, keyword.word, keyword.count)
+                    for position, keyword in enumerate(summary.keywords)
+                ),
+            )
+
+    def _insert_page_batch(self, run_id: int, pages: list[Page]) -> None:
+        with self._lock, self._db:
+            keyword_rows = []
+            w3c_rows = []
+            for page in pages:
+                cursor = self._db.execute(
+                    "INSERT INTO pages (run_id, url, title, description, word_count, "
+                    "word_counts, bigrams, trigrams, warnings, content_hash, etag, "
+                    "last_modified, simhash, keyword_tail) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        run_id,
+                        page.url,
+                        page.title,
+                        page.description,
+                        page.word_count,
+                        json.dumps(page.word_counts.to_dict()),
+                        json.dumps(page.bigrams.to_dict()),
+                        json.dumps(page.trigrams.to_dict()),
+                        json.dumps(page.warnings),
+                        page.content_hash,
+                        page.etag,
+                        page.last_modified,
+                        page.simhash,
+                        _dump_tail(page.keyword_tail),
+                    ),
+                )
+                page_id = cursor.lastrowid
+                keyword_rows.extend(
+                    (run_id, page_id, position, keyword.word, keyword.count)
+                    for position, keyword in enumerate(page.keywords)
+                )
+                if page.w3c_validation is not None:
+                    w3c_rows.append(_w3c_row(page_id, page.w3c_validation))
+
+            self._db.executemany(
+                "INSERT INTO keywords (run_id, page_id, position, word, count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                keyword_rows,
+            )
+            self._db.executemany(
+                "INSERT INTO w3c_responses (page_id, url, source, language, messages) "
+                "VALUES (?, ?, ?, ?, ?)",
+                w3c_rows,
+            )
+
+    def save_validations(self, run_id: int, pages: Iterable[Page]) -> int:
+        """Store the W3C results of ``pages`` on the run's pages with the same URL.
+
+        For validations made after the run was saved; earlier results of those
+        pages are replaced. Returns the number of pages updated.
+        """
+        validations = {
+            page.url: page.w3c_validation
+            for page in pages
+            if page.w3c_validation is not None
+        }
+        if not validations:
+            return 0
+        with self._lock, self._db:
+            rows = [
+                _w3c_row(page_id, validations[url])
+                for page_id, url in self._db.execute(
+                    "SELECT id, url FROM pages WHERE run_id = ?", (run_id,)
+                )
+                if url in validations
+            ]
+            self._db.executemany(
+                "INSERT OR REPLACE INTO w3c_responses "
+                "(page_id, url, source, language, messages) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def list_runs(self, site: str | None = None, *, limit: int = 50) -> list[StoredRun]:
+        """Finished runs, newest first; runs that crashed or are still being written are left out."""
+        query = (
+            "SELECT id, site, started_at, total_time, page_count FROM runs "
+            "WHERE finished_at IS NOT NULL"
+        )
+        params: tuple = ()
+        if site is not None:
+            query += " AND site = ?"
+            params = (site,)
+        query += " ORDER BY started_at DESC, id DESC LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(query, (*params, limit)).fetchall()
+        return [_stored_run(row) for row in rows]
+
+    def latest_run(self, site: str) -> StoredRun | None:
+        runs = self.list_runs(site, limit=1)
+        return runs[0] if runs else None
+
+    def get_pages(self, run_id: int, *, offset: int = 0, limit: int = 100) -> list[Page]:
+        with self._lock:
+            rows = self._db.execute(
+                f"{PAGE_SELECT} WHERE pages.run_id = ? ORDER BY pages.id LIMIT ? OFFSET ?",
+                (run_id, limit, offset),
+            ).fetchall()
+            return self._pages_from_rows(rows)
+
+    def iter_pages(self, run_id: int, *, page_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Page]:
+        """Stream a run's pages using keyset pagination (constant memory per batch)."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    f"{PAGE_SELECT} WHERE pages.run_id = ? AND pages.id > ? "
+                    "ORDER BY pages.id LIMIT ?",
+                    (run_id, last_id, page_size),
+                ).fetchall()
+                pages = self._pages_from_rows(rows)
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield from pages
+
+    def find_pages(
+        self, *, url: str | None = None, content_hash: str | None = None, limit: int = 100
+    ) -> list[tuple[int, Page]]:
+        """Return ``(run_id, page)`` pairs for a URL or content hash, newest first."""
+        if (url is None) == (content_hash is None):
+            raise ValueError("Pass exactly one of url or content_hash.")
+        column, value = ("url", url) if url is not None else ("content_hash", content_hash)
+        with self._lock:
+            rows = self._db.execute(
+                f"{PAGE_SELECT} WHERE pages.{column} = ? ORDER BY pages.id DESC LIMIT ?",
+                (value, limit),
+            ).fetchall()
+            pages = self._pages_from_rows(rows)
+        return [(row[1], page) for row, page in zip(rows, pages)]
+
+    def load_report(self, run_id: int) -> Report:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT total_time, errors, duplicate_pages, near_duplicates, "
+                "keyword_tail, reused_pages, refreshed_pages, stage_times "
+                "FROM runs WHERE id = ?",
+                (run_id,),
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"No stored run with id {run_id}.")
+            keywords = [
+                KeyWord(word=word, count=count)
+                for word, count in self._db.execute(
+                    "SELECT word, count FROM keywords "
+                    "WHERE run_id = ? AND page_id IS NULL ORDER BY position",
+                    (run_id,),
+                )
+            ]
+
+        (
+            total_time,
+            errors,
+            duplicate_pages,
+            near_duplicates,
+            keyword_tail,
+            reused_pages,
+            refreshed_pages,
+            stage_times,
+        ) = row
+        return Report(
+            pages=list(self.iter_pages(run_id)),
+            keywords=keywords,
+            keyword_tail=_load_tail(keyword_tail),
+            errors=json.loads(errors),
+            total_time=total_time,
+            duplicate_pages=json.loads(duplicate_pages),
+            near_duplicates=json.loads(near_duplicates),
+            reused_pages=reused_pages,
+            refreshed_pages=refreshed_pages,
+            stage_times=json.loads(stage_times),
+        )
+
+    def delete_run(self, run_id: int) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def _pages_from_rows(self, rows: list[tuple]) -> list[Page]:
+        keywords = self._keywords_for([row[0] for row in rows])
+        # Pages loaded together share one n-gram vocabulary.
+        vocabulary = Vocabulary()
+        pages = []
+        for row in rows:
+            (
+                page_id,
+                _run_id,
+                url,
+                title,
+                description,
+                word_count,
+                word_counts,
+                bigrams,
+                trigrams,
+                warnings,
+                content_hash,
+                etag,
+                last_modified,
+                simhash,
+                keyword_tail,
+                w3c_url,
+                w3c_source,
+                w3c_language,
+                w3c_messages,
+            ) = row
+            validation = None
+            if w3c_messages is not None:
+                validation = W3CResponse(
+                    messages=json.loads(w3c_messages),
+                    url=w3c_url,
+                    source=w3c_source,
+                    language=w3c_language,
+                )
+            pages.append(
+                Page(
+                    url=url,
+                    title=title,
+                    description=description,
+                    word_count=word_count,
+                    keywords=keywords.get(page_id, []),
+                    keyword_tail=_load_tail(keyword_tail),
+                    word_counts=_load_ngrams(word_counts, vocabulary),
+                    bigrams=_load_ngrams(bigrams, vocabulary),
+                    trigrams=_load_ngrams(trigrams, vocabulary),
+                    warnings=json.loads(warnings),
+                    content_hash=content_hash,
+                    w3c_validation=validation,
+                    etag=etag,
+                    last_modified=last_modified,
+                    simhash=simhash,
+                )
+            )
+        return pages
+
+    def _keywords_for(self, page_ids: list[int]) -> dict[int, list[KeyWord]]:
+        keywords: dict[int, list[KeyWord]] = {page_id: [] for page_id in page_ids}
+        if not page_ids:
+            return keywords
+
+        placeholders = ", ".join("?" * len(page_ids))
+        rows = self._db.execute(
+            "SELECT page_id, word, count FROM keywords "
+            f"WHERE page_id IN ({placeholders}) ORDER BY page_id, position",
+            page_ids,
+        )
+        for page_id, word, count in rows:
+            keywords[page_id].append(KeyWord(word=word, count=count))
+        return keywords
+
+
+def _w3c_row(page_id: int, validation: W3CResponse) -> tuple:
+    return (
+        page_id,
+        validation.url,
+        validation.source,
+        validation.language,
+        json.dumps([message.model_dump() for message in validation.messages]),
+    )
+
+
+def _dump_tail(tail: CompactCounter) -> str | None:
+    return json.dumps(tail.to_dict()) if tail else None
+
+
+def _load_tail(value: str | None) -> CompactCounter:
+    return CompactCounter.from_dict(json.loads(value)) if value else CompactCounter()
+
+
+def _load_ngrams(value: str, vocabulary: Vocabulary) -> CompactCounter:
+    return CompactCounter.from_dict(json.loads(value), vocabulary=vocabulary)
+
+
+def _stored_run(row: tuple) -> StoredRun:
+    run_id, site, started_at, total_time, page_count = row
+    return StoredRun(
+        id=run_id,
+        site=site,
+        started_at=datetime.fromtimestamp(started_at, tz=timezone.utc),
+        total_time=total_time,
+        page_count=page_count,
+    )
+
+
+_shared_store: ReportStore | None = None
+_shared_store_lock = threading.Lock()
+
+
+def get_report_store() -> ReportStore:
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = ReportStore()
+    return _shared_store
@@ -0,0 +1,287 @@
+"""Suggestion rules declared as data and evaluated over ``PageTable`` columns.
+
+Each page rule compares one column against its thresholds for every page at
+once. Hits are kept as row numbers and only become message strings when a
+category is read, so a 50k page report costs a few array comparisons until
+someone displays or exports the suggestions.
+"""
+
+import json
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+from itertools import chain
+from operator import attrgetter
+from typing import Literal
+
+import numpy as np
+
+from src.models import Report
+from src.warning_classifier import classify_warning
+
+SUGGESTION_CATEGORIES = (
+    "Title",
+    "Description",
+    "Keywords",
+    "Content",
+    "Structure",
+    "Performance",
+)
+
+
+@dataclass(frozen=True)
+class SuggestionRule:
+    """Fires when ``metric`` is below ``below`` or above ``above``.
+
+    Page rules read a ``PageTable`` column; site rules read a report-wide
+    metric (see ``site_metrics``). ``message`` is a ``str.format`` template
+    that may use ``{url}`` (page rules), ``{value}``, ``{below}`` and
+    ``{above}``.
+    """
+
+    name: str
+    category: str
+    metric: str
+    message: str
+    below: float | None = None
+    above: float | None = None
+    scope: Literal["page", "site"] = "page"
+
+    def fires(self, values: np.ndarray) -> np.ndarray:
+        mask = np.zeros(values.shape, dtype=bool)
+        if self.below is not None:
+            mask |= values < self.below
+        if self.above is not None:
+            mask |= values > self.above
+        return mask
+
+    def format(self, value: object, url: str | None = None) -> str:
+        return self.message.format(
+            url=url, value=value, below=_number(self.below), above=_number(self.above)
+        )
+
+
+DEFAULT_SUGGESTION_RULES = (
+    SuggestionRule(
+        "title_too_short",
+        "Title",
+        "title_length",
+        "The title for {url} is too short. Aim for 50-60 characters.",
+        below=30,
+    ),
+    SuggestionRule(
+        "title_too_long",
+        "Title",
+        "title_length",
+        "The title for {url} is too long. Keep it under {above} characters.",
+        above=60,
+    ),
+    SuggestionRule(
+        "description_too_short",
+        "Description",
+        "description_length",
+        "The meta description for {url} is too short. Aim for 150-160 characters.",
+        below=50,
+    ),
+    SuggestionRule(
+        "description_too_long",
+        "Description",
+        "description_length",
+        "The meta description for {url} is too long. "
+        "Keep it under {above} characters.",
+        above=160,
+    ),
+    SuggestionRule(
+        "few_keywords",
+        "Keywords",
+        "keyword_count",
+        "Consider adding more relevant keywords to {url}",
+        below=5,
+    ),
+    SuggestionRule(
+        "thin_content",
+        "Content",
+        "word_count",
+        "The content on {url} is thin. Consider adding more valuable content.",
+        below=300,
+    ),
+    SuggestionRule(
+        "keyword_diversity",
+        "Keywords",
+        "keyword_count",
+        "Your website lacks keyword diversity. Consider expanding your content "
+        "to cover more relevant topics.",
+        below=10,
+        scope="site",
+    ),
+)
+
+
+def with_thresholds(
+    rules: Iterable[SuggestionRule],
+    thresholds: Mapping[str, Mapping[str, float | None]],
+) -> tuple[SuggestionRule, ...]:
+    """Return ``rules`` with per-client thresholds, e.g. ``{"thin_content": {"below": 500}}``."""
+    rules = tuple(rules)
+    unknown = set(thresholds) - {rule.name for rule in rules}
+    if unknown:
+        raise ValueError(f"Unknown suggestion rules: {', '.join(sorted(unknown))}.")
+    for name, bounds in thresholds.items():
+        if not set(bounds) <= {"below", "above"}:
+            raise ValueError(f"Rule {name!r} only takes 'below' and 'above' thresholds.")
+    return tuple(replace(rule, **thresholds.get(rule.name, {})) for rule in rules)
+
+
+def thresholds_from_json(text: str) -> dict[str, dict[str, float | None]]:
+    """Parse thresholds for ``with_thresholds`` saved as JSON, e.g. per client."""
+    try:
+        thresholds = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Thresholds are not valid JSON: {exc}") from exc
+    if not isinstance(thresholds, dict) or not all(
+        isinstance(bounds, dict) for bounds in thresholds.values()
+    ):
+        raise ValueError('Thresholds must map rule names to {"below": ..., "above": ...}.')
+    for name, bounds in thresholds.items():
+        for value in bounds.values():
+            if value is not None and (
+                isinstance(value, bool) or not isinstance(value, int | float)
+            ):
+                raise ValueError(f"Thresholds of rule {name!r} must be numbers or null.")
+    return thresholds
+
+
+def site_metrics(report: Report) -> dict[str, float]:
+    return {"keyword_count": len(report.keywords), "page_count": len(report.pages)}
+
+
+class SuggestionList(Sequence[str]):
+    """The suggestions of one category, formatted as they are read."""
+
+    def __init__(self):
+        self._parts: list[tuple[int, Callable[[int], str]]] = []
+        self._length = 0
+
+    def add(self, count: int, message: Callable[[int], str]) -> None:
+        """Append ``count`` suggestions; ``message(i)`` formats the ``i``-th one."""
+        if count:
+            self._parts.append((count, message))
+            self._length += count
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("suggestion index out of range")
+        for count, message in self._parts:
+            if index < count:
+                return message(index)
+            index -= count
+        raise IndexError("suggestion index out of range")
+
+    def __iter__(self) -> Iterator[str]:
+        for count, message in self._parts:
+            for index in range(count):
+                yield message(index)
+
+    def __repr__(self) -> str:
+        return f"SuggestionList(entries={len(self)})"
+
+
+class Suggestions(Mapping[str, SuggestionList]):
+    """Category -> ``SuggestionList``, in ``SUGGESTION_CATEGORIES`` order."""
+
+    def __init__(self, categories: Iterable[str] = SUGGESTION_CATEGORIES):
+        self._lists = {category: SuggestionList() for category in categories}
+
+    def __getitem__(self, category: str) -> SuggestionList:
+        return self._lists[category]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lists)
+
+    def __len__(self) -> int:
+        return len(self._lists)
+
+    def total(self) -> int:
+        return sum(map(len, self._lists.values()))
+
+    def to_dict(self) -> dict[str, list[str]]:
+        """Materialize every message, e.g. for a JSON export."""
+        return {category: list(items) for category, items in self._lists.items()}
+
+
+def evaluate_rules(
+    report: Report,
+    rules: Iterable[SuggestionRule] = DEFAULT_SUGGESTION_RULES,
+    *,
+    categorize_warning: Callable[[str], str] = classify_warning,
+) -> Suggestions:
+    """Evaluate ``rules`` against ``report`` and file page warnings by category."""
+    rules = tuple(rules)
+    suggestions = Suggestions(
+        dict.fromkeys([*SUGGESTION_CATEGORIES, *(rule.category for rule in rules)])
+    )
+    table = report.page_table
+    site = site_metrics(report)
+
+    for rule in rules:
+        if rule.scope != "page":
+            continue
+        values = getattr(table, rule.metric)
+        rows = np.flatnonzero(rule.fires(values))
+        suggestions[rule.category].add(
+            len(rows), _page_message(rule, table.url, values, rows)
+        )
+
+    # Warnings are flattened into one list with a parallel row column, and
+    # each distinct warning text is classified only once.
+    warnings = list(chain.from_iterable(map(attrgetter("warnings"), report.pages)))
+    warning_rows = np.repeat(np.arange(len(table)), table.warning_count)
+    category_codes = {category: code for code, category in enumerate(suggestions)}
+    code_of = {
+        warning: category_codes[categorize_warning(warning)]
+        for warning in dict.fromkeys(warnings)
+    }
+    codes = np.fromiter(map(code_of.__getitem__, warnings), dtype=np.int16, count=len(warnings))
+    for category, code in category_codes.items():
+        positions = np.flatnonzero(codes == code)
+        suggestions[category].add(
+            len(positions), _warning_message(warnings, warning_rows, positions, table.url)
+        )
+
+    for rule in rules:
+        if rule.scope == "site" and rule.fires(np.array(site[rule.metric])):
+            suggestions[rule.category].add(1, _site_message(rule, site[rule.metric]))
+
+    return suggestions
+
+
+def _page_message(
+    rule: SuggestionRule, urls: np.ndarray, values: np.ndarray, rows: np.ndarray
+) -> Callable[[int], str]:
+    return lambda index: rule.format(values[rows[index]].item(), urls[rows[index]])
+
+
+def _site_message(rule: SuggestionRule, value: float) -> Callable[[int], str]:
+    return lambda _: rule.format(value)
+
+
+def _warning_message(
+    warnings: list[str], rows: np.ndarray, positions: np.ndarray, urls: np.ndarray
+) -> Callable[[int], str]:
+    def message(index: int) -> str:
+        position = positions[index]
+        return f"{warnings[position]} on {urls[rows[position]]}"
+
+    return message
+
+
+def _number(value: float | None) -> object:
+    if value is None:
+        return None
+    return int(value) if float(value).is_integer() else value
@@ -1,14 +1,40 @@
+import sqlite3
+from dataclasses import dataclass
+
 import streamlit as st
 
+from src.crawler import DEFAULT_MAX_PAGE_BYTES, CrawlOptions
+from src.diff import diff_reports
+from src.jobs import JobStatus, get_job_manager
+from src.models import Report, ReportDiff
 from src.pdf_generator import PDFGenerator
 from src.service import SEOAnalyzerService
+from src.store import get_report_store
+from src.suggestions import thresholds_from_json, with_thresholds
 from src.url_safety import UnsafeUrlError, validate_public_url
 
 from .components.header import header
-from .components.report import ReportView
+from .components.job_status import current_job, job_status, pop_finished_job
+from .components.report import REPORT_RUN_ID, W3C_JOB, ReportView
 from .conf import configure
 
 PDF_FILE_NAME = "seo_analysis_report.pdf"
+ANALYSIS_JOB = "analysis_job"
+PDF_JOB = "pdf_job"
+MEGABYTE = 1024 * 1024
+SUGGESTIONS_SHOWN = 200  # Per category
+
+
+@dataclass(frozen=True)
+class AnalysisOutcome:
+    report: Report
+    # False when the report was crawled by another session and shared through
+    # the report cache; that session saves it to the history.
+    crawled: bool
+    diff: ReportDiff | None = None
+    run_id: int | None = None  # The history run the job saved the report as
+    history_error: str | None = None
+    save_error: str | None = None
 
 
 def initialize_session_state():
@@ -19,22 +45,164 @@ def initialize_session_state():
 
 
 def reset_analysis_state():
-    for key in ("report", "suggestions", "selected_page", "pdf_data", "pdf_file_name"):
+    for job_key in (ANALYSIS_JOB, PDF_JOB, W3C_JOB):
+        job = current_job(job_key)
+        if job is not None:
+            job.cancel()
+    for key in (
+        ANALYSIS_JOB,
+        PDF_JOB,
+        W3C_JOB,
+        "report",
+        REPORT_RUN_ID,
+        "report_diff",
+        "suggestions",
+        "selected_page",
+        "pdf_data",
+        "pdf_file_name",
+    ):
         st.session_state.pop(key, None)
     st.session_state["analysis_complete"] = False
 
 
+def persist_report(site, report):
+    """Save ``report`` to the history of ``site`` and return its run id."""
+    return get_report_store().save_report(report, site=site)
+
+
+def load_latest_report(site):
+    """Load the last finished run of ``site`` from the history, if there is one."""
+    store = get_report_store()
+    run = store.latest_run(site)
+    return store.load_report(run.id) if run is not None else None
+
+
+def crawl_limit_inputs():
+    """Render the crawl budget inputs and return the matching ``CrawlOptions``.
+
+    Like ``CrawlOptions``, only single pages are capped by default; the whole
+    site is crawled unless a limit is entered.
+    """
+    with st.expander("Crawl limits", expanded=False):
+        st.caption(
+            "Leave a limit empty (or set it to 0) to crawl without it; "
+            "a link depth of 0 crawls only the start page."
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            max_pages = st.number_input("Max pages", min_value=0, value=None, step=50)
+            max_depth = st.number_input("Max link depth", min_value=0, value=None)
+        with col2:
+            max_page_mb = st.number_input(
+                "Max page size (MB)",
+                min_value=0,
+                value=DEFAULT_MAX_PAGE_BYTES // MEGABYTE,
+            )
+            max_total_mb = st.number_input(
+                "Max total download (MB)", min_value=0, value=None
+            )
+        with col3:
+            deadline = st.number_input("Time limit (seconds)", min_value=0, value=None)
+            sitemaps = st.checkbox(
+                "Seed from sitemaps",
+                help="Also crawl the URLs listed in the site's sitemaps.",
+            )
+
+    return CrawlOptions(
+        max_pages=int(max_pages or 0) or None,
+        max_depth=int(max_depth) if max_depth is not None else None,
+        max_page_bytes=int(max_page_mb or 0) * MEGABYTE or None,
+        max_total_bytes=int(max_total_mb or 0) * MEGABYTE or None,
+        deadline=float(deadline or 0) or None,
+        sitemaps=sitemaps,
+    )
+
+
+def start_analysis(safe_url, incremental, refresh=False, options=None):
+    seo_service = st.session_state["seo_service"]
+
+    def analyze(job):
+        # The previous run is the diff base, and with ``incremental`` also the
+        # baseline whose unchanged pages are reused; load it off the script thread.
+        try:
+            previous_report = load_latest_report(safe_url)
+            history_error = None
+        except (sqlite3.Error, OSError) as exc:
+            previous_report = None
+            history_error = f"Unable to load the previous report of this site: {exc}"
+        job.raise_if_cancelled()
+
+        crawled = []
+        report = seo_service.analyze(
+            safe_url,
+            previous=previous_report.pages if incremental and previous_report else None,
+            options=options,
+            progress=job.update_progress,
+            refresh=refresh,
+            on_crawl=crawled.append,
+        )
+        diff = diff_reports(previous_report, report) if previous_report else None
+        # Saving writes every page to SQLite, so it happens here rather than on
+        # the script thread; only the session that crawled saves the report.
+        run_id = save_error = None
+        if crawled:
+            try:
+                run_id = persist_report(safe_url, report)
+            except (sqlite3.Error, OSError) as exc:
+                save_error = f"Unable to save this report to the history: {exc}"
+        return AnalysisOutcome(
+            report,
+            crawled=bool(crawled),
+            diff=diff,
+            run_id=run_id,
+            history_error=history_error,
+            save_error=save_error,
+        )
+
+    job = get_job_manager().submit("analysis", analyze)
+    st.session_state[ANALYSIS_JOB] = job.id
+
+
+def finish_analysis(job):
+    if job.status is JobStatus.CANCELLED:
+        st.info("Analysis cancelled.")
+        return
+    if job.status is JobStatus.FAILED:
+        st.error(f"Unable to analyze the URL: {job.error}")
+        return
+
+    outcome = job.result
+    for error in (outcome.history_error, outcome.save_error):
+        if error:
+            st.warning(error)
+    if outcome.run_id is not None:
+        st.session_state[REPORT_RUN_ID] = outcome.run_id
+    st.session_state["report"] = outcome.report
+    if outcome.diff is not None:
+        st.session_state["report_diff"] = outcome.diff
+    st.session_state["analysis_complete"] = True
+
+
 def create_pdf_download():
-    try:
-        with st.spinner("Generating PDF report..."):
-            pdf_data = PDFGenerator.generate_bytes(st.session_state["report"])
-    except Exception as exc:
-        st.session_state.pop("pdf_data", None)
-        st.session_state.pop("pdf_file_name", None)
-        st.error(f"Unable to generate the PDF report: {exc}")
-    else:
-        st.session_state["pdf_data"] = pdf_data
+    report = st.session_state["report"]
+    diff = st.session_state.get("report_diff")
+    st.session_state.pop("pdf_data", None)
+    job = get_job_manager().submit(
+        "pdf", lambda job: PDFGenerator.generate_bytes(report, diff=diff)
+    )
+    st.session_state[PDF_JOB] = job.id
+
+
+def finish_pdf_download(job):
+    if job.status is JobStatus.SUCCEEDED:
+        st.session_state["pdf_data"] = job.result
         st.session_state["pdf_file_name"] = PDF_FILE_NAME
+        return
+
+    st.session_state.pop("pdf_data", None)
+    st.session_state.pop("pdf_file_name", None)
+    if job.status is JobStatus.FAILED:
+        st.error(f"Unable to generate the PDF report: {job.error}")
 
 
 def render_pdf_download_button():
@@ -56,6 +224,15 @@ def main():
     header()
 
     url = st.text_input("Enter the website URL to analyze:")
+    incremental = st.checkbox(
+        "Incremental re-audit",
+        help="Reuse unchanged pages from the latest saved report of this site.",
+    )
+    refresh = st.checkbox(
+        "Force a fresh crawl",
+        help="Ignore a recent analysis of this site shared by another session.",
+    )
+    options = crawl_limit_inputs()
 
     if st.button("Analyze"):
         reset_analysis_state()
@@ -67,39 +244,74 @@ def main():
             except UnsafeUrlError as exc:
                 st.warning(str(exc))
             else:
-                try:
-                    with st.spinner("Analyzing..."):
-                        report = st.session_state["seo_service"].analyze(safe_url)
-                except Exception as exc:
-                    st.error(f"Unable to analyze the URL: {exc}")
-                else:
-                    st.session_state["report"] = report
-                    st.session_state["analysis_complete"] = True
+                start_analysis(safe_url, incremental, refresh, options)
+
+    if finished_job := pop_finished_job(ANALYSIS_JOB):
+        finish_analysis(finished_job)
+    elif current_job(ANALYSIS_JOB) is not None:
+        job_status(ANALYSIS_JOB, "Analyzing pages")
 
     if st.session_state.get("analysis_complete", False):
         ReportView()
         st.write("---")
+        thresholds = suggestion_threshold_input()
         if st.button("Generate Suggestions"):
-            suggestions = st.session_state["seo_service"].generate_suggestions(
-                st.session_state["report"]
-            )
-            st.session_state["suggestions"] = suggestions
+            generate_suggestions(thresholds)
 
         if st.button("Generate PDF Report"):
             create_pdf_download()
 
+        if finished_job := pop_finished_job(PDF_JOB):
+            finish_pdf_download(finished_job)
+        elif current_job(PDF_JOB) is not None:
+            job_status(PDF_JOB, "Generating PDF report")
+
         render_pdf_download_button()
 
     if "suggestions" in st.session_state:
         display_suggestions(st.session_state["suggestions"])
 
 
+def suggestion_threshold_input():
+    """Render the per-client threshold overrides and return the JSON entered."""
+    with st.expander("Suggestion thresholds", expanded=False):
+        rule_names = ", ".join(
+            rule.name for rule in st.session_state["seo_service"].suggestion_rules
+        )
+        st.caption(
+            'Override rule thresholds for this client as JSON, e.g. '
+            '{"thin_content": {"below": 500}}. Rules: ' + rule_names
+        )
+        return st.text_area("Thresholds (JSON)", key="suggestion_thresholds")
+
+
+def generate_suggestions(thresholds=""):
+    """Evaluate the suggestions of the current report with ``thresholds`` applied."""
+    seo_service = st.session_state["seo_service"]
+    rules = None
+    if thresholds and thresholds.strip():
+        try:
+            rules = with_thresholds(
+                seo_service.suggestion_rules, thresholds_from_json(thresholds)
+            )
+        except ValueError as exc:
+            st.error(f"Invalid suggestion thresholds: {exc}")
+            return
+    st.session_state["suggestions"] = seo_service.generate_suggestions(
+        st.session_state["report"], rules=rules
+    )
+
+
 def display_suggestions(suggestions):
     st.header("SEO Suggestions")
     for category, category_suggestions in suggestions.items():
-        with st.expander(category):
-            for suggestion in category_suggestions:
+        with st.expander(f"{category} ({len(category_suggestions)})"):
+            # Only the messages shown are formatted.
+            for suggestion in category_suggestions[:SUGGESTIONS_SHOWN]:
                 st.write(f"- {suggestion}")
+            hidden = len(category_suggestions) - SUGGESTIONS_SHOWN
+            if hidden > 0:
+                st.caption(f"{hidden} more not shown.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+import streamlit as st
+
+from src.jobs import Job, get_job_manager
+
+JOB_POLL_INTERVAL = 1.0
+
+
+def current_job(state_key):
+    return get_job_manager().get(st.session_state.get(state_key))
+
+
+def pop_finished_job(state_key) -> Job | None:
+    """Return the job stored under ``state_key`` once it has finished, forgetting it."""
+    job = current_job(state_key)
+    if job is None:
+        st.session_state.pop(state_key, None)
+        return None
+    if not job.finished:
+        return None
+    st.session_state.pop(state_key, None)
+    return job
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def job_status(state_key, label):
+    """Show a running job's progress with a cancel button, polling until it ends.
+
+    Only this fragment reruns while the job is in flight; when it finishes the
+    whole script reruns so the caller can pick up the result.
+    """
+    job = current_job(state_key)
+    if job is None:
+        return
+    if job.finished:
+        st.rerun()
+
+    done, total = job.progress
+    text = f"{label}: {done} of {total}" if total else f"{label}..."
+    st.progress(min(done / total, 1.0) if total else 0.0, text=text)
+    if job.cancel_requested:
+        st.caption("Cancelling...")
+    elif st.button("Cancel", key=f"cancel_{state_key}"):
+        job.cancel()
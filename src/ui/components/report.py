@@ -1,12 +1,34 @@
+import sqlite3
+
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from src.jobs import JobStatus, get_job_manager
 from src.models import Report as ReportModel
+from src.page_table import OVERVIEW_COLUMNS
 from src.service import SEOAnalyzerService
+from src.store import get_report_store
 from src.url_safety import UnsafeUrlError
-from src.utils import group_warnings
+from src.warning_classifier import group_warnings
+
+from .job_status import current_job, job_status, pop_finished_job
+
+W3C_JOB = "w3c_job"
+# Id of the history run the current report was saved as, if this session saved it.
+REPORT_RUN_ID = "report_run_id"
+
+
+def persist_validations(pages):
+    """Write the W3C results of ``pages`` back to the saved run of the report."""
+    run_id = st.session_state.get(REPORT_RUN_ID)
+    if run_id is None:
+        return
+    try:
+        get_report_store().save_validations(run_id, pages)
+    except (sqlite3.Error, OSError) as exc:
+        st.warning(f"Unable to save the validation results to the history: {exc}")
 
 
 class ReportView:
@@ -52,7 +74,9 @@ class ReportView:
         self.__render_buttons(report)
 
         if "selected_page" in st.session_state:
-            page = report.pages[st.session_state["selected_page"]]
+            row = st.session_state["selected_page"]
+            page = report.pages[row]
+            table = report.page_table
             st.write("---")
             st.subheader(
                 f"Details for Page {st.session_state['selected_page'] + 1} - [{page.url}]({page.url})"
@@ -63,9 +87,9 @@ class ReportView:
             with col1:
                 st.metric("Word Count", page.word_count)
             with col2:
-                st.metric("Title Length", len(page.title))
+                st.metric("Title Length", int(table.title_length[row]))
             with col3:
-                st.metric("Description Length", len(page.description))
+                st.metric("Description Length", int(table.description_length[row]))
 
             # Title and Description
             with st.expander("Title and Description", expanded=True):
@@ -96,9 +120,10 @@ class ReportView:
             self.__render_warnings(page.warnings)
 
             # W3C Validation
-            self.__render_w3c_validation(page, seo_service)
+            self.__render_w3c_validation(report, row, seo_service)
 
-    def __render_w3c_validation(self, page, seo_service):
+    def __render_w3c_validation(self, report, row, seo_service):
+        page = report.pages[row]
         st.subheader("W3C Validation")
         if page.w3c_validation is None:
             if st.button("Validate Page"):
@@ -111,6 +136,8 @@ class ReportView:
                     st.error(f"Unable to validate the page: {exc}")
                 else:
                     page.w3c_validation = w3c_response
+                    report.page_table.record_w3c(row, w3c_response)
+                    persist_validations([page])
                     st.rerun()
         else:
             w3c_results = page.w3c_validation
@@ -155,20 +182,9 @@ class ReportView:
     def __render_page_overview(self, report):
         st.subheader("Page Analysis Overview")
 
-        # Prepare data for the overview table
-        overview_data = []
-        for page in report.pages:
-            overview_data.append(
-                {
-                    "URL": page.url,
-                    "Title Length": len(page.title),
-                    "Description Length": len(page.description),
-                    "Word Count": page.word_count,
-                    "Warnings": len(page.warnings),
-                }
-            )
-
-        overview_df = pd.DataFrame(overview_data)
+        overview_df = pd.DataFrame(report.page_table.columns()).rename(
+            columns=OVERVIEW_COLUMNS
+        )
 
         st.dataframe(
             overview_df.style.background_gradient(
@@ -189,6 +205,36 @@ class ReportView:
             )
         )
 
+    def __render_bulk_w3c_validation(self, report, seo_service):
+        if finished_job := pop_finished_job(W3C_JOB):
+            if finished_job.status is not JobStatus.FAILED:
+                persist_validations(report.pages)
+            if finished_job.status is JobStatus.SUCCEEDED:
+                for failure in finished_job.result:
+                    st.error(failure)
+            elif finished_job.status is JobStatus.FAILED:
+                st.error(f"Unable to validate the pages: {finished_job.error}")
+            else:
+                st.info("Validation cancelled; pages validated so far were kept.")
+        elif current_job(W3C_JOB) is not None:
+            job_status(W3C_JOB, "Validating pages")
+            return
+
+        table = report.page_table
+        pending = len(table) - int(table.w3c_validated.sum())
+        if not pending:
+            return
+
+        if st.button(f"Validate All Pages ({pending})"):
+            job = get_job_manager().submit(
+                "w3c_validation",
+                lambda job: seo_service.validate_report(
+                    report, progress=job.update_progress
+                ),
+            )
+            st.session_state[W3C_JOB] = job.id
+            st.rerun()
+
     def __render_overall_overview(self, report):
         st.header("Overall Analysis Report")
 
@@ -206,6 +252,12 @@ class ReportView:
                 len(report.duplicate_pages) if report.duplicate_pages else 0,
             )
 
+        if report.reused_pages or report.refreshed_pages:
+            st.caption(
+                f"Incremental re-audit: {report.reused_pages} unchanged pages reused, "
+                f"{report.refreshed_pages} pages re-analyzed."
+            )
+
         # Overall Keywords
         with st.expander("Overall Keywords", expanded=True):
             st.subheader("Top 10 Keywords")
@@ -237,6 +289,15 @@ class ReportView:
                         + ", ".join([f"[{url}]({url})" for url in duplicate_group])
                     )
 
+        # Near-Duplicate Pages
+        if report.near_duplicates:
+            with st.expander("Near-Duplicate Pages", expanded=False):
+                for i, cluster in enumerate(report.near_duplicates, 1):
+                    st.markdown(
+                        f"**Cluster {i}** ({cluster.similarity:.0%} similar): "
+                        + ", ".join([f"[{url}]({url})" for url in cluster.urls])
+                    )
+
         # Error Summary
         if report.errors:
             with st.expander("Error Summary", expanded=True):
@@ -251,14 +312,80 @@ class ReportView:
                 )
                 st.plotly_chart(fig, use_container_width=True)
 
+    def __render_report_diff(self, diff):
+        st.header("Changes Since Previous Run")
+        if diff.is_empty:
+            st.info("No changes since the previous run.")
+            return
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Added Pages", len(diff.added_pages))
+        with col2:
+            st.metric("Removed Pages", len(diff.removed_pages))
+        with col3:
+            st.metric("Changed Pages", len(diff.changed_pages))
+
+        if diff.added_pages or diff.removed_pages:
+            with st.expander("Added and Removed Pages", expanded=False):
+                for url in diff.added_pages:
+                    st.success(f"Added: {url}")
+                for url in diff.removed_pages:
+                    st.error(f"Removed: {url}")
+
+        if diff.changed_pages:
+            with st.expander("Changed Pages", expanded=False):
+                st.dataframe(
+                    pd.DataFrame(
+                        [
+                            {
+                                "URL": change.url,
+                                "Moved From": change.previous_url or "",
+                                "Changes": "; ".join(
+                                    f"{item.field}: {item.old} → {item.new}"
+                                    for item in change.changes
+                                ),
+                                "New Warnings": len(change.new_warnings),
+                                "Resolved Warnings": len(change.resolved_warnings),
+                            }
+                            for change in diff.changed_pages
+                        ]
+                    )
+                )
+
+        if diff.keyword_movements:
+            with st.expander("Keyword Movement", expanded=False):
+                st.dataframe(
+                    pd.DataFrame(
+                        [
+                            (movement.word, movement.old_rank, movement.new_rank)
+                            for movement in diff.keyword_movements
+                        ],
+                        columns=["Keyword", "Previous Rank", "Current Rank"],
+                    )
+                )
+
+        if diff.new_duplicate_groups or diff.resolved_duplicate_groups:
+            with st.expander("Duplicate Page Changes", expanded=False):
+                for group in diff.new_duplicate_groups:
+                    st.warning("New duplicates: " + ", ".join(group))
+                for group in diff.resolved_duplicate_groups:
+                    st.success("Resolved duplicates: " + ", ".join(group))
+
     def display(self):
         report: ReportModel = st.session_state["report"]
         seo_service: SEOAnalyzerService = st.session_state["seo_service"]
 
         self.__render_overall_overview(report)
 
+        diff = st.session_state.get("report_diff")
+        if diff is not None:
+            self.__render_report_diff(diff)
+
         self.__render_page_overview(report)
 
+        self.__render_bulk_w3c_validation(report, seo_service)
+
         self.__render_page_details(report, seo_service)
 
         self.__render_errors(report.errors)
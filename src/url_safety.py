@@ -1,21 +1,209 @@
 import ipaddress
 import socket
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 from urllib.parse import urlsplit, urlunsplit
 
 ALLOWED_WEB_SCHEMES = frozenset({"http", "https"})
 ALLOWED_LOGO_HOSTS = frozenset({"raw.githubusercontent.com"})
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+DNS_CACHE_TTL = 300.0
+DNS_NEGATIVE_CACHE_TTL = 30.0
+DNS_CACHE_MAX_ENTRIES = 4096
+DNS_MAX_WORKERS = 16
+
+IPAddress = ipaddress.IPv4Address | ipaddress.IPv6Address
 
 
 class UnsafeUrlError(ValueError):
     """Raised when a URL is invalid or targets a non-public network location."""
 
 
+class _ParsedUrl(NamedTuple):
+    scheme: str
+    hostname: str
+    port: int | None
+    normalized: str
+
+
+class ResolvedUrl(NamedTuple):
+    """A vetted URL together with the public addresses it was checked against.
+
+    Connecting to one of ``addresses`` (instead of resolving ``hostname`` again)
+    guarantees the request reaches the host that passed the safety checks.
+    """
+
+    url: str
+    scheme: str
+    hostname: str
+    port: int
+    addresses: tuple[str, ...]
+
+    @property
+    def netloc(self) -> str:
+        return urlsplit(self.url).netloc
+
+
+class _ResolutionCache:
+    """Thread-safe, size-bounded cache of host resolutions.
+
+    Only the resolved addresses (or the resolution failure) are cached; the
+    public-address checks still run on every lookup.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DNS_CACHE_TTL,
+        negative_ttl: float = DNS_NEGATIVE_CACHE_TTL,
+        max_entries: int = DNS_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, set[IPAddress] | str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, hostname: str) -> set[IPAddress]:
+        with self._lock:
+            entry = self._entries.get(hostname)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(hostname)
+                result = entry[1]
+                if isinstance(result, str):
+                    raise UnsafeUrlError(result)
+                return result
+
+        try:
+            addresses = _resolve_ip_addresses(hostname)
+        except UnsafeUrlError as exc:
+            self._store(hostname, self.negative_ttl, str(exc))
+            raise
+        self._store(hostname, self.ttl, addresses)
+        return addresses
+
+    def _store(self, hostname: str, ttl: float, result: set[IPAddress] | str) -> None:
+        with self._lock:
+            self._entries[hostname] = (self._clock() + ttl, result)
+            self._entries.move_to_end(hostname)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_resolution_cache = _ResolutionCache()
+
+
 def validate_public_url(
     url: str,
     *,
     allowed_schemes: frozenset[str] = ALLOWED_WEB_SCHEMES,
     allowed_hosts: frozenset[str] | None = None,
 ) -> str:
+    parsed_url = _parse_url(url, allowed_schemes, allowed_hosts)
+    _ensure_public_host(parsed_url.hostname)
+    return parsed_url.normalized
+
+
+def resolve_public_url(
+    url: str,
+    *,
+    allowed_schemes: frozenset[str] = ALLOWED_WEB_SCHEMES,
+    allowed_hosts: frozenset[str] | None = None,
+) -> ResolvedUrl:
+    """Validate ``url`` like ``validate_public_url`` and return the vetted addresses."""
+    parsed_url = _parse_url(url, allowed_schemes, allowed_hosts)
+    addresses = _ensure_public_host(parsed_url.hostname)
+    return ResolvedUrl(
+        url=parsed_url.normalized,
+        scheme=parsed_url.scheme,
+        hostname=parsed_url.hostname,
+        port=parsed_url.port or DEFAULT_PORTS[parsed_url.scheme],
+        # Prefer IPv4, which is reachable from more networks than IPv6.
+        addresses=tuple(
+            str(address)
+            for address in sorted(addresses, key=lambda a: (a.version, int(a)))
+        ),
+    )
+
+
+def validate_public_urls(
+    urls: Iterable[str],
+    *,
+    allowed_schemes: frozenset[str] = ALLOWED_WEB_SCHEMES,
+    allowed_hosts: frozenset[str] | None = None,
+    max_workers: int = DNS_MAX_WORKERS,
+) -> dict[str, str | UnsafeUrlError]:
+    """Validate many URLs, resolving each distinct host once and concurrently.
+
+    Returns a mapping from every input URL to its normalized form, or to the
+    ``UnsafeUrlError`` explaining why it was rejected.
+    """
+    results: dict[str, str | UnsafeUrlError] = {}
+    parsed_urls: dict[str, _ParsedUrl] = {}
+    for url in urls:
+        if url in results or url in parsed_urls:
+            continue
+        try:
+            parsed_urls[url] = _parse_url(url, allowed_schemes, allowed_hosts)
+        except UnsafeUrlError as exc:
+            results[url] = exc
+
+    hostnames = {parsed_url.hostname for parsed_url in parsed_urls.values()}
+    host_errors: dict[str, UnsafeUrlError] = {}
+    if hostnames:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(hostnames))) as executor:
+            for hostname, error in zip(
+                hostnames, executor.map(_public_host_error, hostnames)
+            ):
+                if error is not None:
+                    host_errors[hostname] = error
+
+    for url, parsed_url in parsed_urls.items():
+        results[url] = host_errors.get(parsed_url.hostname, parsed_url.normalized)
+
+    return results
+
+
+def clear_resolution_cache() -> None:
+    _resolution_cache.clear()
+
+
+def validate_logo_url(url: str) -> str:
+    return validate_public_url(
+        url,
+        allowed_schemes=frozenset({"https"}),
+        allowed_hosts=ALLOWED_LOGO_HOSTS,
+    )
+
+
+def resolve_logo_url(url: str) -> ResolvedUrl:
+    return resolve_public_url(
+        url,
+        allowed_schemes=frozenset({"https"}),
+        allowed_hosts=ALLOWED_LOGO_HOSTS,
+    )
+
+
+def _build_netloc(hostname: str, port: int | None) -> str:
+    host = f"[{hostname}]" if ":" in hostname else hostname
+    return f"{host}:{port}" if port else host
+
+
+def _parse_url(
+    url: str,
+    allowed_schemes: frozenset[str],
+    allowed_hosts: frozenset[str] | None,
+) -> _ParsedUrl:
     raw_url = (url or "").strip()
     if not raw_url:
         raise UnsafeUrlError("Please enter a valid URL.")
@@ -49,37 +237,31 @@ def validate_public_url(
     if allowed_hosts is not None and hostname not in allowed_hosts:
         raise UnsafeUrlError("URL host is not in the allowed list.")
 
-    _ensure_public_host(hostname)
-
     normalized_netloc = _build_netloc(hostname, port)
     normalized_path = parsed.path or "/"
-    return urlunsplit((scheme, normalized_netloc, normalized_path, parsed.query, ""))
-
-
-def validate_logo_url(url: str) -> str:
-    return validate_public_url(
-        url,
-        allowed_schemes=frozenset({"https"}),
-        allowed_hosts=ALLOWED_LOGO_HOSTS,
-    )
+    normalized = urlunsplit((scheme, normalized_netloc, normalized_path, parsed.query, ""))
+    return _ParsedUrl(scheme=scheme, hostname=hostname, port=port, normalized=normalized)
 
 
-def _build_netloc(hostname: str, port: int | None) -> str:
-    host = f"[{hostname}]" if ":" in hostname else hostname
-    return f"{host}:{port}" if port else host
-
-
-def _ensure_public_host(hostname: str) -> None:
-    for address in _resolve_ip_addresses(hostname):
+def _ensure_public_host(hostname: str) -> set[IPAddress]:
+    addresses = _resolution_cache.resolve(hostname)
+    for address in addresses:
         if not address.is_global:
             raise UnsafeUrlError(
                 "Private, loopback, link-local, or reserved IP addresses are not allowed."
             )
+    return addresses
+
+
+def _public_host_error(hostname: str) -> UnsafeUrlError | None:
+    try:
+        _ensure_public_host(hostname)
+    except UnsafeUrlError as exc:
+        return exc
+    return None
 
 
-def _resolve_ip_addresses(
-    hostname: str,
-) -> set[ipaddress.IPv4Address | ipaddress.IPv6Address]:
+def _resolve_ip_addresses(hostname: str) -> set[IPAddress]:
     try:
         return {ipaddress.ip_address(hostname)}
     except ValueError:
@@ -0,0 +1,186 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.models import W3CResponse
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "website-analyser" / "w3c_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+# Expired rows are also swept once every this many writes, besides on open.
+EXPIRY_SWEEP_INTERVAL = 1000
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    memory_hits: int
+    disk_hits: int
+    entries: int
+
+
+class W3CCache:
+    """Two-tier cache of validator results keyed by page bytes and endpoint.
+
+    The in-memory tier is a bounded LRU. The optional on-disk tier is a SQLite
+    file that survives restarts, so re-auditing an unchanged site skips the
+    validator entirely. Entries older than ``ttl`` are treated as misses and
+    removed from both tiers; ``evict_expired`` sweeps the rest when the cache
+    is opened and every ``EXPIRY_SWEEP_INTERVAL`` writes, so the file does not
+    keep growing.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = DEFAULT_CACHE_PATH,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._memory: OrderedDict[str, tuple[float, W3CResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._memory_hits = self._disk_hits = 0
+        self._writes = 0
+        self._db = self._open(Path(path)) if path is not None else None
+        if self._db is not None:
+            self.evict_expired()
+
+    @staticmethod
+    def _open(path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS w3c_cache ("
+            "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        db.commit()
+        return db
+
+    @staticmethod
+    def key_for(content: bytes, endpoint: str) -> str:
+        digest = hashlib.sha256(endpoint.encode())
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> W3CResponse | None:
+        with self._lock:
+            now = self._clock()
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, response = entry
+                if self._is_fresh(stored_at, now):
+                    self._memory.move_to_end(key)
+                    self._hits += 1
+                    self._memory_hits += 1
+                    return response
+                self._delete(key)
+
+            response = self._load_from_disk(key, now)
+            if response is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._disk_hits += 1
+            return response
+
+    def set(self, key: str, response: W3CResponse) -> None:
+        with self._lock:
+            stored_at = self._clock()
+            self._remember(key, stored_at, response)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO w3c_cache (key, stored_at, payload) "
+                    "VALUES (?, ?, ?)",
+                    (key, stored_at, response.model_dump_json()),
+                )
+                self._db.commit()
+            self._writes += 1
+            sweep = self._writes % EXPIRY_SWEEP_INTERVAL == 0
+        if sweep:
+            self.evict_expired()
+
+    def evict_expired(self) -> None:
+        """Drop every entry older than ``ttl`` from both tiers."""
+        with self._lock:
+            cutoff = self._clock() - self.ttl
+            for key in [k for k, (at, _) in self._memory.items() if at < cutoff]:
+                del self._memory[key]
+            if self._db is not None:
+                self._db.execute("DELETE FROM w3c_cache WHERE stored_at < ?", (cutoff,))
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM w3c_cache")
+                self._db.commit()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                entries=len(self._memory),
+            )
+
+    def _is_fresh(self, stored_at: float, now: float) -> bool:
+        return now - stored_at <= self.ttl
+
+    def _remember(self, key: str, stored_at: float, response: W3CResponse) -> None:
+        self._memory[key] = (stored_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load_from_disk(self, key: str, now: float) -> W3CResponse | None:
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT stored_at, payload FROM w3c_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        stored_at, payload = row
+        if not self._is_fresh(stored_at, now):
+            self._delete(key)
+            return None
+
+        response = W3CResponse.model_validate_json(payload)
+        self._remember(key, stored_at, response)
+        return response
+
+    def _delete(self, key: str) -> None:
+        self._memory.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM w3c_cache WHERE key = ?", (key,))
+            self._db.commit()
+
+
+_shared_cache: W3CCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_w3c_cache() -> W3CCache:
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = W3CCache()
+    return _shared_cache
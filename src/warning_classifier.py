@@ -0,0 +1,73 @@
+"""Warning classification and grouping shared by the UI, the PDF and suggestions.
+
+Every category's keywords are compiled into one pattern, so classifying a
+warning is a single scan of its text. Warning text repeats heavily across
+pages, so results are memoized per distinct string and a whole report costs
+about one scan per unique warning.
+"""
+
+import re
+from functools import lru_cache
+
+# Checked in this order: a warning naming several categories gets the first.
+WARNING_CATEGORIES = (
+    ("Title", ("title",)),
+    ("Description", ("description",)),
+    ("Keywords", ("keyword",)),
+    ("Content", ("content", "text", "word")),
+    ("Structure", ("structure", "heading", "h1", "h2")),
+)
+DEFAULT_WARNING_CATEGORY = "Performance"
+WARNING_CACHE_SIZE = 65_536
+
+# One capture group per category; ``lastindex`` tells which category matched.
+# The lookahead matches at every position, so a keyword overlapping another
+# (the "title" in "textitle") is still seen.
+_CATEGORY_PATTERN = re.compile(
+    "(?="
+    + "|".join(
+        "(" + "|".join(map(re.escape, keywords)) + ")"
+        for _, keywords in WARNING_CATEGORIES
+    )
+    + ")"
+)
+_CATEGORY_NAMES = tuple(name for name, _ in WARNING_CATEGORIES)
+_LABEL_PATTERN = re.compile(r"^(.*?):\s*(.*)$")
+
+
+@lru_cache(maxsize=WARNING_CACHE_SIZE)
+def classify_warning(warning: str) -> str:
+    """Return the suggestion category for ``warning``."""
+    best = len(_CATEGORY_NAMES)
+    for match in _CATEGORY_PATTERN.finditer(warning.lower()):
+        best = min(best, match.lastindex - 1)
+        if best == 0:
+            break
+    return _CATEGORY_NAMES[best] if best < len(_CATEGORY_NAMES) else DEFAULT_WARNING_CATEGORY
+
+
+@lru_cache(maxsize=WARNING_CACHE_SIZE)
+def split_warning(warning: str) -> tuple[str, str] | None:
+    """Split ``"Label: detail"`` warnings; ``None`` for free-form ones."""
+    match = _LABEL_PATTERN.match(warning)
+    return match.groups() if match else None
+
+
+def group_warnings(warnings: list[str]) -> dict[str, str | list[str]]:
+    grouped: dict[str, str | list[str]] = {}
+
+    for warning in warnings:
+        parts = split_warning(warning)
+        if parts:
+            key, value = parts
+            if key in grouped:
+                if isinstance(grouped[key], list):
+                    grouped[key].append(value)
+                else:
+                    grouped[key] = [grouped[key], value]
+            else:
+                grouped[key] = value
+        else:
+            grouped[warning] = warning
+
+    return grouped
@@ -1,7 +1,10 @@
 import importlib.util
 import sys
+from ipaddress import ip_address
 from types import ModuleType
 
+import pytest
+
 
 def _install_optional_dependency_stubs():
     if (
@@ -10,7 +13,15 @@ def _install_optional_dependency_stubs():
     ):
         pyseoanalyzer = ModuleType("pyseoanalyzer")
         pyseoanalyzer.analyze = lambda url: {}
+        page = ModuleType("pyseoanalyzer.page")
+        page.Page = type("Page", (), {})
+        pyseoanalyzer.page = page
+        stemmer = ModuleType("pyseoanalyzer.stemmer")
+        stemmer.stem = lambda word: word
+        pyseoanalyzer.stemmer = stemmer
         sys.modules["pyseoanalyzer"] = pyseoanalyzer
+        sys.modules["pyseoanalyzer.page"] = page
+        sys.modules["pyseoanalyzer.stemmer"] = stemmer
 
     if (
         importlib.util.find_spec("matplotlib") is None
@@ -24,3 +35,88 @@ def _install_optional_dependency_stubs():
 
 
 _install_optional_dependency_stubs()
+
+
+class FakeClock:
+    """Manual clock for code that takes a ``clock``.
+
+    Returns ``now``, which tests advance by hand, or, when built with
+    readings, each of those in turn.
+    """
+
+    def __init__(self, *readings: float):
+        self.now = 0.0
+        self._readings = iter(readings) if readings else None
+
+    def __call__(self) -> float:
+        if self._readings is not None:
+            return next(self._readings)
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class FakeResponse:
+    def __init__(self, *, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {"Content-Type": "text/html; charset=utf-8"}
+
+
+@pytest.fixture
+def public_dns(monkeypatch):
+    """Resolve every host to a public address, except ``internal.example``."""
+    import src.url_safety as url_safety
+
+    def resolve(hostname):
+        if hostname == "internal.example":
+            return {ip_address("10.0.0.1")}
+        return {ip_address("93.184.216.34")}
+
+    monkeypatch.setattr(url_safety, "_resolve_ip_addresses", resolve)
+
+
+@pytest.fixture(autouse=True)
+def isolated_w3c_cache(monkeypatch):
+    import src.w3c_cache as w3c_cache
+
+    monkeypatch.setattr(w3c_cache, "_shared_cache", w3c_cache.W3CCache(path=None))
+
+
+@pytest.fixture(autouse=True)
+def isolated_report_cache(monkeypatch):
+    import src.report_cache as report_cache
+
+    monkeypatch.setattr(report_cache, "_shared_cache", report_cache.ReportCache())
+
+
+@pytest.fixture(autouse=True)
+def isolated_metrics(monkeypatch):
+    import src.metrics as metrics
+
+    monkeypatch.setattr(metrics, "_shared_metrics", metrics.Metrics())
+
+
+@pytest.fixture(autouse=True)
+def isolated_politeness_scheduler(monkeypatch):
+    import src.politeness as politeness
+
+    # Fast enough that pacing never slows the suite; tests of the pacing itself
+    # build their own scheduler.
+    monkeypatch.setattr(
+        politeness,
+        "_shared_scheduler",
+        politeness.PolitenessScheduler(initial_rate=10_000, max_rate=10_000),
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_resolution_cache():
+    import src.url_safety as url_safety
+
+    url_safety.clear_resolution_cache()
+    yield
+    url_safety.clear_resolution_cache()
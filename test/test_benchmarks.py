@@ -0,0 +1,43 @@
+from benchmarks.suite import compare, run_suite
+from benchmarks.synthetic import SyntheticConfig, crawler_output, synthetic_report
+
+
+def test_synthetic_reports_are_deterministic():
+    config = SyntheticConfig(pages=20, w3c_share=1.0)
+
+    assert crawler_output(config) == crawler_output(config)
+    report = synthetic_report(config)
+    assert report == synthetic_report(config)
+    assert len(report.pages) == 20
+    assert all(page.w3c_validation is not None for page in report.pages)
+    assert crawler_output(config) != crawler_output(SyntheticConfig(pages=20, seed=2))
+
+
+def test_run_suite_records_time_and_memory_per_stage_and_size():
+    results = run_suite(
+        ["create_report", "group_warnings", "pdf"],
+        [5, 10],
+        repeat=1,
+        pdf_max_pages=0,
+        log=lambda line: None,
+    )
+
+    assert set(results["results"]["create_report"]) == {"5", "10"}
+    assert results["results"]["pdf"] == {}
+    assert set(results["results"]["group_warnings"]["5"]) == {"seconds", "peak_bytes"}
+
+
+def test_compare_flags_regressions_beyond_the_threshold_only():
+    def suite(seconds, peak_bytes):
+        return {"results": {"pdf": {"100": {"seconds": seconds, "peak_bytes": peak_bytes}}}}
+
+    baseline = suite(1.0, 1000)
+
+    assert compare(suite(1.2, 1100), baseline, 0.25) == []
+    assert compare(suite(1.3, 1300), baseline, 0.25) == [
+        "pdf at 100 pages: seconds 1 -> 1.3 (+30%, threshold 25%)",
+        "pdf at 100 pages: peak_bytes 1000 -> 1300 (+30%, threshold 25%)",
+    ]
+    # Tiny absolute slowdowns are timer noise.
+    assert compare(suite(0.002, 1000), suite(0.001, 1000), 0.25) == []
+    assert compare(suite(9.0, 1000), {"results": {}}, 0.25) == []
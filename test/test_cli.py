@@ -0,0 +1,105 @@
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import src.cli as cli_module
+from src.models import KeyWord, Page, Report
+from src.url_safety import UnsafeUrlError
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _report(url):
+    return Report(
+        pages=[
+            Page(url=url, title="Home", description="Description", word_count=10),
+            Page(url=f"{url}about", title="About", description="", word_count=5),
+        ],
+        keywords=[KeyWord(word="seo", count=5)],
+        total_time=0.1,
+        duplicate_pages=[],
+    )
+
+
+def test_cli_does_not_import_the_ui_stack():
+    code = (
+        "import sys, src.cli; "
+        "print(sorted({m.split('.')[0] for m in sys.modules} "
+        "& {'streamlit', 'pandas', 'plotly'}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_cli_audits_each_site_and_prints_throughput(monkeypatch, tmp_path, capsys):
+    def fake_analyze(self, url):
+        if "blocked" in url:
+            raise UnsafeUrlError("URL resolves to a private address.")
+        return _report(url)
+
+    monkeypatch.setattr(cli_module, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(cli_module.SEOAnalyzerService, "analyze", fake_analyze)
+    urls_file = tmp_path / "sites.txt"
+    urls_file.write_text(
+        "# weekly audit\n"
+        "https://example.com/\n"
+        "\n"
+        "https://blocked.example/\n"
+        "https://example.com/\n"
+    )
+
+    exit_code = cli_module.main(
+        [
+            str(urls_file),
+            "--output-dir",
+            str(tmp_path / "out"),
+            "--workers",
+            "2",
+            "--metrics",
+            str(tmp_path / "metrics.json"),
+        ]
+    )
+
+    captured = capsys.readouterr()
+    written = Report.model_validate_json((tmp_path / "out" / "example.com.json").read_text())
+    assert exit_code == 1
+    assert written == _report("https://example.com/")
+    assert "failed  https://blocked.example/" in captured.err
+    assert "1/2 sites, 2 pages in" in captured.out
+    assert "sites/min" in captured.out and "pages/s" in captured.out
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+    assert metrics["counters"] == {
+        "pages_analyzed": 2,
+        "sites_audited": 2,
+        "sites_failed": 1,
+    }
+
+
+def test_cli_rejects_sitemaps_with_the_pyseoanalyzer_backend(tmp_path, capsys):
+    urls_file = tmp_path / "sites.txt"
+    urls_file.write_text("https://example.com/\n")
+
+    with pytest.raises(SystemExit) as exited:
+        cli_module.main([str(urls_file), "--backend", "pyseoanalyzer", "--sitemaps"])
+
+    assert exited.value.code == 2
+    assert "--sitemaps requires the asyncio backend." in capsys.readouterr().err
+
+
+def test_report_names_are_unique_and_filesystem_safe():
+    names = cli_module.report_names(
+        ["https://example.com/", "http://example.com", "https://example.com/a/b?x=1"]
+    )
+
+    assert list(names.values()) == ["example.com", "example.com-2", "example.com_a_b"]
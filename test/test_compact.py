@@ -0,0 +1,43 @@
+from collections import Counter
+
+import pytest
+
+from src.compact import CompactCounter, Vocabulary
+from src.models import Page
+
+
+def test_counters_built_with_one_vocabulary_share_its_terms():
+    vocabulary = Vocabulary()
+    first = CompactCounter.coerce(Counter({"seo audit": 2, "site map": 5}), vocabulary=vocabulary)
+    second = CompactCounter.coerce(Counter({"seo audit": 7}), vocabulary=vocabulary)
+
+    assert len(vocabulary) == 2
+    assert first.most_common() == [("site map", 5), ("seo audit", 2)]
+    assert second["seo audit"] == 7 and second["site map"] == 0
+    assert "site map" not in second
+    assert first == {"seo audit": 2, "site map": 5}
+    assert first != second
+
+
+def test_coerce_merges_the_legacy_list_of_counters():
+    legacy = [{"seo audit": 2}, {"seo audit": 1, "site map": 4}]
+
+    assert CompactCounter.coerce(legacy) == {"seo audit": 3, "site map": 4}
+    assert CompactCounter.coerce([]) == CompactCounter()
+    with pytest.raises(ValueError, match="mapping of terms to counts"):
+        CompactCounter.coerce("seo audit")
+
+
+def test_page_ngrams_round_trip_through_json():
+    page = Page(
+        url="https://example.com/",
+        title="",
+        description="",
+        word_count=0,
+        bigrams=Counter({"seo audit": 2}),
+        trigrams={"a seo audit": 1},
+    )
+
+    dumped = page.model_dump(mode="json")
+    assert dumped["bigrams"] == {"words": ["seo audit"], "counts": [2]}
+    assert Page.model_validate_json(page.model_dump_json()) == page
@@ -0,0 +1,312 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import src.service as service_module
+from conftest import FakeResponse
+from src.crawler import AsyncCrawler, CrawlOptions
+from src.models import AnalysisSummary, Page
+from src.service import SEOAnalyzerService
+
+pytest.importorskip("bs4")
+pytestmark = pytest.mark.usefixtures("public_dns")
+
+
+def _html(title, links=()):
+    anchors = "".join(f'<a href="{link}" title="link">{link}</a>' for link in links)
+    return (
+        f"<html><head><title>{title}</title></head>"
+        f"<body><h1>{title}</h1><p>search engine audit crawl</p>{anchors}</body></html>"
+    ).encode()
+
+
+SITE = {
+    "https://example.com/": _html("Home", ["/a", "/b", "https://other.com/x"]),
+    "https://example.com/a": _html("Page A", ["/", "/b"]),
+    "https://example.com/b": _html("Page B", ["/missing"]),
+    "https://example.com/missing": None,
+}
+
+
+def _fake_fetch(resolved, timeout, headers=None, max_bytes=None):
+    body = SITE.get(resolved.url)
+    if body is None:
+        return FakeResponse(status_code=404)
+    return FakeResponse(content=body)
+
+
+def test_crawler_follows_same_site_links_and_reports_errors():
+    output = asyncio.run(AsyncCrawler("https://example.com/", fetch=_fake_fetch).crawl())
+
+    assert [page["url"] for page in output["pages"]] == [
+        "https://example.com/",
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert output["pages"][1]["title"] == "page a"
+    assert output["errors"] == ["https://example.com/missing returned HTTP 404"]
+    assert output["duplicate_pages"] == []
+
+
+def test_crawler_follows_a_start_url_redirect_to_another_host():
+    site = {
+        "https://www.example.com/": _html("Home", ["/a", "https://example.com/old"]),
+        "https://www.example.com/a": _html("Page A", ["/moved"]),
+    }
+
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        if resolved.url == "https://example.com/":
+            return FakeResponse(
+                status_code=301, headers={"Location": "https://www.example.com/"}
+            )
+        if resolved.url == "https://www.example.com/moved":
+            return FakeResponse(
+                status_code=302, headers={"Location": "https://elsewhere.com/"}
+            )
+        body = site.get(resolved.url)
+        return FakeResponse(content=body) if body else FakeResponse(status_code=404)
+
+    for options in (CrawlOptions(), CrawlOptions(follow_links=False)):
+        output = asyncio.run(
+            AsyncCrawler("https://example.com/", options, fetch=fetch).crawl()
+        )
+
+        assert output["pages"][0]["url"] == "https://www.example.com/"
+    assert [page["url"] for page in output["pages"]] == ["https://www.example.com/"]
+
+    output = asyncio.run(AsyncCrawler("https://example.com/", fetch=fetch).crawl())
+
+    assert [page["url"] for page in output["pages"]] == [
+        "https://www.example.com/",
+        "https://www.example.com/a",
+    ]
+    assert output["errors"] == [
+        "Skipped redirect from https://www.example.com/moved to https://elsewhere.com/: "
+        "outside www.example.com"
+    ]
+
+
+def test_crawler_respects_per_host_concurrency_limit():
+    pages = {
+        f"https://example.com/{index}": _html(f"Page {index}") for index in range(12)
+    }
+    pages["https://example.com/"] = _html("Home", list(pages))
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_fetch(resolved, timeout, headers=None, max_bytes=None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        body = pages.get(resolved.url)
+        return FakeResponse(content=body) if body else FakeResponse(status_code=404)
+
+    options = CrawlOptions(max_concurrency=8, max_per_host=3)
+    output = asyncio.run(
+        AsyncCrawler("https://example.com/", options, fetch=slow_fetch).crawl()
+    )
+
+    assert len(output["pages"]) == 13
+    assert 1 < peak <= 3
+
+
+def test_service_uses_asyncio_backend_by_default(monkeypatch):
+    monkeypatch.setattr("src.crawler.fetch_page", _fake_fetch)
+
+    def fail_analyze(url):
+        raise AssertionError("pyseoanalyzer backend should not run")
+
+    monkeypatch.setattr(service_module, "analyze", fail_analyze)
+
+    report = SEOAnalyzerService().analyze("https://example.com")
+
+    assert len(report.pages) == 3
+    assert report.pages[0].title == "home"
+
+
+def test_service_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown crawl backend"):
+        SEOAnalyzerService(backend="selenium")
+
+
+def test_analyze_iter_streams_pages_before_the_summary(monkeypatch):
+    monkeypatch.setattr("src.crawler.fetch_page", _fake_fetch)
+
+    items = list(SEOAnalyzerService().analyze_iter("https://example.com"))
+
+    pages, summary = items[:-1], items[-1]
+    assert all(isinstance(page, Page) for page in pages)
+    assert sorted(page.url for page in pages) == [
+        "https://example.com/",
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert isinstance(summary, AnalysisSummary)
+    assert summary.errors == ["https://example.com/missing returned HTTP 404"]
+    assert summary.total_time > 0
+
+
+def test_analyze_iter_stops_the_crawl_when_the_consumer_stops(monkeypatch):
+    fetched = []
+
+    def recording_fetch(resolved, timeout, headers=None, max_bytes=None):
+        fetched.append(resolved.url)
+        return _fake_fetch(resolved, timeout)
+
+    monkeypatch.setattr("src.crawler.fetch_page", recording_fetch)
+    options = CrawlOptions(max_concurrency=1)
+
+    iterator = SEOAnalyzerService(crawl_options=options).analyze_iter(
+        "https://example.com"
+    )
+    first_page = next(iterator)
+    iterator.close()
+
+    assert first_page.url == "https://example.com/"
+    assert len(fetched) < len(SITE)
+
+
+def test_incremental_crawl_reuses_unchanged_pages(monkeypatch):
+    monkeypatch.setattr("src.crawler.fetch_page", _fake_fetch)
+    service = SEOAnalyzerService()
+    first = service.analyze("https://example.com")
+    home, page_a, page_b = first.pages
+    validated_a = page_a.model_copy(update={"etag": '"a1"', "w3c_validation": None})
+    requests_seen = {}
+
+    def conditional_fetch(resolved, timeout, headers=None, max_bytes=None):
+        requests_seen[resolved.url] = headers
+        if headers and headers.get("If-None-Match") == '"a1"':
+            return FakeResponse(status_code=304, headers={"ETag": '"a1"'})
+        if resolved.url == "https://example.com/b":
+            return FakeResponse(content=_html("Page B changed"))
+        return _fake_fetch(resolved, timeout)
+
+    monkeypatch.setattr("src.crawler.fetch_page", conditional_fetch)
+
+    report = service.analyze("https://example.com", previous=[home, validated_a, page_b])
+
+    pages = {page.url: page for page in report.pages}
+    assert requests_seen["https://example.com/a"] == {"If-None-Match": '"a1"'}
+    assert pages["https://example.com/"] == home
+    assert pages["https://example.com/a"] == validated_a
+    assert pages["https://example.com/b"].title == "page b changed"
+    assert (report.reused_pages, report.refreshed_pages) == (2, 1)
+
+
+def test_incremental_crawl_ranks_site_keywords_like_a_full_crawl(monkeypatch):
+    site = {
+        **SITE,
+        "https://example.com/b": _html("Page B", ["/missing"]) * 3,
+    }
+
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        if headers:
+            return FakeResponse(status_code=304)
+        body = site.get(resolved.url)
+        if body is None:
+            return FakeResponse(status_code=404)
+        return FakeResponse(content=body, headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr("src.crawler.fetch_page", fetch)
+    service = SEOAnalyzerService()
+    full = service.analyze("https://example.com")
+
+    incremental = service.analyze("https://example.com", previous=full.pages)
+
+    assert incremental.reused_pages == 3
+    assert incremental.keywords == full.keywords
+    assert incremental.keyword_tail == full.keyword_tail
+    assert any(" " in keyword.word for keyword in full.keywords)
+
+
+def test_incremental_crawl_requires_asyncio_backend():
+    with pytest.raises(ValueError, match="asyncio backend"):
+        SEOAnalyzerService(backend="pyseoanalyzer").analyze(
+            "https://example.com", previous=[]
+        )
+
+
+def test_service_shares_reports_across_instances_until_refreshed(monkeypatch):
+    fetched = []
+
+    def recording_fetch(resolved, timeout, headers=None, max_bytes=None):
+        if not resolved.url.endswith("/robots.txt"):
+            fetched.append(resolved.url)
+        return _fake_fetch(resolved, timeout)
+
+    monkeypatch.setattr("src.crawler.fetch_page", recording_fetch)
+
+    first = SEOAnalyzerService().analyze("https://example.com")
+    second = SEOAnalyzerService().analyze("https://EXAMPLE.com/")
+    crawls_before_refresh = len(fetched)
+    SEOAnalyzerService().analyze("https://example.com", refresh=True)
+
+    assert second == first and second is not first
+    assert crawls_before_refresh == len(SITE)
+    assert len(fetched) == 2 * len(SITE)
+
+
+def _deep_site(depth):
+    pages = {
+        f"https://example.com/{level}": _html(f"Level {level}", [f"/{level + 1}"])
+        for level in range(1, depth + 1)
+    }
+    pages["https://example.com/"] = _html("Home", ["/1"])
+
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        body = pages.get(resolved.url)
+        return FakeResponse(content=body) if body else FakeResponse(status_code=404)
+
+    return fetch
+
+
+@pytest.mark.parametrize(
+    ("options", "expected_pages", "expected_error"),
+    [
+        (CrawlOptions(max_pages=3), 3, "Crawl stopped early: page limit of 3 reached"),
+        (CrawlOptions(max_depth=2), 3, "Links more than 2 levels deep were not followed"),
+        (CrawlOptions(max_total_bytes=1), 1, "downloaded more than 1 bytes"),
+        (CrawlOptions(max_page_bytes=10), 0, "over the 10 byte limit (max_page_bytes)"),
+    ],
+)
+def test_crawl_budgets_return_partial_reports(
+    monkeypatch, options, expected_pages, expected_error
+):
+    monkeypatch.setattr("src.crawler.fetch_page", _deep_site(10))
+
+    report = SEOAnalyzerService().analyze("https://example.com", options=options)
+
+    assert len(report.pages) == expected_pages
+    assert any(expected_error in error for error in report.errors)
+
+
+def test_crawl_deadline_stops_a_slow_crawl(monkeypatch):
+    fast_fetch = _deep_site(1000)
+
+    def slow_fetch(resolved, timeout, headers=None, max_bytes=None):
+        time.sleep(0.05)
+        return fast_fetch(resolved, timeout)
+
+    monkeypatch.setattr("src.crawler.fetch_page", slow_fetch)
+
+    started = time.perf_counter()
+    report = SEOAnalyzerService().analyze(
+        "https://example.com", options=CrawlOptions(deadline=0.5)
+    )
+
+    assert time.perf_counter() - started < 2
+    assert 0 < len(report.pages) < 1000
+    assert "Crawl stopped early: deadline of 0.5s reached (deadline)" in report.errors
+
+
+def test_crawl_options_reject_non_positive_budgets():
+    with pytest.raises(ValueError, match="max_pages must be positive"):
+        CrawlOptions(max_pages=0)
@@ -0,0 +1,94 @@
+from src.diff import diff_reports
+from src.models import FieldChange, KeyWord, KeywordMovement, Page, Report
+
+
+def _page(url, *, title="Title", content_hash=None, warnings=(), word_count=100):
+    return Page(
+        url=url,
+        title=title,
+        description="Description",
+        word_count=word_count,
+        warnings=list(warnings),
+        content_hash=content_hash or url,
+    )
+
+
+def _report(pages, *, keywords=(), duplicate_pages=()):
+    return Report(
+        pages=pages,
+        keywords=[KeyWord(word=word, count=count) for word, count in keywords],
+        total_time=1.0,
+        duplicate_pages=[list(group) for group in duplicate_pages],
+    )
+
+
+def test_diff_reports_detects_added_removed_and_changed_pages():
+    old = _report(
+        [
+            _page("https://example.com/", warnings=["Missing alt", "Missing alt"]),
+            _page("https://example.com/old"),
+            _page("https://example.com/same"),
+        ]
+    )
+    new = _report(
+        [
+            _page("https://example.com/", title="New title", warnings=["Missing alt"]),
+            _page("https://example.com/new"),
+            _page("https://example.com/same"),
+        ]
+    )
+
+    diff = diff_reports(old, new)
+
+    assert diff.added_pages == ["https://example.com/new"]
+    assert diff.removed_pages == ["https://example.com/old"]
+    [change] = diff.changed_pages
+    assert change.url == "https://example.com/"
+    assert change.changes == [FieldChange(field="title", old="Title", new="New title")]
+    assert change.resolved_warnings == ["Missing alt"]
+    assert change.new_warnings == []
+
+
+def test_diff_reports_matches_moved_pages_by_content_hash():
+    old = _report([_page("https://example.com/a", content_hash="h1")])
+    new = _report([_page("https://example.com/b", content_hash="h1", word_count=120)])
+
+    diff = diff_reports(old, new)
+
+    assert diff.added_pages == []
+    assert diff.removed_pages == []
+    [change] = diff.changed_pages
+    assert change.previous_url == "https://example.com/a"
+    assert change.changes == [FieldChange(field="word_count", old=100, new=120)]
+
+
+def test_diff_reports_tracks_keyword_ranks_and_duplicate_groups():
+    old = _report(
+        [],
+        keywords=[("seo", 9), ("audit", 5), ("crawl", 4)],
+        duplicate_pages=[["https://example.com/a", "https://example.com/b"]],
+    )
+    new = _report(
+        [],
+        keywords=[("audit", 8), ("seo", 6), ("speed", 5)],
+        duplicate_pages=[["https://example.com/c", "https://example.com/d"]],
+    )
+
+    diff = diff_reports(old, new, keyword_limit=3)
+
+    assert diff.keyword_movements == [
+        KeywordMovement(word="audit", old_rank=2, new_rank=1, old_count=5, new_count=8),
+        KeywordMovement(word="seo", old_rank=1, new_rank=2, old_count=9, new_count=6),
+        KeywordMovement(word="speed", old_rank=None, new_rank=3, new_count=5),
+        KeywordMovement(word="crawl", old_rank=3, new_rank=None, old_count=4),
+    ]
+    assert diff.new_duplicate_groups == [["https://example.com/c", "https://example.com/d"]]
+    assert diff.resolved_duplicate_groups == [
+        ["https://example.com/a", "https://example.com/b"]
+    ]
+
+
+def test_diff_reports_of_identical_reports_is_empty():
+    report = _report([_page("https://example.com/")], keywords=[("seo", 3)])
+
+    assert diff_reports(report, report).is_empty
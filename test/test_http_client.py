@@ -0,0 +1,123 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import src.http_client as http_client_module
+from src.http_client import HttpClient, ResponseTooLarge
+from src.url_safety import ResolvedUrl
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    host_headers = []
+
+    def do_GET(self):
+        self.host_headers.append(self.headers["Host"])
+        body = gzip.compress(b"<html>compressed</html>")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        return None
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _local(local_server, path="/"):
+    port = int(local_server.rsplit(":", 1)[1])
+    return ResolvedUrl(
+        url=f"http://127.0.0.1:{port}{path}",
+        scheme="http",
+        hostname="127.0.0.1",
+        port=port,
+        addresses=("127.0.0.1",),
+    )
+
+
+def test_http_client_reuses_keep_alive_connections_and_decompresses(local_server):
+    client = HttpClient(timeout=5)
+
+    responses = [
+        client.get_pinned(_local(local_server, f"/page/{index}")) for index in range(5)
+    ]
+    stats = client.stats()
+
+    assert all(response.content == b"<html>compressed</html>" for response in responses)
+    assert stats.requests == 5
+    assert stats.connections == 1
+    assert stats.reused == 4
+    assert stats.pools == 1
+    client.close()
+
+
+def test_http_client_applies_per_host_pool_sizes(local_server):
+    host = local_server.removeprefix("http://")
+    client = HttpClient(host_pool_sizes={host: 2})
+
+    resolved = _local(local_server)
+    client.get_pinned(resolved)
+
+    assert client._pinned_pool(resolved, "127.0.0.1").pool.maxsize == 2
+    assert client.stats().requests == 1
+    client.close()
+
+
+def test_get_pinned_connects_to_the_vetted_address_without_resolving(local_server):
+    port = int(local_server.rsplit(":", 1)[1])
+    resolved = ResolvedUrl(
+        url=f"http://unresolvable.invalid:{port}/page?x=1",
+        scheme="http",
+        hostname="unresolvable.invalid",
+        port=port,
+        addresses=("127.0.0.1",),
+    )
+    KeepAliveHandler.host_headers.clear()
+    client = HttpClient(timeout=5)
+
+    first = client.get_pinned(resolved)
+    second = client.get_pinned(resolved)
+
+    assert first.status_code == 200
+    assert first.url == resolved.url
+    assert second.content == b"<html>compressed</html>"
+    assert KeepAliveHandler.host_headers == [f"unresolvable.invalid:{port}"] * 2
+    assert client.stats().reused == 1
+    client.close()
+
+
+def test_get_pinned_enforces_a_body_size_limit(local_server):
+    resolved = _local(local_server)
+    client = HttpClient(timeout=5)
+
+    within_limit = client.get_pinned(resolved, max_bytes=1024)
+    with pytest.raises(ResponseTooLarge, match="10 byte limit"):
+        client.get_pinned(resolved, max_bytes=10)
+
+    assert within_limit.content == b"<html>compressed</html>"
+    assert client.get_pinned(resolved).status_code == 200
+    client.close()
+
+
+def test_get_http_client_returns_a_process_wide_instance(monkeypatch):
+    monkeypatch.setattr(http_client_module, "_shared_client", None)
+
+    first = http_client_module.get_http_client()
+    replaced = http_client_module.configure_http_client(timeout=3)
+
+    assert http_client_module.get_http_client() is replaced
+    assert first is not replaced
+    assert replaced.timeout == 3
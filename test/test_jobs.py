@@ -0,0 +1,74 @@
+import threading
+
+from src.jobs import JobManager, JobStatus
+
+
+def test_job_manager_runs_jobs_and_records_results_and_failures():
+    manager = JobManager(max_workers=2)
+
+    def fail(job):
+        raise RuntimeError("boom")
+
+    succeeded = manager.submit("sum", lambda job: sum(range(10)))
+    failed = manager.submit("fail", fail)
+
+    assert succeeded.wait(timeout=5) and failed.wait(timeout=5)
+    assert (succeeded.status, succeeded.result) == (JobStatus.SUCCEEDED, 45)
+    assert (failed.status, failed.error) == (JobStatus.FAILED, "boom")
+    assert manager.get(succeeded.id) is succeeded
+    manager.shutdown()
+
+
+def test_cancel_stops_running_job_at_next_progress_update_and_skips_pending_jobs():
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+
+    def work(job):
+        started.set()
+        done = 0
+        while True:
+            done += 1
+            job.update_progress(done, done + 1)
+
+    running = manager.submit("loop", work)
+    pending = manager.submit("loop", lambda job: "ran")
+    assert started.wait(timeout=5)
+
+    assert pending.cancel()
+    assert running.cancel()
+    assert running.wait(timeout=5)
+
+    assert running.status == JobStatus.CANCELLED
+    assert running.progress[0] > 0
+    assert pending.status == JobStatus.CANCELLED
+    assert pending.result is None
+    assert not running.cancel()
+    manager.shutdown()
+
+
+def test_a_busy_job_kind_does_not_hold_up_other_kinds():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+
+    crawl = manager.submit("analysis", lambda job: release.wait(timeout=5))
+    pdf = manager.submit("pdf", lambda job: "built")
+
+    assert pdf.wait(timeout=5)
+    assert pdf.result == "built"
+    assert not crawl.finished
+    release.set()
+    assert crawl.wait(timeout=5)
+    manager.shutdown()
+
+
+def test_job_manager_forgets_the_oldest_finished_jobs():
+    manager = JobManager(max_workers=1, max_finished_jobs=2)
+    jobs = []
+    for index in range(4):
+        job = manager.submit("noop", lambda job, index=index: index)
+        job.wait(timeout=5)
+        jobs.append(job)
+    latest = manager.submit("noop", lambda job: None)
+
+    assert manager.jobs() == [*jobs[2:], latest]
+    manager.shutdown()
@@ -0,0 +1,57 @@
+from collections import Counter
+
+from src.compact import CompactCounter
+from src.keywords import KeywordAggregator, split_top_k
+from src.models import KeyWord, Page, Report
+
+
+def test_split_top_k_builds_models_for_the_leaders_only():
+    pairs = [(f"word{index}", index) for index in range(50)]
+
+    top, tail = split_top_k(pairs, 3)
+
+    assert top == [
+        KeyWord(word="word49", count=49),
+        KeyWord(word="word48", count=48),
+        KeyWord(word="word47", count=47),
+    ]
+    assert len(tail) == 47
+    assert tail.most_common(2) == [("word46", 46), ("word45", 45)]
+    assert split_top_k([("b", 1), ("a", 2)], 3) == (
+        [KeyWord(word="b", count=1), KeyWord(word="a", count=2)],
+        CompactCounter(),
+    )
+
+
+def test_compact_counter_reads_like_a_counter_and_round_trips_through_json():
+    counter = Counter({"seo": 5, "audit": 2, "crawl": 9})
+    compact = CompactCounter.from_pairs(counter.items())
+
+    assert compact == counter
+    assert compact["seo"] == 5 and compact["missing"] == 0
+    assert "audit" in compact and compact.get("missing") is None
+    assert compact.most_common(2) == counter.most_common(2)
+    assert compact.total() == counter.total()
+    assert sorted(compact) == sorted(counter)
+
+    report = Report(
+        pages=[Page(url="u", title="", description="", word_count=0, keyword_tail=counter)],
+        keywords=[],
+        keyword_tail=compact,
+        total_time=0,
+        duplicate_pages=[],
+    )
+    assert Report.model_validate_json(report.model_dump_json()) == report
+
+
+def test_keyword_aggregator_ranks_incrementally_as_pages_arrive():
+    aggregator = KeywordAggregator(min_count=2)
+    aggregator.add(Counter({"seo": 3, "audit": 1}))
+    assert aggregator.top(5) == [("seo", 3)]
+
+    aggregator.add(Counter({"audit": 4, "crawl": 2, "rare": 1}))
+    aggregator.add_keywords([("crawl", 1)])
+
+    top, tail = aggregator.ranking(k=1)
+    assert top == [("audit", 5)]
+    assert tail.most_common() == [("seo", 3), ("crawl", 3)]
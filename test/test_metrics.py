@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+import src.metrics as metrics_module
+from conftest import FakeClock
+from src.metrics import Metrics, configure_metrics, get_metrics
+
+
+def test_disabled_metrics_hand_out_one_shared_no_op_span():
+    metrics = Metrics()
+
+    with metrics.span("analyze"):
+        metrics.count("pages_analyzed", 3)
+
+    assert metrics.span("analyze") is metrics.span("crawl")
+    assert metrics.snapshot() == {"stages": {}, "counters": {}}
+    assert metrics.to_prometheus() == ""
+
+
+def test_spans_record_into_the_breakdown_even_when_disabled():
+    metrics = Metrics(clock=FakeClock(1.0, 1.5, 2.0, 2.25))
+    stage_times = {"crawl": 9.0}
+
+    with metrics.span("crawl", into=stage_times):
+        pass
+    with metrics.span("pdf", into=stage_times):
+        pass
+
+    assert stage_times == {"crawl": 0.5, "pdf": 0.25}
+    assert metrics.snapshot()["stages"] == {}
+
+
+def test_enabled_metrics_aggregate_spans_counters_and_failures():
+    metrics = Metrics(enabled=True, clock=FakeClock(0.0, 1.0, 5.0, 8.0))
+
+    with metrics.span("validate_page"):
+        pass
+    with pytest.raises(RuntimeError), metrics.span("validate_page"):
+        raise RuntimeError("validator down")
+    metrics.count("w3c_retries")
+    metrics.count("w3c_retries", 2)
+
+    assert metrics.snapshot() == {
+        "stages": {"validate_page": {"count": 2, "seconds": 4.0, "max_seconds": 3.0}},
+        "counters": {"validate_page_failures": 1, "w3c_retries": 3},
+    }
+    assert json.loads(metrics.to_json()) == metrics.snapshot()
+
+
+def test_prometheus_export_uses_the_text_exposition_format():
+    metrics = Metrics(enabled=True)
+    metrics.record("create_report", 0.5)
+    metrics.record("create_report", 0.25)
+    metrics.record('odd"stage', 1.0)
+    metrics.count("pages-analyzed", 7)
+
+    lines = metrics.to_prometheus().splitlines()
+
+    assert "# TYPE website_analyser_stage_seconds summary" in lines
+    assert 'website_analyser_stage_seconds_count{stage="create_report"} 2' in lines
+    assert 'website_analyser_stage_seconds_sum{stage="create_report"} 0.75' in lines
+    assert 'website_analyser_stage_seconds_max{stage="create_report"} 0.5' in lines
+    assert 'website_analyser_stage_seconds_count{stage="odd\\"stage"} 1' in lines
+    assert "# TYPE website_analyser_pages_analyzed_total counter" in lines
+    assert "website_analyser_pages_analyzed_total 7" in lines
+
+
+def test_configure_metrics_replaces_the_shared_registry(monkeypatch):
+    monkeypatch.setattr(metrics_module, "_shared_metrics", None)
+    assert get_metrics().enabled is False
+
+    enabled = configure_metrics()
+
+    assert get_metrics() is enabled
+    assert enabled.enabled is True
@@ -0,0 +1,107 @@
+import random
+import time
+from collections import Counter
+
+import pytest
+
+from src.near_duplicates import PageFingerprint, near_duplicate_clusters, simhash
+
+
+def _shingles(words):
+    tokens = words.split()
+    return Counter(" ".join(tokens[i : i + 3]) for i in range(len(tokens) - 2))
+
+
+ARTICLE = " ".join(f"word{index}" for index in range(400))
+
+
+def _distance(first, second):
+    return (int(first, 16) ^ int(second, 16)).bit_count()
+
+
+def test_simhash_keeps_near_duplicates_close_and_distinct_pages_apart():
+    original = simhash(_shingles(ARTICLE))
+    tracking_variant = simhash(_shingles(ARTICLE + " utm source newsletter"))
+    unrelated = simhash(_shingles(" ".join(f"other{index}" for index in range(400))))
+
+    assert len(original) == 16
+    assert _distance(original, tracking_variant) <= 3
+    assert _distance(original, unrelated) > 16
+    assert simhash({}) is None
+
+
+def test_clusters_group_near_duplicates_and_leave_exact_copies_to_duplicate_pages():
+    article = simhash(_shingles(ARTICLE))
+    variant = simhash(_shingles(ARTICLE + " page two"))
+    other = simhash(_shingles(" ".join(f"other{index}" for index in range(400))))
+
+    clusters = near_duplicate_clusters(
+        [
+            PageFingerprint("https://example.com/a", article, "hash-a"),
+            PageFingerprint("https://example.com/a?page=2", variant, "hash-a2"),
+            PageFingerprint("https://example.com/other", other, "hash-o"),
+            PageFingerprint("https://example.com/copy-1", other, "hash-c"),
+            PageFingerprint("https://example.com/copy-2", other, "hash-c"),
+            PageFingerprint("https://example.com/empty", None, None),
+        ]
+    )
+
+    assert [cluster.urls for cluster in clusters] == [
+        [
+            "https://example.com/copy-1",
+            "https://example.com/copy-2",
+            "https://example.com/other",
+        ],
+        ["https://example.com/a", "https://example.com/a?page=2"],
+    ]
+    assert clusters[0].similarity == 1.0
+    assert 0.95 <= clusters[1].similarity < 1.0
+    only_copies = [
+        PageFingerprint("https://example.com/copy-1", other, "hash-c"),
+        PageFingerprint("https://example.com/copy-2", other, "hash-c"),
+    ]
+    assert near_duplicate_clusters(only_copies) == []
+
+
+def test_clusters_scale_to_tens_of_thousands_of_pages():
+    rng = random.Random(7)
+    fingerprints = [
+        PageFingerprint(f"https://example.com/{index}", f"{rng.getrandbits(64):016x}")
+        for index in range(50_000)
+    ]
+    base = int(fingerprints[0].simhash, 16)
+    fingerprints.append(PageFingerprint("https://example.com/near", f"{base ^ 0b101:016x}"))
+
+    started = time.perf_counter()
+    clusters = near_duplicate_clusters(fingerprints)
+
+    assert time.perf_counter() - started < 10
+    assert [cluster.urls for cluster in clusters] == [
+        ["https://example.com/0", "https://example.com/near"]
+    ]
+
+
+def test_clusters_stay_fast_on_templated_sites():
+    # Every page is a few bits off one template, so all of them share buckets.
+    rng = random.Random(11)
+    template = rng.getrandbits(64)
+    fingerprints = [PageFingerprint("https://example.com/", f"{template:016x}", "home")]
+    for index in range(20_000):
+        mask = sum(1 << bit for bit in rng.sample(range(64), rng.randint(1, 3)))
+        fingerprints.append(
+            PageFingerprint(
+                f"https://example.com/{index}", f"{template ^ mask:016x}", f"hash-{index}"
+            )
+        )
+
+    started = time.perf_counter()
+    clusters = near_duplicate_clusters(fingerprints)
+
+    assert time.perf_counter() - started < 10
+    assert [len(cluster.urls) for cluster in clusters] == [20_001]
+    assert clusters[0].similarity == round(1 - 3 / 64, 4)
+
+
+def test_max_distance_must_fit_the_banding():
+    with pytest.raises(ValueError, match="max_distance"):
+        near_duplicate_clusters([], max_distance=4)
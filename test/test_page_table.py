@@ -0,0 +1,77 @@
+from src.models import KeyWord, Page, Report, W3CMessage, W3CResponse
+from src.page_table import PageTable
+
+
+def _message(kind):
+    return W3CMessage(
+        type=kind,
+        subtype=None,
+        message=kind,
+        extract=None,
+        url=None,
+        first_line=None,
+        last_line=None,
+        first_column=None,
+        last_column=None,
+        hiliteStart=None,
+        hiliteLength=None,
+    )
+
+
+def _report():
+    return Report(
+        pages=[
+            Page(
+                url="https://example.com/",
+                title="Home",
+                description="Welcome to the site",
+                word_count=320,
+                keywords=[KeyWord(word="seo", count=3)],
+                warnings=["Missing og:image", "Missing alt text"],
+            ),
+            Page(url="https://example.com/about", title="", description="", word_count=0),
+        ],
+        keywords=[],
+        total_time=0.0,
+        duplicate_pages=[],
+    )
+
+
+def test_page_table_holds_one_row_of_metrics_per_page():
+    table = PageTable(_report().pages)
+
+    assert len(table) == 2
+    assert table.columns() == {
+        "url": ["https://example.com/", "https://example.com/about"],
+        "title_length": [4, 0],
+        "description_length": [19, 0],
+        "word_count": [320, 0],
+        "warning_count": [2, 0],
+    }
+    assert table.rows(["url", "keyword_count"]) == [
+        ("https://example.com/", 1),
+        ("https://example.com/about", 0),
+    ]
+    assert PageTable().rows() == []
+
+
+def test_report_page_table_is_cached_and_tracks_w3c_results():
+    report = _report()
+    validation = W3CResponse(
+        messages=[_message("error"), _message("error"), _message("info")],
+        url=None,
+        source=None,
+        language=None,
+    )
+
+    table = report.page_table
+    report.pages[1].w3c_validation = validation
+    table.record_w3c(1, validation)
+
+    assert report.page_table is table
+    assert table.w3c_validated.tolist() == [False, True]
+    assert table.w3c_error_count.tolist() == [0, 2]
+    assert table.w3c_warning_count.tolist() == [0, 1]
+    assert PageTable(report.pages).w3c_error_count.tolist() == [0, 2]
+    assert "page_table" not in report.model_dump()
+    assert report == Report.model_validate_json(report.model_dump_json())
@@ -5,7 +5,15 @@ from reportlab.platypus import Flowable
 
 import src.pdf_generator as pdf_generator_module
 import src.url_safety as url_safety
-from src.models import KeyWord, Page, Report, W3CMessage, W3CResponse
+from src.diff import diff_reports
+from src.models import (
+    KeyWord,
+    NearDuplicateCluster,
+    Page,
+    Report,
+    W3CMessage,
+    W3CResponse,
+)
 
 
 class FakeImage:
@@ -94,6 +102,14 @@ def _install_pdf_render_test_doubles(monkeypatch):
     )
 
 
+def _install_fake_http_client(monkeypatch, fake_get):
+    def get_pinned(resolved, **kwargs):
+        return fake_get(resolved.url, **kwargs)
+
+    client = type("FakeHttpClient", (), {"get_pinned": staticmethod(get_pinned)})()
+    monkeypatch.setattr(pdf_generator_module, "get_http_client", lambda: client)
+
+
 def _make_page(url, *, with_validation=False):
     validation = None
     if with_validation:
@@ -168,13 +184,12 @@ def test_get_logo_fetches_only_allowlisted_https_urls(monkeypatch):
         def raise_for_status(self):
             return None
 
-    def fake_get(url, timeout, allow_redirects):
+    def fake_get(url, **kwargs):
         calls["url"] = url
-        calls["timeout"] = timeout
-        calls["allow_redirects"] = allow_redirects
+        calls["kwargs"] = kwargs
         return FakeResponse()
 
-    monkeypatch.setattr(pdf_generator_module.requests, "get", fake_get)
+    _install_fake_http_client(monkeypatch, fake_get)
     monkeypatch.setattr(
         pdf_generator_module,
         "Image",
@@ -192,8 +207,7 @@ def test_get_logo_fetches_only_allowlisted_https_urls(monkeypatch):
     assert calls["url"] == (
         "https://raw.githubusercontent.com/Nassim-Tecnologia/brand-assets/logo.png"
     )
-    assert calls["timeout"] == 10
-    assert calls["allow_redirects"] is False
+    assert calls["kwargs"] == {}
     assert image["content"] == b"image-bytes"
 
 
@@ -241,6 +255,7 @@ def test_generate_uses_real_page_numbers_in_table_of_contents(monkeypatch):
     }
 
     assert output.getvalue().startswith(b"%PDF")
+    assert report.stage_times["pdf"] > 0
     assert pages_by_title["1. Overview"] == 3
     assert pages_by_title["3.2. https://example.com/two"] > pages_by_title[
         "3.1. https://example.com/one"
@@ -265,21 +280,18 @@ def test_pdf_generator_fetches_each_logo_url_only_once_per_instance(monkeypatch)
         def raise_for_status(self):
             return None
 
-    def fake_get(url, timeout, allow_redirects):
-        requests_made.append((url, timeout, allow_redirects))
+    def fake_get(url, **kwargs):
+        requests_made.append(url)
         return FakeResponse()
 
-    monkeypatch.setattr(pdf_generator_module.requests, "get", fake_get)
+    _install_fake_http_client(monkeypatch, fake_get)
 
     generator = pdf_generator_module.PDFGenerator(
         _make_report(_make_page("https://example.com")), "report.pdf"
     )
     generator.build_story()
 
-    assert requests_made == [
-        (generator.logo_url, 10, False),
-        (generator.cover_logo_url, 10, False),
-    ]
+    assert requests_made == [generator.logo_url, generator.cover_logo_url]
 
 
 def test_pdf_generator_reuses_cached_logo_bytes_across_instances(monkeypatch):
@@ -300,25 +312,53 @@ def test_pdf_generator_reuses_cached_logo_bytes_across_instances(monkeypatch):
         def raise_for_status(self):
             return None
 
-    def fake_get(url, timeout, allow_redirects):
-        requests_made.append((url, timeout, allow_redirects))
+    def fake_get(url, **kwargs):
+        requests_made.append(url)
         return FakeResponse()
 
-    monkeypatch.setattr(pdf_generator_module.requests, "get", fake_get)
+    _install_fake_http_client(monkeypatch, fake_get)
 
     report = _make_report(_make_page("https://example.com"))
     pdf_generator_module.PDFGenerator(report, "first.pdf")
     pdf_generator_module.PDFGenerator(report, "second.pdf")
 
     assert requests_made == [
-        (
-            "https://raw.githubusercontent.com/Nassim-Tecnologia/brand-assets/refs/heads/main/logo-marca-light-without-bg.png",
-            10,
-            False,
-        ),
-        (
-            "https://raw.githubusercontent.com/Nassim-Tecnologia/brand-assets/refs/heads/main/logo-marca-dark-without-bg.png",
-            10,
-            False,
-        ),
+        "https://raw.githubusercontent.com/Nassim-Tecnologia/brand-assets/refs/heads/main/logo-marca-light-without-bg.png",
+        "https://raw.githubusercontent.com/Nassim-Tecnologia/brand-assets/refs/heads/main/logo-marca-dark-without-bg.png",
+    ]
+
+
+def test_build_story_includes_the_run_diff_when_given(monkeypatch):
+    _install_pdf_story_test_doubles(monkeypatch)
+    old = _make_report(_make_page("https://example.com/old"))
+    new = _make_report(_make_page("https://example.com/new"))
+
+    story = pdf_generator_module.PDFGenerator(
+        new, "report.pdf", diff=diff_reports(old, new)
+    ).build_story()
+    texts = _paragraph_texts(story)
+
+    assert "4. Changes Since Previous Run" in texts
+    # Same content hash, so the page is reported as moved rather than replaced.
+    assert "https://example.com/new; moved from https://example.com/old" in texts
+
+
+def test_build_story_lists_near_duplicate_clusters(monkeypatch):
+    _install_pdf_story_test_doubles(monkeypatch)
+    report = _make_report(_make_page("https://example.com/a"))
+    report.near_duplicates = [
+        NearDuplicateCluster(
+            urls=["https://example.com/a", "https://example.com/a?page=2"],
+            similarity=0.97,
+        )
     ]
+
+    texts = _paragraph_texts(
+        pdf_generator_module.PDFGenerator(report, "report.pdf").build_story()
+    )
+
+    assert "Near-Duplicate Pages" in texts
+    assert (
+        "Cluster 1 (97% similar): https://example.com/a, https://example.com/a?page=2"
+        in texts
+    )
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+import requests
+
+from conftest import FakeResponse
+from src.crawler import AsyncCrawler, CrawlOptions
+from src.politeness import HostThrottle, PolitenessScheduler, parse_robots
+from src.url_safety import ResolvedUrl
+
+pytest.importorskip("bs4")
+pytestmark = pytest.mark.usefixtures("public_dns")
+
+ROBOTS = b"User-agent: *\nDisallow: /private\nCrawl-delay: 2\n"
+
+
+def _resolved(url="https://example.com/"):
+    return ResolvedUrl(
+        url=url,
+        scheme="https",
+        hostname="example.com",
+        port=443,
+        addresses=("93.184.216.34",),
+    )
+
+
+def test_robots_rules_expose_disallow_and_crawl_delay():
+    rules = parse_robots(ROBOTS.decode())
+
+    assert rules.crawl_delay == 2
+    assert rules.allows("https://example.com/")
+    assert not rules.allows("https://example.com/private/page")
+
+
+def test_host_throttle_backs_off_on_429_and_recovers_slowly(clock):
+    throttle = HostThrottle(initial_rate=4, max_rate=5, min_rate=0.5, clock=clock)
+
+    throttle.record(429, 0.1, retry_after="3")
+    assert throttle.rate == 2
+    assert throttle.bucket.reserve() == pytest.approx(3 + 1 / 2)
+
+    for _ in range(10):
+        clock.now += 1
+        throttle.record(200, 0.1)
+    assert throttle.rate == 5
+
+
+def test_host_throttle_slows_down_when_latency_climbs(clock):
+    throttle = HostThrottle(initial_rate=4, max_rate=20, min_rate=0.5, clock=clock)
+    throttle.record(200, 0.1)
+
+    for _ in range(20):
+        clock.now += 1
+        throttle.record(200, 5.0)
+
+    assert throttle.rate < 4
+
+
+def test_scheduler_caches_robots_and_applies_crawl_delay(clock):
+    scheduler = PolitenessScheduler(robots_ttl=60, clock=clock)
+    requested = []
+
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        requested.append(resolved.url)
+        return FakeResponse(content=ROBOTS)
+
+    scheduler.robots(_resolved(), fetch)
+    scheduler.robots(_resolved("https://example.com/other"), fetch)
+    assert requested == ["https://example.com/robots.txt"]
+    assert scheduler.throttle("example.com").rate == 0.5
+
+    clock.now += 61
+    scheduler.robots(_resolved(), fetch)
+    assert len(requested) == 2
+
+
+def test_unreachable_robots_allows_everything():
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        raise requests.ConnectionError("down")
+
+    rules = PolitenessScheduler().robots(_resolved(), fetch)
+
+    assert rules.allows("https://example.com/private")
+    assert rules.crawl_delay is None
+
+
+def test_crawler_skips_disallowed_pages_and_retries_throttled_ones():
+    pages = {
+        "https://example.com/": b'<html><head><title>Home</title></head><body>'
+        b'<a href="/private/a">a</a><a href="/busy">b</a></body></html>',
+        "https://example.com/busy": b"<html><head><title>Busy</title></head></html>",
+    }
+    attempts = []
+
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        attempts.append(resolved.url)
+        if resolved.url.endswith("/robots.txt"):
+            return FakeResponse(content=b"User-agent: *\nDisallow: /private\n")
+        if resolved.url.endswith("/busy") and attempts.count(resolved.url) == 1:
+            return FakeResponse(status_code=429, headers={"Retry-After": "0"})
+        return FakeResponse(content=pages[resolved.url])
+
+    scheduler = PolitenessScheduler(initial_rate=1000, max_rate=1000)
+    output = asyncio.run(
+        AsyncCrawler(
+            "https://example.com/", CrawlOptions(), fetch=fetch, scheduler=scheduler
+        ).crawl()
+    )
+
+    assert sorted(page["url"] for page in output["pages"]) == [
+        "https://example.com/",
+        "https://example.com/busy",
+    ]
+    assert "https://example.com/private/a" not in attempts
+    assert "Skipped https://example.com/private/a: disallowed by robots.txt" in output["errors"]
+    assert attempts.count("https://example.com/busy") == 2
+    assert scheduler.throttle("example.com").rate == 500
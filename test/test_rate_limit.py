@@ -0,0 +1,42 @@
+import pytest
+
+from src.rate_limit import TokenBucket, parse_retry_after
+
+
+def test_token_bucket_allows_bursts_then_paces_callers(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_token_bucket_pause_holds_back_the_next_reservation(clock):
+    bucket = TokenBucket(rate=1.0, capacity=5, clock=clock)
+
+    bucket.pause(3.0)
+
+    assert bucket.reserve() == pytest.approx(4.0)
+
+
+def test_token_bucket_overlapping_pauses_do_not_add_up(clock):
+    bucket = TokenBucket(rate=1.0, capacity=5, clock=clock)
+
+    bucket.pause(3.0)
+    bucket.pause(3.0)
+    clock.now += 1.0
+    bucket.pause(1.0)
+
+    assert bucket.reserve() == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [("7", 7.0), (None, 1.5), ("not a date", 1.5), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0)],
+)
+def test_parse_retry_after_accepts_seconds_and_http_dates(header, expected):
+    assert parse_retry_after(header, default=1.5) == expected
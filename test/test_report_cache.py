@@ -0,0 +1,161 @@
+import threading
+
+import pytest
+
+from src.models import Page, Report, W3CResponse
+from src.report_cache import ReportCache
+
+
+def _report(url="https://example.com/", title="Home"):
+    return Report(
+        pages=[Page(url=url, title=title, description="", word_count=1)],
+        keywords=[],
+        total_time=0.1,
+        duplicate_pages=[],
+    )
+
+
+def test_report_cache_returns_copies_until_the_ttl_expires(clock):
+    cache = ReportCache(ttl=60, clock=clock)
+    cache.put("site", _report())
+
+    first = cache.get("site")
+    first.pages[0].title = "Changed by one session"
+    clock.now = 59
+
+    assert cache.get("site").pages[0].title == "Home"
+    clock.now = 61
+    assert cache.get("site") is None
+    assert cache.stats().entries == 0
+
+
+def test_report_cache_copies_only_what_sessions_change():
+    cache = ReportCache()
+    report = _report()
+    assert len(report.page_table) == 1  # Built before the report is cached
+    cache.put("site", report)
+    first, second = cache.get("site"), cache.get("site")
+    validation = W3CResponse(messages=[], url="https://example.com/", source=None, language="en")
+
+    first.pages[0].w3c_validation = validation
+    first.page_table.record_w3c(0, validation)
+    first.stage_times["pdf"] = 1.0
+
+    assert second.pages[0].w3c_validation is None
+    assert not second.page_table.w3c_validated[0]
+    assert second.stage_times == {}
+    # Deep copies cost as much as the crawl they save; page contents are
+    # never changed in place, so the copies share them.
+    assert first.pages[0].bigrams is second.pages[0].bigrams
+
+
+def test_report_cache_evicts_least_recently_used_reports_over_budget():
+    probe = ReportCache()
+    probe.put("a", _report("https://a.example/"))
+    size = probe.stats().size_bytes
+    cache = ReportCache(max_bytes=size * 2)
+    cache.put("a", _report("https://a.example/"))
+    cache.put("b", _report("https://b.example/"))
+    cache.get("a")
+
+    cache.put("c", _report("https://c.example/"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats().evictions == 1
+    assert cache.stats().size_bytes <= size * 2
+
+
+def test_report_cache_coalesces_concurrent_misses_into_one_computation():
+    cache = ReportCache()
+    release = threading.Event()
+    calls = []
+    follower_progress = []
+
+    def compute(progress):
+        calls.append(1)
+        progress(1, 2)
+        release.wait(timeout=5)
+        return _report()
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                cache.get_or_compute(
+                    "site",
+                    compute,
+                    progress=lambda done, total: follower_progress.append((done, total)),
+                )
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while cache.stats().coalesced < 3:
+        threading.Event().wait(0.01)
+    threading.Event().wait(0.3)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert len(results) == 4 and all(report == _report() for report in results)
+    assert (1, 2) in follower_progress
+    assert cache.stats().misses == 1
+
+
+def test_followers_retry_when_the_leader_aborts_from_its_progress_callback():
+    cache = ReportCache()
+    leader_started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute(progress):
+        calls.append(1)
+        if len(calls) == 1:
+            leader_started.set()
+            release.wait(timeout=5)
+        progress(1, 1)
+        return _report()
+
+    def cancelled(done, total):
+        raise RuntimeError("cancelled")
+
+    errors = []
+
+    def leader():
+        try:
+            cache.get_or_compute("site", compute, progress=cancelled)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    assert leader_started.wait(timeout=5)
+    follower_result = []
+    follower = threading.Thread(
+        target=lambda: follower_result.append(cache.get_or_compute("site", compute))
+    )
+    follower.start()
+    while cache.stats().coalesced < 1:
+        threading.Event().wait(0.01)
+    release.set()
+    leader_thread.join(timeout=5)
+    follower.join(timeout=5)
+
+    assert [str(error) for error in errors] == ["cancelled"]
+    assert follower_result == [_report()]
+    assert len(calls) == 2
+
+
+def test_report_cache_propagates_real_failures_to_waiting_callers():
+    cache = ReportCache()
+
+    def compute(progress):
+        raise ValueError("site unreachable")
+
+    with pytest.raises(ValueError, match="unreachable"):
+        cache.get_or_compute("site", compute)
+    assert cache.get("site") is None
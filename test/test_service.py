@@ -1,12 +1,17 @@
 import logging
+from collections import Counter
 from ipaddress import ip_address
 
 import pytest
+from pydantic import ValidationError
 
 import src.service as service_module
 import src.url_safety as url_safety
+from src.compact import Vocabulary
+from src.metrics import Metrics
 from src.models import KeyWord, Page, Report
 from src.service import SEOAnalyzerService
+from src.w3c_cache import W3CCache
 
 
 def test_analyze_uses_normalized_safe_url(monkeypatch):
@@ -30,7 +35,7 @@ def test_analyze_uses_normalized_safe_url(monkeypatch):
 
     monkeypatch.setattr(service_module, "analyze", fake_analyze)
 
-    report = SEOAnalyzerService().analyze("HTTPS://Example.COM")
+    report = SEOAnalyzerService(backend="pyseoanalyzer").analyze("HTTPS://Example.COM")
 
     assert captured["url"] == "https://example.com/"
     assert report.pages == []
@@ -38,6 +43,39 @@ def test_analyze_uses_normalized_safe_url(monkeypatch):
     assert report.total_time == 0.0
 
 
+def test_analyze_records_stage_times_on_the_report_and_in_metrics(monkeypatch):
+    monkeypatch.setattr(
+        url_safety,
+        "_resolve_ip_addresses",
+        lambda hostname: {ip_address("93.184.216.34")},
+    )
+    monkeypatch.setattr(
+        service_module,
+        "analyze",
+        lambda url: {"pages": [{"url": url, "title": "Home", "description": "", "word_count": 1}]},
+    )
+    service = SEOAnalyzerService(backend="pyseoanalyzer", metrics=Metrics(enabled=True))
+
+    crawled = []
+    report = service.analyze("https://example.com", on_crawl=crawled.append)
+    service.generate_suggestions(report)
+    service.analyze("https://example.com", on_crawl=crawled.append)
+
+    assert set(report.stage_times) == {
+        "validate_url",
+        "crawl",
+        "create_report",
+        "generate_suggestions",
+    }
+    assert all(seconds >= 0 for seconds in report.stage_times.values())
+    snapshot = service.metrics.snapshot()
+    # The second analysis is served from the report cache.
+    assert len(crawled) == 1
+    assert snapshot["stages"]["analyze"]["count"] == 2
+    assert snapshot["stages"]["crawl"]["count"] == 1
+    assert snapshot["counters"] == {"pages_analyzed": 1}
+
+
 def test_analyze_normalizes_keywords_and_error_payloads(monkeypatch, caplog):
     monkeypatch.setattr(
         url_safety,
@@ -73,7 +111,9 @@ def test_analyze_normalizes_keywords_and_error_payloads(monkeypatch, caplog):
     monkeypatch.setattr(service_module, "analyze", fake_analyze)
 
     with caplog.at_level(logging.WARNING):
-        report = SEOAnalyzerService().analyze("https://example.com")
+        report = SEOAnalyzerService(backend="pyseoanalyzer").analyze(
+            "https://example.com"
+        )
 
     assert [(kw.word, kw.count) for kw in report.pages[0].keywords] == [
         ("seo", 2),
@@ -84,18 +124,42 @@ def test_analyze_normalizes_keywords_and_error_payloads(monkeypatch, caplog):
     assert "Ignoring unsupported keyword payload" in caplog.text
 
 
-def test_validate_page_rejects_internal_urls_before_fetch(monkeypatch):
-    def fail_get(*args, **kwargs):
-        raise AssertionError("requests.get should not be called for blocked URLs")
+class FakeResponse:
+    def __init__(self, *, status_code=200, content=b"", payload=None, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self._payload = payload or {}
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError("HTTP error")
+
+    def json(self):
+        return self._payload
 
-    def fail_post(*args, **kwargs):
-        raise AssertionError("requests.post should not be called for blocked URLs")
 
-    monkeypatch.setattr(service_module.requests, "get", fail_get)
-    monkeypatch.setattr(service_module.requests, "post", fail_post)
+class FakeHttpClient:
+    def __init__(self, *, get=None, post=None):
+        self._get = get
+        self._post = post
+
+    def get_pinned(self, resolved, **kwargs):
+        if self._get is None:
+            raise AssertionError("HTTP GET should not be called")
+        return self._get(resolved.url, **kwargs)
+
+    def post(self, url, **kwargs):
+        if self._post is None:
+            raise AssertionError("HTTP POST should not be called")
+        return self._post(url, **kwargs)
+
+
+def test_validate_page_rejects_internal_urls_before_fetch():
+    service = SEOAnalyzerService(http_client=FakeHttpClient())
 
     with pytest.raises(url_safety.UnsafeUrlError):
-        SEOAnalyzerService().validate_page("http://127.0.0.1/admin")
+        service.validate_page("http://127.0.0.1/admin")
 
 
 def test_validate_page_fetches_html_and_parses_w3c_messages(monkeypatch):
@@ -107,34 +171,12 @@ def test_validate_page_fetches_html_and_parses_w3c_messages(monkeypatch):
 
     calls = {}
 
-    class FakeResponse:
-        def __init__(self, *, status_code=200, content=b"", payload=None):
-            self.status_code = status_code
-            self.content = content
-            self._payload = payload or {}
-
-        def raise_for_status(self):
-            if self.status_code >= 400:
-                raise RuntimeError("HTTP error")
-
-        def json(self):
-            return self._payload
-
-    def fake_get(url, timeout, allow_redirects):
-        calls["get"] = {
-            "url": url,
-            "timeout": timeout,
-            "allow_redirects": allow_redirects,
-        }
+    def fake_get(url, **kwargs):
+        calls["get"] = {"url": url, **kwargs}
         return FakeResponse(content=b"<html>page</html>")
 
-    def fake_post(url, headers, data, timeout):
-        calls["post"] = {
-            "url": url,
-            "headers": headers,
-            "data": data,
-            "timeout": timeout,
-        }
+    def fake_post(url, **kwargs):
+        calls["post"] = {"url": url, **kwargs}
         return FakeResponse(
             payload={
                 "source": "uploaded",
@@ -157,20 +199,13 @@ def test_validate_page_fetches_html_and_parses_w3c_messages(monkeypatch):
             }
         )
 
-    monkeypatch.setattr(service_module.requests, "get", fake_get)
-    monkeypatch.setattr(service_module.requests, "post", fake_post)
-
-    result = SEOAnalyzerService().validate_page("https://example.com")
+    service = SEOAnalyzerService(http_client=FakeHttpClient(get=fake_get, post=fake_post))
+    result = service.validate_page("https://example.com")
 
-    assert calls["get"] == {
-        "url": "https://example.com/",
-        "timeout": 10,
-        "allow_redirects": False,
-    }
+    assert calls["get"] == {"url": "https://example.com/"}
     assert calls["post"]["url"] == "https://validator.w3.org/nu/?out=json"
     assert calls["post"]["headers"] == {"Content-Type": "text/html; charset=utf-8"}
     assert calls["post"]["data"] == b"<html>page</html>"
-    assert calls["post"]["timeout"] == 10
     assert result.url == "https://example.com/"
     assert result.source == "uploaded"
     assert result.language == "en"
@@ -187,23 +222,108 @@ def test_validate_page_stops_on_redirect_before_contacting_validator(monkeypatch
         lambda hostname: {ip_address("93.184.216.34")},
     )
 
-    class RedirectResponse:
-        status_code = 302
-        content = b""
-
-        def raise_for_status(self):
-            return None
-
-    def fake_post(*args, **kwargs):
-        raise AssertionError("requests.post should not run after a redirect response")
-
-    monkeypatch.setattr(service_module.requests, "get", lambda *args, **kwargs: RedirectResponse())
-    monkeypatch.setattr(service_module.requests, "post", fake_post)
+    service = SEOAnalyzerService(
+        http_client=FakeHttpClient(get=lambda url, **kwargs: FakeResponse(status_code=302))
+    )
 
     with pytest.raises(
         ValueError, match="Redirects are not supported during W3C validation."
     ):
-        SEOAnalyzerService().validate_page("https://example.com")
+        service.validate_page("https://example.com")
+
+
+def test_validate_pages_retries_after_429_and_yields_every_result(monkeypatch):
+    monkeypatch.setattr(
+        url_safety,
+        "_resolve_ip_addresses",
+        lambda hostname: {ip_address("93.184.216.34")},
+    )
+    posts = []
+
+    def fake_post(url, **kwargs):
+        posts.append(kwargs["data"])
+        if len(posts) == 1:
+            return FakeResponse(status_code=429, headers={"Retry-After": "0"})
+        return FakeResponse(payload={"messages": [{"type": "info", "message": "ok"}]})
+
+    service = SEOAnalyzerService(
+        http_client=FakeHttpClient(
+            get=lambda url, **kwargs: FakeResponse(content=url.encode()),
+            post=fake_post,
+        )
+    )
+    urls = [f"https://example.com/{index}" for index in range(6)]
+
+    results = list(
+        service.validate_pages(urls, max_workers=3, requests_per_second=1000)
+    )
+
+    assert sorted(result.url for result in results) == sorted(urls)
+    assert len(posts) == 7
+
+
+def test_validate_page_gives_up_when_retry_after_is_too_long(monkeypatch):
+    monkeypatch.setattr(
+        url_safety,
+        "_resolve_ip_addresses",
+        lambda hostname: {ip_address("93.184.216.34")},
+    )
+    monkeypatch.setattr(
+        service_module.time,
+        "sleep",
+        lambda seconds: pytest.fail(f"slept for {seconds}s"),
+    )
+    service = SEOAnalyzerService(
+        http_client=FakeHttpClient(
+            get=lambda url, **kwargs: FakeResponse(content=b"<html></html>"),
+            post=lambda url, **kwargs: FakeResponse(
+                status_code=429, headers={"Retry-After": "7200"}
+            ),
+        )
+    )
+
+    with pytest.raises(ValueError, match="retry in 7200s"):
+        service.validate_page("https://example.com")
+
+
+def test_validate_report_fills_missing_validations_and_reports_failures(monkeypatch):
+    monkeypatch.setattr(
+        url_safety,
+        "_resolve_ip_addresses",
+        lambda hostname: {ip_address("93.184.216.34")},
+    )
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/broken"):
+            return FakeResponse(status_code=500)
+        return FakeResponse(content=b"<html></html>")
+
+    service = SEOAnalyzerService(
+        http_client=FakeHttpClient(
+            get=fake_get,
+            post=lambda url, **kwargs: FakeResponse(payload={"messages": []}),
+        )
+    )
+    report = Report(
+        pages=[
+            Page(url=url, title="", description="", word_count=0)
+            for url in ("https://example.com/", "https://example.com/broken")
+        ],
+        keywords=[],
+        total_time=0.0,
+        duplicate_pages=[],
+    )
+    progress = []
+
+    failures = service.validate_report(
+        report, progress=lambda done, total: progress.append((done, total))
+    )
+
+    assert report.pages[0].w3c_validation.url == "https://example.com/"
+    assert report.pages[1].w3c_validation is None
+    assert failures == ["W3C validation failed for https://example.com/broken: HTTP error"]
+    assert sorted(progress) == [(1, 2), (2, 2)]
+    assert report.page_table.w3c_validated.tolist() == [True, False]
 
 
 def test_generate_suggestions_covers_page_level_and_sitewide_rules():
@@ -244,3 +364,107 @@ def test_generate_suggestions_covers_page_level_and_sitewide_rules():
         "Slow server response on https://example.com" == item
         for item in suggestions["Performance"]
     )
+
+
+def test_validate_page_reuses_cached_results_for_identical_content(monkeypatch):
+    monkeypatch.setattr(
+        url_safety,
+        "_resolve_ip_addresses",
+        lambda hostname: {ip_address("93.184.216.34")},
+    )
+    posts = []
+
+    def fake_post(url, **kwargs):
+        posts.append(url)
+        return FakeResponse(payload={"messages": [{"type": "error", "message": "x"}]})
+
+    service = SEOAnalyzerService(
+        http_client=FakeHttpClient(
+            get=lambda url, **kwargs: FakeResponse(content=b"<html>same</html>"),
+            post=fake_post,
+        ),
+        w3c_cache=W3CCache(path=None),
+        metrics=Metrics(enabled=True),
+    )
+
+    first = service.validate_page("https://example.com/a")
+    second = service.validate_page("https://example.com/b")
+
+    assert len(posts) == 1
+    assert second.url == "https://example.com/b"
+    assert second.messages == first.messages
+    assert service.w3c_cache.stats().hits == 1
+    snapshot = service.metrics.snapshot()
+    assert snapshot["counters"] == {"w3c_cache_hits": 1, "w3c_cache_misses": 1}
+    assert snapshot["stages"]["validate_page"]["count"] == 2
+
+
+def test_create_page_keeps_ngram_counts_and_shares_one_vocabulary():
+    service = SEOAnalyzerService()
+    vocabulary = Vocabulary()
+    pages = [
+        service._create_page(
+            {"url": f"https://example.com/{index}", "bigrams": Counter({"seo audit": index + 1})},
+            vocabulary,
+        )
+        for index in range(2)
+    ]
+
+    assert [page.bigrams["seo audit"] for page in pages] == [1, 2]
+    assert "s" not in pages[0].bigrams
+    assert len(vocabulary) == 1
+
+
+def _crawler_output(**overrides):
+    page = {
+        "url": "https://example.com/",
+        "title": "Home",
+        "description": "Welcome",
+        "word_count": 120,
+        "keywords": [(4, "seo"), (2, "audit")],
+        "bigrams": Counter({"seo audit": 2}),
+        "trigrams": Counter({"an seo audit": 1}),
+        "warnings": ["Missing og:image"],
+        "content_hash": "abc",
+        **overrides,
+    }
+    return {"pages": [page], "keywords": [], "errors": [], "total_time": 0.1}
+
+
+def test_trusted_report_matches_the_strictly_validated_one():
+    trusted = SEOAnalyzerService()._create_report(_crawler_output())
+    strict = SEOAnalyzerService(strict_validation=True)._create_report(_crawler_output())
+
+    assert trusted == strict
+    assert trusted.model_dump() == strict.model_dump()
+    assert trusted.pages[0].keywords == [KeyWord(word="seo", count=4), KeyWord(word="audit", count=2)]
+
+
+def test_payloads_failing_the_shape_check_are_validated():
+    service = SEOAnalyzerService()
+    output = _crawler_output(keywords=[{"word": "seo", "count": "4"}], word_count="120")
+
+    assert not service._trusts(output["pages"][0])
+    page = service._create_report(output).pages[0]
+    assert (page.word_count, page.keywords) == (120, [KeyWord(word="seo", count=4)])
+
+    with pytest.raises(ValidationError):
+        service._create_report(_crawler_output(title=None))
+
+
+def test_every_page_gets_the_shape_check_not_just_the_first():
+    output = _crawler_output()
+    good = output["pages"][0]
+    output["pages"] += [
+        {**good, "url": "https://example.com/2", "word_count": "80"},
+        {**good, "url": "https://example.com/3"},
+    ]
+
+    pages = SEOAnalyzerService()._create_report(output).pages
+
+    assert [page.word_count for page in pages] == [120, 80, 120]
+    assert isinstance(pages[1].word_count, int)
+    with pytest.raises(ValidationError):
+        SEOAnalyzerService()._create_report(
+            {**output, "pages": [good, {**good, "title": None}]}
+        )
@@ -0,0 +1,177 @@
+import asyncio
+import gzip
+from datetime import datetime, timezone
+
+import pytest
+
+import src.crawler as crawler_module
+from conftest import FakeResponse
+from src.crawler import AsyncCrawler, CrawlOptions
+from src.models import Page
+from src.sitemap import SitemapEntry, SitemapError, parse_sitemap, validated_batches
+
+pytest.importorskip("bs4")
+pytestmark = pytest.mark.usefixtures("public_dns")
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/low</loc><priority>0.1</priority></url>
+  <url>
+    <loc>https://example.com/high</loc>
+    <lastmod>2024-01-02</lastmod>
+    <priority>0.9</priority>
+  </url>
+  <url><loc>https://example.com/bad-priority</loc><priority>high</priority></url>
+</urlset>
+"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/pages.xml.gz</loc></sitemap>
+</sitemapindex>
+"""
+
+
+def test_parse_sitemap_reads_entries_with_lastmod_and_priority():
+    entries = list(parse_sitemap(URLSET))
+
+    assert entries == [
+        SitemapEntry("https://example.com/low", None, 0.1),
+        SitemapEntry(
+            "https://example.com/high", datetime(2024, 1, 2, tzinfo=timezone.utc), 0.9
+        ),
+        SitemapEntry("https://example.com/bad-priority"),
+    ]
+
+
+def test_parse_sitemap_inflates_gzip_and_reads_indexes():
+    assert list(parse_sitemap(gzip.compress(URLSET)))[0].url == "https://example.com/low"
+    assert list(parse_sitemap(INDEX)) == [
+        SitemapEntry("https://example.com/pages.xml.gz", is_sitemap=True)
+    ]
+
+
+def test_parse_sitemap_rejects_oversized_and_malformed_documents():
+    bomb = gzip.compress(URLSET + b" " * 10_000)
+
+    with pytest.raises(SitemapError, match="byte limit once decompressed"):
+        list(parse_sitemap(bomb, max_bytes=1000))
+    with pytest.raises(SitemapError, match="invalid sitemap XML"):
+        list(parse_sitemap(b"<urlset><url><loc>x</url>"))
+
+
+def test_validated_batches_normalize_dedupe_and_count_rejections():
+    entries = [
+        SitemapEntry("https://Example.com/a"),
+        SitemapEntry("https://example.com/a"),
+        SitemapEntry("https://internal.example/"),
+        SitemapEntry("ftp://example.com/b"),
+        SitemapEntry("https://example.com/b"),
+    ]
+
+    batches = list(validated_batches(entries, batch_size=4))
+
+    assert batches == [
+        ([SitemapEntry("https://example.com/a")], 2),
+        ([SitemapEntry("https://example.com/b")], 0),
+    ]
+
+
+def _html(title):
+    return f"<html><head><title>{title}</title></head><body></body></html>".encode()
+
+
+def test_crawler_seeds_from_sitemap_indexes_in_priority_order():
+    responses = {
+        "https://example.com/robots.txt": (
+            b"User-agent: *\nSitemap: https://example.com/index.xml\n"
+        ),
+        "https://example.com/index.xml": INDEX,
+        "https://example.com/pages.xml.gz": gzip.compress(URLSET),
+        "https://example.com/": _html("Home"),
+        "https://example.com/high": _html("High"),
+        "https://example.com/low": _html("Low"),
+        "https://example.com/bad-priority": _html("Default"),
+    }
+    fetched = []
+
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        fetched.append(resolved.url)
+        body = responses.get(resolved.url)
+        return FakeResponse(content=body) if body else FakeResponse(status_code=404)
+
+    # A single worker makes the crawl order follow the frontier order.
+    output = asyncio.run(
+        AsyncCrawler(
+            "https://example.com/",
+            CrawlOptions(max_concurrency=1, sitemaps=True),
+            fetch=fetch,
+        ).crawl()
+    )
+
+    pages = [url for url in fetched if not url.endswith((".xml", ".gz", ".txt"))]
+    assert pages == [
+        "https://example.com/",
+        "https://example.com/high",
+        "https://example.com/bad-priority",
+        "https://example.com/low",
+    ]
+    assert len(output["pages"]) == 4
+
+
+def test_crawler_seeds_large_sitemaps_only_as_fast_as_it_crawls(monkeypatch):
+    monkeypatch.setattr(crawler_module, "FRONTIER_HIGH_WATER", 4)
+    urlset = (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        + "".join(f"<url><loc>https://example.com/{i}</loc></url>" for i in range(40))
+        + "</urlset>"
+    ).encode()
+    waiting = []
+
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        if resolved.url.endswith("/sitemap.xml"):
+            return FakeResponse(content=urlset)
+        # URLs seeded but not yet crawled, less the one being fetched now.
+        waiting.append(len(crawler._seen) - crawler._crawled - 1)
+        return FakeResponse(content=_html("Page"))
+
+    crawler = AsyncCrawler(
+        "https://example.com/",
+        CrawlOptions(max_concurrency=1, obey_robots=False, sitemaps=True),
+        fetch=fetch,
+    )
+    output = asyncio.run(crawler.crawl())
+
+    assert len(output["pages"]) == 41
+    assert max(waiting) <= 4
+
+
+def test_crawler_reuses_pages_the_sitemap_reports_unchanged():
+    previous = Page(
+        url="https://example.com/high",
+        title="High",
+        description="",
+        word_count=1,
+        last_modified="Wed, 03 Jan 2024 00:00:00 GMT",
+    )
+    fetched = []
+
+    def fetch(resolved, timeout, headers=None, max_bytes=None):
+        fetched.append(resolved.url)
+        return FakeResponse(content=_html("High"))
+
+    crawler = AsyncCrawler(
+        "https://example.com/",
+        CrawlOptions(obey_robots=False, sitemaps=True),
+        fetch=fetch,
+        previous_pages=[previous],
+    )
+
+    frontier = asyncio.PriorityQueue()
+
+    crawler._seed(frontier, SitemapEntry(previous.url, datetime(2024, 1, 2, tzinfo=timezone.utc)))
+    page, links = asyncio.run(crawler._crawl_url(previous.url))
+    assert (page, links, fetched) == (previous, [], [])
+
+    crawler._seed(frontier, SitemapEntry(previous.url, datetime(2024, 2, 1, tzinfo=timezone.utc)))
+    assert not crawler._unchanged_in_sitemap(previous)
@@ -0,0 +1,154 @@
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+from src.models import (
+    AnalysisSummary,
+    KeyWord,
+    NearDuplicateCluster,
+    Page,
+    Report,
+    W3CMessage,
+    W3CResponse,
+)
+from src.store import ReportStore
+
+
+def _page(index, *, with_validation=False):
+    validation = None
+    if with_validation:
+        validation = W3CResponse(
+            messages=[
+                W3CMessage(
+                    type="error",
+                    subtype=None,
+                    message="Bad markup",
+                    extract="<div>",
+                    url=None,
+                    first_line=1,
+                    last_line=1,
+                    first_column=2,
+                    last_column=3,
+                    hiliteStart=None,
+                    hiliteLength=None,
+                )
+            ],
+            url=f"https://example.com/{index}",
+            source=None,
+            language="en",
+        )
+    return Page(
+        url=f"https://example.com/{index}",
+        title=f"Title {index}",
+        description="Description",
+        word_count=100 + index,
+        keywords=[KeyWord(word="seo", count=3), KeyWord(word=f"page{index}", count=1)],
+        word_counts={"seo": 3, f"page{index}": 1, "audit": 1},
+        bigrams=[Counter({"seo audit": 2})],
+        keyword_tail={"tail": 1} if index == 0 else {},
+        warnings=["Missing og:image"],
+        content_hash=f"hash-{index % 3}",
+        w3c_validation=validation,
+        simhash=f"{index:016x}",
+    )
+
+
+@pytest.fixture
+def store():
+    report_store = ReportStore(":memory:")
+    yield report_store
+    report_store.close()
+
+
+def test_report_store_round_trips_reports(store):
+    report = Report(
+        pages=[_page(0, with_validation=True), _page(1)],
+        keywords=[KeyWord(word="seo", count=6)],
+        keyword_tail={"audit": 5, "crawl": 5},
+        errors=["timeout"],
+        total_time=1.5,
+        duplicate_pages=[["https://example.com/0", "https://example.com/3"]],
+        near_duplicates=[
+            NearDuplicateCluster(
+                urls=["https://example.com/0", "https://example.com/1"], similarity=0.98
+            )
+        ],
+        stage_times={"crawl": 1.25, "create_report": 0.25},
+    )
+
+    run_id = store.save_report(report, site="https://example.com/")
+
+    assert store.load_report(run_id) == report
+    assert store.latest_run("https://example.com/").page_count == 2
+
+
+def test_report_store_pages_through_large_runs_in_insertion_order(store):
+    run_id = store.ingest(
+        [*(_page(index) for index in range(25)), AnalysisSummary(
+            keywords=[], errors=[], total_time=2.0, duplicate_pages=[]
+        )],
+        site="https://example.com/",
+        batch_size=7,
+    )
+
+    streamed = [page.url for page in store.iter_pages(run_id, page_size=4)]
+    second_page = store.get_pages(run_id, offset=10, limit=5)
+
+    assert streamed == [f"https://example.com/{index}" for index in range(25)]
+    assert [page.word_count for page in second_page] == [110, 111, 112, 113, 114]
+    assert second_page[0].keywords[1].word == "page10"
+    assert store.list_runs()[0].total_time == 2.0
+
+
+def test_report_store_finds_history_by_url_and_content_hash(store):
+    older = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    first_run = store.save_report(
+        Report(pages=[_page(1)], keywords=[], total_time=0, duplicate_pages=[]),
+        site="https://example.com/",
+        started_at=older,
+    )
+    second_run = store.save_report(
+        Report(pages=[_page(1), _page(4)], keywords=[], total_time=0, duplicate_pages=[]),
+        site="https://example.com/",
+    )
+
+    by_url = store.find_pages(url="https://example.com/1")
+    by_hash = store.find_pages(content_hash="hash-1")
+
+    assert [run_id for run_id, _ in by_url] == [second_run, first_run]
+    assert {page.url for _, page in by_hash} == {
+        "https://example.com/1",
+        "https://example.com/4",
+    }
+    assert [run.id for run in store.list_runs("https://example.com/")] == [
+        second_run,
+        first_run,
+    ]
+    assert store.list_runs("https://example.com/")[1].started_at == older
+
+
+def test_report_store_skips_runs_that_never_finished(store):
+    report = Report(pages=[_page(0)], keywords=[], total_time=0.5, duplicate_pages=[])
+    finished = store.save_report(report, site="https://example.com/")
+    crashed = store.start_run("https://example.com/")
+    store.add_pages(crashed, [_page(1)])
+
+    assert store.latest_run("https://example.com/").id == finished
+    assert [run.id for run in store.list_runs()] == [finished]
+
+
+def test_report_store_saves_validations_made_after_the_run(store):
+    report = Report(
+        pages=[_page(0), _page(1)], keywords=[], total_time=0.5, duplicate_pages=[]
+    )
+    run_id = store.save_report(report, site="https://example.com/")
+    validated = _page(1, with_validation=True)
+
+    updated = store.save_validations(run_id, [report.pages[0], validated])
+
+    assert updated == 1
+    pages = store.load_report(run_id).pages
+    assert pages[0].w3c_validation is None
+    assert pages[1].w3c_validation == validated.w3c_validation
+    assert store.save_validations(run_id, [validated]) == 1
@@ -0,0 +1,107 @@
+import pytest
+
+from src.models import KeyWord, Page, Report
+from src.service import SEOAnalyzerService
+from src.suggestions import (
+    DEFAULT_SUGGESTION_RULES,
+    SuggestionRule,
+    evaluate_rules,
+    thresholds_from_json,
+    with_thresholds,
+)
+
+
+def _report():
+    return Report(
+        pages=[
+            Page(
+                url=f"https://example.com/{index}",
+                title="t" * title_length,
+                description="d" * 100,
+                word_count=word_count,
+                keywords=[KeyWord(word="seo", count=1)] * 5,
+                warnings=warnings,
+            )
+            for index, (title_length, word_count, warnings) in enumerate(
+                [
+                    (10, 1000, ["Missing title tag"]),
+                    (45, 120, []),
+                    (80, 400, ["Missing title tag", "Slow server response"]),
+                ]
+            )
+        ],
+        keywords=[KeyWord(word="seo", count=3)] * 10,
+        total_time=0.0,
+        duplicate_pages=[],
+    )
+
+
+def test_rules_flag_every_page_outside_their_thresholds():
+    suggestions = SEOAnalyzerService().generate_suggestions(_report())
+
+    assert list(suggestions["Title"]) == [
+        "The title for https://example.com/0 is too short. Aim for 50-60 characters.",
+        "The title for https://example.com/2 is too long. Keep it under 60 characters.",
+        "Missing title tag on https://example.com/0",
+        "Missing title tag on https://example.com/2",
+    ]
+    assert list(suggestions["Content"]) == [
+        "The content on https://example.com/1 is thin. Consider adding more valuable content."
+    ]
+    assert list(suggestions["Performance"]) == ["Slow server response on https://example.com/2"]
+    assert len(suggestions["Keywords"]) == len(suggestions["Description"]) == 0
+    assert suggestions.total() == 6
+
+
+def test_suggestion_lists_format_messages_on_access():
+    titles = SEOAnalyzerService().generate_suggestions(_report())["Title"]
+
+    assert len(titles) == 4
+    assert titles[-1] == "Missing title tag on https://example.com/2"
+    assert titles[1:3] == [titles[1], titles[2]]
+    with pytest.raises(IndexError):
+        titles[4]
+
+
+def test_thresholds_are_configurable_per_client():
+    rules = with_thresholds(
+        DEFAULT_SUGGESTION_RULES,
+        {"thin_content": {"below": 500}, "title_too_long": {"above": 90}},
+    )
+    service = SEOAnalyzerService(suggestion_rules=rules)
+
+    suggestions = service.generate_suggestions(_report())
+
+    assert len(suggestions["Content"]) == 2
+    assert not any("too long" in item for item in suggestions["Title"])
+    with pytest.raises(ValueError, match="Unknown suggestion rules: missing"):
+        with_thresholds(DEFAULT_SUGGESTION_RULES, {"missing": {"below": 1}})
+    with pytest.raises(ValueError, match="only takes 'below' and 'above'"):
+        with_thresholds(DEFAULT_SUGGESTION_RULES, {"thin_content": {"under": 1}})
+
+
+def test_thresholds_from_json_accept_numbers_and_null_only():
+    assert thresholds_from_json('{"thin_content": {"below": 500, "above": null}}') == {
+        "thin_content": {"below": 500, "above": None}
+    }
+    with pytest.raises(ValueError, match="not valid JSON"):
+        thresholds_from_json("{thin_content")
+    with pytest.raises(ValueError, match="map rule names"):
+        thresholds_from_json('{"thin_content": 500}')
+    with pytest.raises(ValueError, match="numbers or null"):
+        thresholds_from_json('{"thin_content": {"below": "500"}}')
+
+
+def test_custom_rules_may_add_categories_and_site_checks():
+    rules = [
+        SuggestionRule("few_pages", "Coverage", "page_count", "Only {value} pages.", below=5, scope="site"),
+        SuggestionRule("long_pages", "Coverage", "word_count", "{url}: {value} words.", above=999),
+    ]
+
+    suggestions = evaluate_rules(_report(), rules, categorize_warning=lambda warning: "Title")
+
+    assert list(suggestions["Coverage"]) == [
+        "https://example.com/0: 1000 words.",
+        "Only 3 pages.",
+    ]
+    assert len(suggestions["Title"]) == 3
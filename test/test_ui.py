@@ -1,5 +1,14 @@
+import sqlite3
+import threading
+import time
+
 import src.ui as ui_module
-from src.models import KeyWord, Page, Report
+import src.ui.components.job_status as job_status_module
+import src.ui.components.report as report_module
+from src.jobs import JobManager
+from src.models import KeyWord, Page, Report, W3CResponse
+from src.service import SEOAnalyzerService
+from src.store import ReportStore
 
 
 class FakeSpinner:
@@ -15,6 +24,8 @@ class FakeStreamlit:
         self.session_state = {}
         self.download_calls = []
         self.error_messages = []
+        self.info_messages = []
+        self.warning_messages = []
 
     def spinner(self, _message):
         return FakeSpinner()
@@ -25,6 +36,26 @@ class FakeStreamlit:
     def error(self, message):
         self.error_messages.append(message)
 
+    def info(self, message):
+        self.info_messages.append(message)
+
+    def warning(self, message):
+        self.warning_messages.append(message)
+
+
+def _install_fake_streamlit(monkeypatch):
+    fake_st = FakeStreamlit()
+    monkeypatch.setattr(ui_module, "st", fake_st)
+    monkeypatch.setattr(job_status_module, "st", fake_st)
+    return fake_st
+
+
+def _install_job_manager(monkeypatch):
+    manager = JobManager(max_workers=1)
+    monkeypatch.setattr(ui_module, "get_job_manager", lambda: manager)
+    monkeypatch.setattr(job_status_module, "get_job_manager", lambda: manager)
+    return manager
+
 
 def _make_report():
     return Report(
@@ -50,16 +81,18 @@ def _make_report():
 
 
 def test_create_pdf_download_persists_bytes_for_later_reruns(monkeypatch):
-    fake_st = FakeStreamlit()
+    fake_st = _install_fake_streamlit(monkeypatch)
     fake_st.session_state["report"] = _make_report()
-    monkeypatch.setattr(ui_module, "st", fake_st)
+    _install_job_manager(monkeypatch)
     monkeypatch.setattr(
         ui_module.PDFGenerator,
         "generate_bytes",
-        lambda report: b"%PDF-1.7 persisted-download",
+        lambda report, diff=None: b"%PDF-1.7 persisted-download",
     )
 
     ui_module.create_pdf_download()
+    assert ui_module.current_job(ui_module.PDF_JOB).wait(timeout=5)
+    ui_module.finish_pdf_download(ui_module.pop_finished_job(ui_module.PDF_JOB))
     ui_module.render_pdf_download_button()
 
     assert fake_st.session_state["pdf_data"] == b"%PDF-1.7 persisted-download"
@@ -76,7 +109,7 @@ def test_create_pdf_download_persists_bytes_for_later_reruns(monkeypatch):
 
 
 def test_reset_analysis_state_clears_stale_pdf_download_state(monkeypatch):
-    fake_st = FakeStreamlit()
+    fake_st = _install_fake_streamlit(monkeypatch)
     fake_st.session_state.update(
         {
             "report": _make_report(),
@@ -87,7 +120,6 @@ def test_reset_analysis_state_clears_stale_pdf_download_state(monkeypatch):
             "analysis_complete": True,
         }
     )
-    monkeypatch.setattr(ui_module, "st", fake_st)
 
     ui_module.reset_analysis_state()
 
@@ -97,3 +129,178 @@ def test_reset_analysis_state_clears_stale_pdf_download_state(monkeypatch):
     assert "pdf_data" not in fake_st.session_state
     assert "pdf_file_name" not in fake_st.session_state
     assert fake_st.session_state["analysis_complete"] is False
+    assert ui_module.PDF_JOB not in fake_st.session_state
+
+
+def test_persist_report_saves_the_report_under_its_site(monkeypatch):
+    store = ReportStore(":memory:")
+    monkeypatch.setattr(ui_module, "get_report_store", lambda: store)
+
+    ui_module.persist_report("https://example.com/", _make_report())
+
+    assert store.latest_run("https://example.com/").page_count == 1
+
+
+def test_validations_are_written_back_to_the_saved_run(monkeypatch):
+    fake_st = _install_fake_streamlit(monkeypatch)
+    monkeypatch.setattr(report_module, "st", fake_st)
+    store = ReportStore(":memory:")
+    monkeypatch.setattr(ui_module, "get_report_store", lambda: store)
+    monkeypatch.setattr(report_module, "get_report_store", lambda: store)
+    report = _make_report()
+    fake_st.session_state[ui_module.REPORT_RUN_ID] = ui_module.persist_report(
+        "https://example.com/", report
+    )
+    report.pages[0].w3c_validation = W3CResponse(
+        messages=[], url="https://example.com", source=None, language="en"
+    )
+
+    report_module.persist_validations(report.pages)
+
+    run_id = fake_st.session_state[ui_module.REPORT_RUN_ID]
+    assert store.load_report(run_id).pages[0].w3c_validation.language == "en"
+
+
+def test_only_the_session_that_crawled_saves_the_report(monkeypatch):
+    fake_st = _install_fake_streamlit(monkeypatch)
+    _install_job_manager(monkeypatch)
+    store = ReportStore(":memory:")
+    monkeypatch.setattr(ui_module, "get_report_store", lambda: store)
+    report = _make_report()
+    crawls = []
+
+    class CachingService:
+        def analyze(self, url, previous=None, *, on_crawl=None, **options):
+            if not crawls:
+                crawls.append(url)
+                on_crawl(report)
+            return report.model_copy(deep=True)
+
+    fake_st.session_state["seo_service"] = CachingService()
+
+    for _ in range(2):
+        ui_module.start_analysis("https://example.com/", incremental=False)
+        assert ui_module.current_job(ui_module.ANALYSIS_JOB).wait(timeout=5)
+        ui_module.finish_analysis(ui_module.pop_finished_job(ui_module.ANALYSIS_JOB))
+        assert fake_st.session_state["report"] == report
+
+    assert [run.page_count for run in store.list_runs()] == [1]
+    assert fake_st.session_state[ui_module.REPORT_RUN_ID] == store.list_runs()[0].id
+
+
+def test_report_is_saved_in_the_job_and_save_errors_become_warnings(monkeypatch):
+    fake_st = _install_fake_streamlit(monkeypatch)
+    _install_job_manager(monkeypatch)
+    monkeypatch.setattr(ui_module, "load_latest_report", lambda site: None)
+    save_threads = []
+
+    def failing_save(site, report):
+        save_threads.append(threading.current_thread())
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(ui_module, "persist_report", failing_save)
+
+    class CrawlingService:
+        def analyze(self, url, previous=None, *, on_crawl=None, **options):
+            report = _make_report()
+            on_crawl(report)
+            return report
+
+    fake_st.session_state["seo_service"] = CrawlingService()
+
+    ui_module.start_analysis("https://example.com/", incremental=False)
+    assert ui_module.current_job(ui_module.ANALYSIS_JOB).wait(timeout=5)
+    ui_module.finish_analysis(ui_module.pop_finished_job(ui_module.ANALYSIS_JOB))
+
+    assert save_threads and save_threads[0] is not threading.current_thread()
+    assert fake_st.warning_messages == [
+        "Unable to save this report to the history: database is locked"
+    ]
+    assert ui_module.REPORT_RUN_ID not in fake_st.session_state
+    assert fake_st.session_state["analysis_complete"] is True
+
+
+def test_previous_run_is_loaded_in_the_job_and_reused_only_when_incremental(
+    monkeypatch,
+):
+    fake_st = _install_fake_streamlit(monkeypatch)
+    _install_job_manager(monkeypatch)
+    store = ReportStore(":memory:")
+    monkeypatch.setattr(ui_module, "get_report_store", lambda: store)
+    store.save_report(_make_report(), site="https://example.com/")
+    baselines = []
+
+    class RecordingService:
+        def analyze(self, url, previous=None, *, on_crawl=None, **options):
+            baselines.append(previous)
+            return _make_report()
+
+    fake_st.session_state["seo_service"] = RecordingService()
+
+    for incremental in (False, True):
+        ui_module.start_analysis("https://example.com/", incremental=incremental)
+        assert ui_module.current_job(ui_module.ANALYSIS_JOB).wait(timeout=5)
+        ui_module.finish_analysis(ui_module.pop_finished_job(ui_module.ANALYSIS_JOB))
+        assert fake_st.session_state["report_diff"].is_empty
+
+    assert baselines[0] is None
+    assert [page.url for page in baselines[1]] == ["https://example.com"]
+
+
+def test_analysis_runs_as_a_background_job_and_can_be_cancelled(monkeypatch):
+    fake_st = _install_fake_streamlit(monkeypatch)
+    manager = _install_job_manager(monkeypatch)
+    monkeypatch.setattr(ui_module, "load_latest_report", lambda site: None)
+    started = threading.Event()
+
+    class SlowService:
+        def analyze(
+            self,
+            url,
+            previous=None,
+            *,
+            options=None,
+            progress=None,
+            refresh=False,
+            on_crawl=None,
+        ):
+            started.set()
+            for done in range(1, 1000):
+                progress(done, 1000)
+                time.sleep(0.01)
+            return _make_report()
+
+    fake_st.session_state["seo_service"] = SlowService()
+
+    ui_module.start_analysis("https://example.com/", incremental=False)
+    job = manager.get(fake_st.session_state[ui_module.ANALYSIS_JOB])
+    assert started.wait(timeout=5)
+    assert ui_module.pop_finished_job(ui_module.ANALYSIS_JOB) is None
+    job.cancel()
+    assert job.wait(timeout=5)
+
+    finished = ui_module.pop_finished_job(ui_module.ANALYSIS_JOB)
+    ui_module.finish_analysis(finished)
+
+    assert finished.status == "cancelled"
+    assert 0 < finished.progress[0] < 1000
+    assert "report" not in fake_st.session_state
+    assert fake_st.info_messages == ["Analysis cancelled."]
+
+
+def test_suggestion_thresholds_entered_in_the_app_reach_the_service(monkeypatch):
+    fake_st = _install_fake_streamlit(monkeypatch)
+    fake_st.session_state["seo_service"] = SEOAnalyzerService()
+    fake_st.session_state["report"] = _make_report()
+
+    ui_module.generate_suggestions("")
+    default = list(fake_st.session_state["suggestions"]["Content"])
+    ui_module.generate_suggestions('{"thin_content": {"below": 100}}')
+    relaxed = list(fake_st.session_state["suggestions"]["Content"])
+    ui_module.generate_suggestions('{"no_such_rule": {"below": 1}}')
+
+    assert any("is thin" in item for item in default)
+    assert not any("is thin" in item for item in relaxed)
+    assert fake_st.error_messages == [
+        "Invalid suggestion thresholds: Unknown suggestion rules: no_such_rule."
+    ]
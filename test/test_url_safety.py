@@ -38,3 +38,94 @@ def test_validate_logo_url_rejects_non_allowlisted_hosts():
         url_safety.UnsafeUrlError, match="URL host is not in the allowed list."
     ):
         url_safety.validate_logo_url("https://example.com/logo.png")
+
+
+def test_validate_public_url_resolves_each_host_once_within_the_ttl(monkeypatch):
+    lookups = []
+
+    def fake_resolve(hostname):
+        lookups.append(hostname)
+        return {ip_address("93.184.216.34")}
+
+    monkeypatch.setattr(url_safety, "_resolve_ip_addresses", fake_resolve)
+
+    url_safety.validate_public_url("https://example.com/a")
+    url_safety.validate_public_url("https://EXAMPLE.com/b")
+
+    assert lookups == ["example.com"]
+
+
+def test_resolution_cache_keeps_failures_for_the_negative_ttl(monkeypatch):
+    clock = [0.0]
+    cache = url_safety._ResolutionCache(ttl=60, negative_ttl=5, clock=lambda: clock[0])
+    lookups = []
+
+    def failing_resolve(hostname):
+        lookups.append(hostname)
+        raise url_safety.UnsafeUrlError(f"Unable to resolve host: {hostname}")
+
+    monkeypatch.setattr(url_safety, "_resolve_ip_addresses", failing_resolve)
+
+    for _ in range(2):
+        with pytest.raises(url_safety.UnsafeUrlError, match="Unable to resolve host"):
+            cache.resolve("missing.example")
+    clock[0] = 6.0
+    with pytest.raises(url_safety.UnsafeUrlError):
+        cache.resolve("missing.example")
+
+    assert lookups == ["missing.example", "missing.example"]
+
+
+def test_cached_private_resolutions_are_still_rejected(monkeypatch):
+    monkeypatch.setattr(
+        url_safety, "_resolve_ip_addresses", lambda hostname: {ip_address("10.0.0.5")}
+    )
+
+    for _ in range(2):
+        with pytest.raises(url_safety.UnsafeUrlError, match="Private"):
+            url_safety.validate_public_url("https://intranet.example.com/")
+
+
+def test_validate_public_urls_checks_each_distinct_host_once(monkeypatch):
+    lookups = []
+    addresses = {
+        "example.com": ip_address("93.184.216.34"),
+        "internal.example.com": ip_address("192.168.1.10"),
+    }
+
+    def fake_resolve(hostname):
+        lookups.append(hostname)
+        return {addresses[hostname]}
+
+    monkeypatch.setattr(url_safety, "_resolve_ip_addresses", fake_resolve)
+
+    results = url_safety.validate_public_urls(
+        [
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://internal.example.com/",
+            "ftp://example.com/file",
+        ]
+    )
+
+    assert sorted(lookups) == ["example.com", "internal.example.com"]
+    assert results["https://example.com/a"] == "https://example.com/a"
+    assert results["https://example.com/b"] == "https://example.com/b"
+    assert isinstance(results["https://internal.example.com/"], url_safety.UnsafeUrlError)
+    assert isinstance(results["ftp://example.com/file"], url_safety.UnsafeUrlError)
+
+
+def test_resolve_public_url_returns_the_checked_addresses(monkeypatch):
+    monkeypatch.setattr(
+        url_safety,
+        "_resolve_ip_addresses",
+        lambda hostname: {ip_address("2606:2800:220:1::"), ip_address("93.184.216.34")},
+    )
+
+    resolved = url_safety.resolve_public_url("https://Example.com:8443/path")
+
+    assert resolved.url == "https://example.com:8443/path"
+    assert resolved.hostname == "example.com"
+    assert resolved.port == 8443
+    assert resolved.netloc == "example.com:8443"
+    assert resolved.addresses == ("93.184.216.34", "2606:2800:220:1::")
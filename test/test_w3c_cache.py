@@ -0,0 +1,83 @@
+import sqlite3
+
+import src.w3c_cache as w3c_cache_module
+from src.models import W3CMessage, W3CResponse
+from src.w3c_cache import W3CCache
+
+
+def _response(message="Bad markup"):
+    return W3CResponse(
+        messages=[
+            W3CMessage(
+                type="error",
+                subtype=None,
+                message=message,
+                extract=None,
+                url=None,
+                first_line=None,
+                last_line=None,
+                first_column=None,
+                last_column=None,
+                hiliteStart=None,
+                hiliteLength=None,
+            )
+        ],
+        url="https://example.com/",
+        source=None,
+        language="en",
+    )
+
+
+def test_w3c_cache_keys_on_content_and_endpoint():
+    key = W3CCache.key_for(b"<html></html>", "https://validator.w3.org/nu/?out=json")
+
+    assert key == W3CCache.key_for(b"<html></html>", "https://validator.w3.org/nu/?out=json")
+    assert key != W3CCache.key_for(b"<html> </html>", "https://validator.w3.org/nu/?out=json")
+    assert key != W3CCache.key_for(b"<html></html>", "https://validator.example/nu/")
+
+
+def test_w3c_cache_evicts_least_recently_used_entries_and_counts_hits():
+    cache = W3CCache(path=None, max_entries=2)
+    cache.set("a", _response("a"))
+    cache.set("b", _response("b"))
+    cache.get("a")
+    cache.set("c", _response("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").messages[0].message == "a"
+    assert cache.stats().hits == 2
+    assert cache.stats().misses == 1
+    assert cache.stats().entries == 2
+
+
+def test_w3c_cache_persists_to_disk_and_expires_after_ttl(tmp_path, clock):
+    path = tmp_path / "w3c.sqlite3"
+    W3CCache(path, clock=clock, ttl=60).set("key", _response())
+
+    reopened = W3CCache(path, clock=clock, ttl=60)
+    assert reopened.get("key").messages[0].message == "Bad markup"
+    assert reopened.stats().disk_hits == 1
+
+    clock.now += 61
+    assert W3CCache(path, clock=clock, ttl=60).get("key") is None
+
+
+def test_w3c_cache_sweeps_expired_rows_on_periodic_writes_and_on_open(
+    tmp_path, clock, monkeypatch
+):
+    monkeypatch.setattr(w3c_cache_module, "EXPIRY_SWEEP_INTERVAL", 2)
+    path = tmp_path / "w3c.sqlite3"
+
+    def stored_keys():
+        with sqlite3.connect(path) as db:
+            return [key for (key,) in db.execute("SELECT key FROM w3c_cache")]
+
+    cache = W3CCache(path, clock=clock, ttl=60)
+    cache.set("old", _response())
+    clock.now += 61
+    cache.set("new", _response())
+    assert stored_keys() == ["new"]
+
+    clock.now += 61
+    W3CCache(path, clock=clock, ttl=60)
+    assert stored_keys() == []
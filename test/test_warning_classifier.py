@@ -0,0 +1,29 @@
+from src.warning_classifier import classify_warning, group_warnings, split_warning
+
+
+def test_classify_warning_uses_category_priority_not_position():
+    assert classify_warning("Missing title tag") == "Title"
+    assert classify_warning("Keyword missing from the page TITLE") == "Title"
+    assert classify_warning("Description lacks a keyword") == "Description"
+    assert classify_warning("Image has no alt text") == "Content"
+    assert classify_warning("Multiple H1 headings") == "Structure"
+    assert classify_warning("Slow server response") == "Performance"
+
+
+def test_classify_warning_sees_keywords_that_overlap_others():
+    assert classify_warning("Found textitle in the markup") == "Title"
+    assert classify_warning("wordescription") == "Description"
+
+
+def test_classification_and_splitting_are_memoized_per_distinct_warning():
+    classify_warning.cache_clear()
+    split_warning.cache_clear()
+    warnings = ["Title: Too short", "Missing og:image"] * 500
+
+    assert {classify_warning(warning) for warning in warnings} == {"Title", "Performance"}
+    grouped = group_warnings(warnings)
+
+    assert classify_warning.cache_info().misses == 2
+    assert split_warning.cache_info().misses == 2
+    assert grouped["Title"] == ["Too short"] * 500
+    assert grouped["Missing og"] == ["image"] * 500